@@ -0,0 +1,247 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Iterator, Optional
+from urllib.parse import parse_qs
+
+from anyio import to_thread
+from fastapi.responses import JSONResponse
+
+from .metrics import METRICS_PATH
+
+# 요청 수용(admission) 제어 미들웨어입니다.
+# 동기 라우터는 모두 anyio의 공용 스레드 풀(기본 40개)을 나눠 쓰므로, 느린 업로드나 엑셀 내보내기가 몰리면
+# 가벼운 조회까지 스레드를 기다리게 됩니다. 요청을 경로 유형(route class)별로 나누어 동시에 처리할 수 있는 수를
+# 제한하고, 한도를 넘은 요청은 스레드를 점유하지 않고 이벤트 루프에서 기다리게 합니다.
+# - 대기열이 가득 차면 즉시 429, 대기 시간(queue_timeout)을 넘기면 503으로 응답하며 둘 다 Retry-After를 붙입니다.
+# - 동시 처리 한도는 관측된 처리 시간에 따라 조정됩니다. (AIMD: 목표 시간을 넘으면 줄이고,
+#   목표 시간 안에 처리되면서 대기가 발생하고 있으면 하나씩 늘립니다)
+# DONGARI_ADMISSION_CONTROL=0 으로 끌 수 있습니다.
+
+ADMISSION_CONTROL_ENABLED = os.getenv("DONGARI_ADMISSION_CONTROL", "1") == "1"
+
+# 경로 유형별 설정
+# limit: 시작 동시 처리 한도, min_limit/max_limit: 조정 범위, queue: 대기열 크기,
+# queue_timeout: 최대 대기 시간(초), target_latency: 목표 처리 시간(초)
+ROUTE_CLASSES = {
+    "read": {"limit": 16, "min_limit": 4, "max_limit": 24, "queue": 128, "queue_timeout": 2.0, "target_latency": 0.25},
+    "write": {"limit": 4, "min_limit": 1, "max_limit": 8, "queue": 32, "queue_timeout": 5.0, "target_latency": 0.5},
+    "upload": {"limit": 2, "min_limit": 1, "max_limit": 4, "queue": 16, "queue_timeout": 10.0, "target_latency": 3.0},
+    "export": {"limit": 2, "min_limit": 1, "max_limit": 4, "queue": 16, "queue_timeout": 10.0, "target_latency": 5.0},
+    "auth": {"limit": 4, "min_limit": 2, "max_limit": 8, "queue": 64, "queue_timeout": 5.0, "target_latency": 1.0},
+}
+
+# 한도 조정 주기 (완료된 요청 수가 max(현재 한도, ADJUST_MIN_SAMPLES)에 도달할 때마다 조정합니다)
+ADJUST_MIN_SAMPLES = 10
+DECREASE_FACTOR = 0.75
+
+# Retry-After 상한 (초)
+MAX_RETRY_AFTER_SECONDS = 30
+
+# 수용 제어를 적용하지 않는 경로 (정적 파일, 계측)
+EXEMPT_PREFIXES = ("/static/", METRICS_PATH)
+
+_EXPORT_TRUE_VALUES = ("1", "true", "on", "yes", "t", "y")
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, retry_after: int):
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """
+    한 경로 유형의 동시 처리 한도와 대기열입니다.
+    이벤트 루프 스레드에서만 사용하므로 잠금 없이 동작합니다.
+    """
+
+    def __init__(self, name: str, limit: int, min_limit: int, max_limit: int, queue: int,
+                 queue_timeout: float, target_latency: float):
+        self.name = name
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_size = queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.latency_ewma: Optional[float] = None
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+        self._window_count = 0
+        self._window_total = 0.0
+        self._window_saturated = False
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """대기열이 빠지는 데 걸릴 것으로 예상되는 시간(초, 1초 ~ MAX_RETRY_AFTER_SECONDS)입니다."""
+        latency = self.latency_ewma if self.latency_ewma is not None else self.target_latency
+        return min(MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(latency * (self.queued + 1) / self.limit)))
+
+    async def acquire(self):
+        """처리 한도 안에 들어올 때까지 기다립니다. 대기열이 가득 찼거나 시간을 넘기면 AdmissionRejected를 발생시킵니다."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        self._window_saturated = True
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise AdmissionRejected(429, self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except BaseException as error:
+            if waiter.done() and not waiter.cancelled():
+                # 자리를 넘겨받은 직후에 취소된 경우 자리를 반납합니다.
+                self.release(None)
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(error, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise AdmissionRejected(503, self.retry_after()) from None
+            raise
+        self.admitted += 1
+
+    def release(self, latency: Optional[float]):
+        """처리를 마친 요청의 자리를 반납하고, 처리 시간을 반영한 뒤 대기 중인 요청을 깨웁니다."""
+        self.in_flight -= 1
+        if latency is not None:
+            self._observe(latency)
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _observe(self, latency: float):
+        self.latency_ewma = latency if self.latency_ewma is None else self.latency_ewma * 0.9 + latency * 0.1
+        self._window_count += 1
+        self._window_total += latency
+        if self._window_count < max(self.limit, ADJUST_MIN_SAMPLES):
+            return
+        average = self._window_total / self._window_count
+        if average > self.target_latency:
+            self.limit = max(self.min_limit, int(self.limit * DECREASE_FACTOR))
+        elif self._window_saturated:
+            self.limit = min(self.max_limit, self.limit + 1)
+        self._window_count = 0
+        self._window_total = 0.0
+        self._window_saturated = False
+
+
+limiters: Dict[str, AdaptiveLimiter] = {
+    name: AdaptiveLimiter(name, **config) for name, config in ROUTE_CLASSES.items()
+}
+
+
+def route_class(scope: dict) -> Optional[str]:
+    """요청의 경로 유형을 판별합니다. 수용 제어 대상이 아니면 None을 반환합니다."""
+    path = scope["path"]
+    method = scope["method"]
+    if method == "OPTIONS" or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path.startswith("/auth/"):
+        return "auth"
+    if method in ("GET", "HEAD"):
+        query_string = scope.get("query_string", b"")
+        if b"export" in query_string:
+            values = parse_qs(query_string.decode("latin-1")).get("export", [])
+            if values and values[-1].lower() in _EXPORT_TRUE_VALUES:
+                return "export"
+        return "read"
+    for name, value in scope.get("headers", []):
+        if name == b"content-type" and value.startswith(b"multipart/form-data"):
+            return "upload"
+    if path.endswith(("/bulk", "/import")):
+        return "upload"
+    return "write"
+
+
+def collect() -> Iterator[str]:
+    """경로 유형별 한도, 처리 중/대기 중인 요청 수, 수용/거절 횟수를 Prometheus 형식으로 출력합니다."""
+    samples = (
+        ("dongari_admission_limit", "gauge", "현재 동시 처리 한도", lambda limiter: limiter.limit),
+        ("dongari_admission_in_flight", "gauge", "처리 중인 요청 수", lambda limiter: limiter.in_flight),
+        ("dongari_admission_queued", "gauge", "대기 중인 요청 수", lambda limiter: limiter.queued),
+        ("dongari_admission_admitted_total", "counter", "수용한 요청 수", lambda limiter: limiter.admitted),
+        ("dongari_admission_rejected_total", "counter", "대기열이 가득 차 거절한(429) 요청 수", lambda limiter: limiter.rejected),
+        ("dongari_admission_timed_out_total", "counter", "대기 시간을 넘겨 거절한(503) 요청 수", lambda limiter: limiter.timed_out),
+    )
+    for metric, metric_type, description, value in samples:
+        yield f"# HELP {metric} {description}"
+        yield f"# TYPE {metric} {metric_type}"
+        for name, limiter in limiters.items():
+            yield f'{metric}{{route_class="{name}"}} {value(limiter)}'
+
+
+_REJECTED_DETAIL = {
+    429: "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+    503: "서버가 혼잡하여 요청을 처리하지 못했습니다. 잠시 후 다시 시도해주세요.",
+}
+
+
+class AdmissionMiddleware:
+    """경로 유형별 동시 처리 한도를 적용합니다. (스트리밍 응답은 본문 전송이 끝날 때까지 자리를 차지합니다)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._thread_limiter_configured = False
+
+    def _configure_thread_limiter(self):
+        # 모든 경로 유형이 최대 한도까지 늘어나도 공용 스레드 풀에서 기다리지 않도록 스레드 수를 맞춥니다.
+        thread_limiter = to_thread.current_default_thread_limiter()
+        thread_limiter.total_tokens = max(
+            thread_limiter.total_tokens, sum(config["max_limit"] for config in ROUTE_CLASSES.values())
+        )
+        self._thread_limiter_configured = True
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMISSION_CONTROL_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        name = route_class(scope)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+        if not self._thread_limiter_configured:
+            self._configure_thread_limiter()
+
+        limiter = limiters[name]
+        try:
+            await limiter.acquire()
+        except AdmissionRejected as rejected:
+            scope["metrics_route"] = f"rejected:{name}"
+            response = JSONResponse(
+                status_code=rejected.status_code,
+                content={"detail": _REJECTED_DETAIL[rejected.status_code]},
+                headers={"Retry-After": str(rejected.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
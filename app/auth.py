@@ -2,11 +2,18 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import threading
+import time
 
 from . import models, schemas, database
+from .cache import TTLCache
 
 # --- 비밀번호 암호화 설정 ---
 # 사용할 암호화 알고리즘(bcrypt)과 컨텍스트를 설정합니다.
@@ -24,15 +31,118 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 
+# --- 인증된 사용자(principal) 캐시 설정 ---
+# 같은 토큰으로 들어오는 요청마다 JWT 디코딩과 사용자 조회 쿼리를 반복하지 않도록
+# 토큰별로 사용자 정보를 캐시합니다. 항목의 유효 시간은 토큰 만료(exp)를 넘지 않습니다.
+PRINCIPAL_CACHE_TTL_SECONDS = 60
+PRINCIPAL_CACHE_MAX_SIZE = 1024
+
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_MAX_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+# 사용자 정보 변경을 무효화할 때마다 올리는 세대 번호 (_cache_user 참고)
+_principal_generation = 0
+
+
+# --- 비밀번호 해싱 전용 스레드 풀 설정 ---
+# bcrypt 연산은 요청당 수백 ms가 걸리므로 이벤트 루프나 공용 스레드 풀이 아닌
+# 크기가 제한된 전용 스레드 풀에서 실행합니다. (bcrypt는 연산 중 GIL을 해제합니다)
+# 대기 중인 작업이 PASSWORD_HASH_MAX_PENDING개를 넘으면 즉시 503으로 거절합니다.
+PASSWORD_HASH_WORKERS = 4
+PASSWORD_HASH_MAX_PENDING = 64
+
+_password_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+
+class PasswordHashMetrics:
+    """비밀번호 해싱 작업의 대기 시간과 연산 시간을 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds_total = 0.0
+        self.queue_wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.pending >= PASSWORD_HASH_MAX_PENDING:
+                self.rejected += 1
+                return False
+            self.pending += 1
+            return True
+
+    def release(self, queue_wait: float, hash_time: float):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            self.queue_wait_seconds_total += queue_wait
+            self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, queue_wait)
+            self.hash_seconds_total += hash_time
+            self.hash_seconds_max = max(self.hash_seconds_max, hash_time)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_seconds_total": self.queue_wait_seconds_total,
+                "queue_wait_seconds_max": self.queue_wait_seconds_max,
+                "hash_seconds_total": self.hash_seconds_total,
+                "hash_seconds_max": self.hash_seconds_max,
+            }
+
+
+password_hash_metrics = PasswordHashMetrics()
+
+
+def _submit_password_task(func, *args) -> Future:
+    """비밀번호 관련 연산을 전용 스레드 풀에 제출합니다."""
+    if not password_hash_metrics.try_acquire():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+    submitted_at = time.perf_counter()
+
+    def run():
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            password_hash_metrics.release(
+                queue_wait=started_at - submitted_at,
+                hash_time=time.perf_counter() - started_at,
+            )
+
+    return _password_hash_executor.submit(run)
+
+
 # --- 핵심 인증 함수 ---
 
 def verify_password(plain_password, hashed_password):
-    """일반 비밀번호와 해시된 비밀번호를 비교합니다."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """일반 비밀번호와 해시된 비밀번호를 비교합니다. (동기 라우터/서비스용)"""
+    return _submit_password_task(pwd_context.verify, plain_password, hashed_password).result()
 
 def get_password_hash(password):
-    """비밀번호를 해싱합니다."""
-    return pwd_context.hash(password)
+    """비밀번호를 해싱합니다. (동기 라우터/서비스용)"""
+    return _submit_password_task(pwd_context.hash, password).result()
+
+async def verify_password_async(plain_password, hashed_password):
+    """일반 비밀번호와 해시된 비밀번호를 이벤트 루프를 막지 않고 비교합니다."""
+    return await asyncio.wrap_future(
+        _submit_password_task(pwd_context.verify, plain_password, hashed_password)
+    )
+
+async def get_password_hash_async(password):
+    """비밀번호를 이벤트 루프를 막지 않고 해싱합니다."""
+    return await asyncio.wrap_future(_submit_password_task(pwd_context.hash, password))
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """액세스 토큰을 생성합니다."""
@@ -45,30 +155,132 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
-    """
-    토큰을 검증하고 현재 사용자를 반환하는 의존성 함수.
-    이 함수를 API 엔드포인트의 Depends에 추가하면 해당 API는 보호됩니다.
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _decode_token(token: str) -> Tuple[schemas.TokenData, float]:
+    """토큰을 검증하고 토큰 정보와 만료까지 남은 시간(초)을 반환합니다."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = schemas.TokenData(email=email)
     except JWTError:
-        raise credentials_exception
-    
+        raise _credentials_exception()
+    return token_data, payload.get("exp", 0) - time.time()
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+    """
+    토큰을 검증하고 현재 사용자를 반환하는 의존성 함수.
+    이 함수를 API 엔드포인트의 Depends에 추가하면 해당 API는 보호됩니다.
+    """
+    cached_user = principal_cache.get(token)
+    if cached_user is not None:
+        # 캐시된 스냅샷을 현재 세션에 쿼리 없이 연결합니다. (관계 속성은 필요할 때 지연 로딩됩니다)
+        return db.merge(cached_user, load=False)
+
+    token_data, expires_in = _decode_token(token)
+    generation = _principal_generation
     user = db.query(models.UserDB).filter(models.UserDB.email == token_data.email).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+
+    _cache_user(token, user, expires_in, generation)
     return user
 
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_db)):
+    """
+    get_current_user의 비동기 데이터베이스 모드 버전입니다.
+    이벤트 루프에서 동기 세션을 사용하지 않도록 AsyncSession으로 사용자를 조회합니다.
+    """
+    cached_user = principal_cache.get(token)
+    if cached_user is not None:
+        return await db.merge(cached_user, load=False)
+
+    token_data, expires_in = _decode_token(token)
+    generation = _principal_generation
+    result = await db.execute(select(models.UserDB).where(models.UserDB.email == token_data.email))
+    user = result.scalars().first()
+    if user is None:
+        raise _credentials_exception()
+
+    _cache_user(token, user, expires_in, generation)
+    return user
+
+def _snapshot_user(user: models.UserDB) -> models.UserDB:
+    """세션과 분리된 사용자 객체 사본을 만듭니다. (컬럼 값만 복사합니다)"""
+    snapshot = models.UserDB(**{
+        column.key: getattr(user, column.key) for column in models.UserDB.__table__.columns
+    })
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+def _cache_user(token: str, user: models.UserDB, expires_in: float, generation: int):
+    """
+    조회한 사용자를 캐시에 넣습니다.
+    조회를 시작한 뒤(generation 이후) 사용자 정보 변경이 커밋되었으면 읽은 값이 이전 행일 수 있으므로 넣지 않습니다.
+    """
+    if generation == _principal_generation:
+        principal_cache.set(token, _snapshot_user(user), ttl=expires_in)
+
+def invalidate_cached_user(user_id: int):
+    """해당 사용자에 대해 캐시된 모든 토큰 항목을 제거합니다."""
+    global _principal_generation
+    _principal_generation += 1
+    principal_cache.invalidate_where(lambda cached_user: cached_user.id == user_id)
+
+def invalidate_all_cached_users():
+    """캐시된 모든 사용자 항목을 제거합니다."""
+    global _principal_generation
+    _principal_generation += 1
+    principal_cache.clear()
+
+# 사용자 정보가 수정되거나 삭제되면 캐시된 항목을 무효화합니다.
+# 플러시 시점에 한 번 지우고, 커밋 전까지 다른 요청이 이전 행을 다시 캐시했을 수 있으므로 커밋 후에 한 번 더 지웁니다.
+# 세션을 거치는 일괄 UPDATE/DELETE 문(update(models.UserDB) 등)은 어떤 사용자가 바뀌었는지 모르므로 커밋 후 전체를 지웁니다.
+# (세션을 거치지 않고 연결에서 직접 실행하는 문장은 invalidate_cached_user를 직접 호출해야 합니다)
+_CHANGED_USERS_KEY = "changed_user_ids"
+_ALL_USERS = object()
+
+def _record_changed_users(session: Session, user_id):
+    changed = session.info.setdefault(_CHANGED_USERS_KEY, set())
+    changed.add(user_id)
+
+@event.listens_for(models.UserDB, "after_update")
+@event.listens_for(models.UserDB, "after_delete")
+def _invalidate_cached_user_on_change(mapper, connection, target):
+    invalidate_cached_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        _record_changed_users(session, target.id)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_user_statements(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and (
+        orm_execute_state.bind_mapper is not None and orm_execute_state.bind_mapper.class_ is models.UserDB
+    ):
+        _record_changed_users(orm_execute_state.session, _ALL_USERS)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_users_after_commit(session):
+    changed = session.info.pop(_CHANGED_USERS_KEY, None)
+    if not changed:
+        return
+    if _ALL_USERS in changed:
+        invalidate_all_cached_users()
+        return
+    for user_id in changed:
+        invalidate_cached_user(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop(_CHANGED_USERS_KEY, None)
+
 async def get_current_active_user(current_user: schemas.User = Depends(get_current_user)):
     """
     현재 사용자가 활성 상태인지 확인합니다. (현재는 항상 True)
@@ -0,0 +1,90 @@
+from sqlalchemy import event, inspect, select, union
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterable, Optional, Set, Tuple
+
+from . import models
+
+# 동아리별 변경 카운터(club_versions)를 관리합니다.
+# 세션이 flush될 때 변경된 객체가 속한 동아리의 version을 같은 트랜잭션 안에서 1씩 올리므로,
+# 서비스 코드에서 따로 신경 쓰지 않아도 ORM을 통한 모든 쓰기가 반영됩니다.
+# (ORM 객체를 거치지 않는 일괄 INSERT/UPDATE를 실행한 경우에는 bump_club_versions를 직접 호출해야 합니다)
+
+# club_id 컬럼으로 동아리에 속하는 모델들
+_CLUB_SCOPED_MODELS = (models.ClubMemberDB, models.AccountingEntryDB, models.OperationLogDB)
+
+
+def bump_club_versions(connection, club_ids: Iterable[int]):
+    """주어진 동아리들의 version을 1씩 올리고 변경 시각을 기록합니다. (행이 없으면 만듭니다)"""
+    now = datetime.utcnow()
+    rows = [{"club_id": club_id, "version": 1, "updated_at": now} for club_id in sorted(set(club_ids))]
+    if not rows:
+        return
+    statement = insert(models.ClubVersionDB)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[models.ClubVersionDB.club_id],
+            set_={
+                "version": models.ClubVersionDB.version + 1,
+                "updated_at": statement.excluded.updated_at,
+            },
+        ),
+        rows,
+    )
+
+
+def get_club_version(db: Session, club_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+    """
+    동아리의 (version, 마지막 변경 시각)을 반환합니다. 동아리가 없으면 None을 반환합니다.
+    (아직 한 번도 변경되지 않은 동아리는 (0, None)입니다)
+    """
+    row = db.execute(
+        select(models.ClubDB.id, models.ClubVersionDB.version, models.ClubVersionDB.updated_at)
+        .outerjoin(models.ClubVersionDB, models.ClubVersionDB.club_id == models.ClubDB.id)
+        .where(models.ClubDB.id == club_id)
+    ).first()
+    if row is None:
+        return None
+    return row.version or 0, row.updated_at
+
+
+def _changed_club_ids(session: Session) -> Set[int]:
+    club_ids: Set[int] = set()
+    connection = session.connection()
+    log_ids: Set[int] = set()
+    image_urls: Set[str] = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.ClubDB):
+            if obj not in session.deleted:
+                club_ids.add(obj.id)
+        elif isinstance(obj, _CLUB_SCOPED_MODELS):
+            # 소속 동아리가 바뀐 경우 이전 동아리도 함께 갱신합니다.
+            history = inspect(obj).attrs.club_id.history
+            club_ids.update(value for value in history.sum() if value is not None)
+        elif isinstance(obj, models.UploadedFileDB):
+            if obj.operation_log_id is not None:
+                log_ids.add(obj.operation_log_id)
+        elif isinstance(obj, models.ImageDerivativeDB):
+            # 리사이즈 버전이 생기면 해당 이미지를 쓰는 동아리 정보와 회계 내역의 응답이 달라집니다.
+            image_urls.add(obj.source_url)
+
+    if log_ids:
+        club_ids.update(connection.execute(
+            select(models.OperationLogDB.club_id).where(models.OperationLogDB.id.in_(log_ids))
+        ).scalars())
+    if image_urls:
+        club_ids.update(connection.execute(union(
+            select(models.ClubDB.id).where(models.ClubDB.image_url.in_(image_urls)),
+            select(models.AccountingEntryDB.club_id).where(models.AccountingEntryDB.photo_url.in_(image_urls)),
+        )).scalars())
+    club_ids.discard(None)
+    return club_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_flush(session: Session, flush_context):
+    club_ids = _changed_club_ids(session)
+    if club_ids:
+        bump_club_versions(session.connection(), club_ids)
@@ -0,0 +1,107 @@
+import os
+import zlib
+from typing import Any, Callable, Optional, Union
+
+import orjson
+from sqlalchemy import bindparam, column, select, table
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import Text, TypeDecorator
+
+# 활동 기록 content(JSON)의 저장 형식입니다.
+# - COMPRESSION_MIN_BYTES 미만이거나 압축해도 작아지지 않는 값: 기존과 같은 JSON 문자열(TEXT)
+# - 그 이상: 형식 버전 1바이트 + 압축된 JSON(BLOB)
+# 읽을 때는 저장된 값의 타입(TEXT/BLOB)과 버전 바이트로 형식을 판별하므로, 압축 전에 저장된 행과
+# 압축된 행이 섞여 있어도 됩니다. (기존 행은 compress_existing_content로 옮길 수 있습니다)
+#
+# 압축 해제는 값을 읽을 때 일어나므로, 모델에서는 content를 deferred 컬럼으로 두어
+# 목록/상세처럼 content를 응답하는 경로에서만 불러오게 합니다.
+
+COMPRESSION_MIN_BYTES = int(os.getenv("DONGARI_CONTENT_COMPRESSION_MIN_BYTES", "512"))
+COMPRESSION_LEVEL = 6
+
+# 형식 버전 바이트 (새 압축 방식을 추가하면 새 번호를 붙이고 decode_content에서 함께 읽습니다)
+FORMAT_ZLIB = 1
+
+# 기존 행을 옮길 때 한 트랜잭션에서 처리하는 행 수
+MIGRATION_BATCH_SIZE = 500
+
+
+def encode_content(value: Any, min_bytes: Optional[int] = None) -> Union[str, bytes]:
+    """content 값을 저장할 형식(JSON 문자열 또는 버전 바이트 + 압축 데이터)으로 바꿉니다."""
+    data = orjson.dumps(value)
+    if len(data) < (COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes):
+        return data.decode()
+    compressed = zlib.compress(data, COMPRESSION_LEVEL)
+    if len(compressed) + 1 >= len(data):
+        return data.decode()
+    return bytes((FORMAT_ZLIB,)) + compressed
+
+
+def decode_content(stored: Union[str, bytes]) -> Any:
+    """저장된 content를 JSON 값으로 되돌립니다."""
+    if isinstance(stored, str):
+        return orjson.loads(stored)
+    stored = bytes(stored)
+    if stored[0] == FORMAT_ZLIB:
+        return orjson.loads(zlib.decompress(stored[1:]))
+    raise ValueError(f"지원하지 않는 content 저장 형식입니다: {stored[0]}")
+
+
+class CompressedJSON(TypeDecorator):
+    """큰 JSON 값을 압축해서 저장하는 컬럼 타입입니다. (저장 형식은 모듈 설명 참고)"""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else encode_content(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else decode_content(value)
+
+
+def compress_existing_content(
+    bind: Engine,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    min_bytes: Optional[int] = None,
+    dry_run: bool = False,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    operation_logs의 기존 content를 현재 저장 형식으로 다시 씁니다. (ID 순서로 batch_size개씩, 배치마다 커밋)
+    저장된 값이 바뀌는 행만 UPDATE하며, updated_at과 검색 인덱스는 건드리지 않습니다. (내용은 같으므로)
+    파일 크기를 실제로 줄이려면 끝난 뒤 VACUUM을 실행해야 합니다.
+
+    :return: 확인한 행 수, 다시 쓴 행 수, 변경 전후 content 바이트 수
+    """
+    # 타입 변환 없이 저장된 값을 그대로 읽고 쓰기 위해 모델 대신 가벼운 table 구문을 사용합니다.
+    logs = table("operation_logs", column("id"), column("content"))
+    stats = {"scanned": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+    last_id = 0
+    while True:
+        with bind.begin() as connection:
+            rows = connection.execute(
+                select(logs.c.id, logs.c.content).where(logs.c.id > last_id).order_by(logs.c.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            updates = []
+            for log_id, stored in rows:
+                encoded = encode_content(decode_content(stored), min_bytes)
+                size_before = len(stored.encode() if isinstance(stored, str) else stored)
+                size_after = len(encoded.encode() if isinstance(encoded, str) else encoded)
+                stats["bytes_before"] += size_before
+                stats["bytes_after"] += size_after
+                if encoded != stored:
+                    updates.append({"log_id": log_id, "encoded": encoded})
+            if updates and not dry_run:
+                connection.execute(
+                    logs.update().where(logs.c.id == bindparam("log_id")).values(content=bindparam("encoded")),
+                    updates,
+                )
+            stats["scanned"] += len(rows)
+            stats["rewritten"] += len(updates)
+            last_id = rows[-1][0]
+        if progress:
+            progress(dict(stats))
+    return stats
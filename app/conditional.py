@@ -0,0 +1,90 @@
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+import hashlib
+
+from .club_versions import get_club_version
+from .database import get_async_db, get_read_db
+
+# 동아리 단위 조회 API의 조건부 요청(ETag / Last-Modified / 304) 처리입니다.
+# 동아리의 변경 카운터(club_versions)와 요청 URL로 ETag를 만들기 때문에, 목록을 읽기 전에
+# 가벼운 쿼리 한 번으로 변경 여부를 판단하고 변경이 없으면 본문 없이 304로 응답합니다.
+#
+# 라우터에서는 의존성으로 사용합니다. 반환값은 응답에 붙일 헤더이며, 일반 응답에는 자동으로 붙고
+# Response 객체를 직접 반환하는 경우(빠른 응답 경로, 파일 내보내기)에는 직접 붙여야 합니다.
+#
+#     validators: Dict[str, str] = Depends(conditional.club_validators)
+
+# 캐시는 하되, 사용할 때마다 서버에 변경 여부를 확인하도록 합니다.
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _validator_headers(
+    request: Request, club_id: int, version: int, updated_at: Optional[datetime]
+) -> Dict[str, str]:
+    # 같은 동아리라도 경로와 쿼리 파라미터(필터, 페이지)에 따라 본문이 다르므로 함께 해시합니다.
+    # (gzip 압축 여부에 따라 바이트가 달라질 수 있으므로 약한 ETag를 사용합니다)
+    key = f"{club_id}:{version}:{request.url.path}?{request.url.query}"
+    headers = {
+        "ETag": f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()}"',
+        "Cache-Control": REVALIDATE_CACHE_CONTROL,
+    }
+    if updated_at is not None:
+        headers["Last-Modified"] = format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def _is_not_modified(request: Request, headers: Dict[str, str], updated_at: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match가 있으면 If-Modified-Since는 무시합니다. (RFC 9110)
+        etag = headers["ETag"].removeprefix("W/")
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and updated_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP 날짜는 초 단위이므로 비교 전에 마이크로초를 버립니다.
+        return updated_at.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def evaluate(request: Request, club_id: int, club_version: Optional[Tuple[int, Optional[datetime]]]) -> Dict[str, str]:
+    """
+    검증 헤더를 만들고, 클라이언트가 가진 버전과 같으면 304 응답을 발생시킵니다.
+    동아리가 없으면 빈 헤더를 반환하여 라우터가 404를 응답하게 합니다.
+    """
+    if club_version is None:
+        return {}
+    version, updated_at = club_version
+    headers = _validator_headers(request, club_id, version, updated_at)
+    if _is_not_modified(request, headers, updated_at):
+        raise HTTPException(status_code=304, headers=headers)
+    return headers
+
+
+def club_validators(
+    club_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)
+) -> Dict[str, str]:
+    """동기 라우터용 조건부 요청 의존성입니다."""
+    headers = evaluate(request, club_id, get_club_version(db, club_id))
+    response.headers.update(headers)
+    return headers
+
+
+async def club_validators_async(
+    club_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, str]:
+    """비동기 라우터용 조건부 요청 의존성입니다."""
+    headers = evaluate(request, club_id, await db.run_sync(get_club_version, club_id))
+    response.headers.update(headers)
+    return headers
@@ -1,26 +1,249 @@
-from sqlalchemy import create_engine
+import hashlib
+import os
+from typing import Iterable
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from .metrics import instrument_engine
 
 # 1. 데이터베이스 파일 경로 설정 (SQLite 사용)
 SQLALCHEMY_DATABASE_URL = "sqlite:///./dongari.db"
+# 조회 전용 연결은 SQLite URI의 mode=ro로 열어 실수로라도 쓰기가 일어나지 않게 합니다.
+SQLALCHEMY_READ_DATABASE_URL = "sqlite:///file:./dongari.db?mode=ro&uri=true"
+
+# 2. SQLite 엔진 프로필
+# 연결이 생성될 때마다 적용할 PRAGMA 목록입니다. DONGARI_SQLITE_PROFILE 환경변수로 선택합니다.
+# - production: WAL 모드로 읽기와 쓰기가 서로를 막지 않게 하고, 잠금 대기(busy_timeout),
+#               메모리 맵(mmap), 페이지 캐시, 임시 테이블 위치를 조정합니다.
+# - default: SQLite 기본 설정을 그대로 사용합니다.
+SQLITE_PROFILES = {
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,        # ms
+        "mmap_size": 268435456,      # 256MB
+        "cache_size": -65536,        # 음수는 KiB 단위 (64MB)
+        "temp_store": "MEMORY",
+    },
+    "default": {},
+}
+SQLITE_PROFILE = os.getenv("DONGARI_SQLITE_PROFILE", "production")
+SQLITE_PRAGMAS = SQLITE_PROFILES[SQLITE_PROFILE]
+
+# 연결 풀 크기 (SQLite는 쓰기가 한 번에 하나뿐이므로 쓰기 풀은 작게 유지합니다)
+WRITE_POOL_SIZE = int(os.getenv("DONGARI_DB_WRITE_POOL_SIZE", "5"))
+READ_POOL_SIZE = int(os.getenv("DONGARI_DB_READ_POOL_SIZE", "20"))
 
-# 2. 데이터베이스 엔진 생성
+def _sqlite_pragma_listener(pragmas: dict):
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    return apply_pragmas
+
+# 3. 데이터베이스 엔진 생성
 # connect_args는 SQLite를 사용할 때만 필요한 설정입니다. (쓰레드 관련)
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=WRITE_POOL_SIZE,
+)
+event.listen(engine, "connect", _sqlite_pragma_listener(SQLITE_PRAGMAS))
+instrument_engine(engine)
+
+# 조회 전용 엔진 (journal_mode는 데이터베이스 파일에 저장되는 설정이므로 쓰기 엔진에서만 지정합니다)
+read_engine = create_engine(
+    SQLALCHEMY_READ_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=READ_POOL_SIZE,
 )
+event.listen(read_engine, "connect", _sqlite_pragma_listener(
+    {name: value for name, value in SQLITE_PRAGMAS.items() if name != "journal_mode"}
+))
+instrument_engine(read_engine)
 
-# 3. 데이터베이스와 통신을 위한 세션(Session) 클래스 생성
+# 4. 데이터베이스와 통신을 위한 세션(Session) 클래스 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
-# 4. 모델 클래스들이 상속받을 Base 클래스 생성
+# 5. 모델 클래스들이 상속받을 Base 클래스 생성
 Base = declarative_base()
 
-# 5. [추가] 데이터베이스 세션을 가져오는 의존성 함수
+# 6. [추가] 데이터베이스 세션을 가져오는 의존성 함수
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# 조회(GET) 전용 API에서 사용하는 의존성 함수 (조회 전용 연결 풀 사용)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 7. [추가] 비동기 데이터베이스 모드
+# DONGARI_DB_MODE=async 로 실행하면 조회/수정 API가 AsyncSession(aiosqlite)을 사용하는
+# 비동기 라우터로 처리되어 스레드 풀을 점유하지 않습니다. (기본값은 기존 동기 모드)
+DATABASE_MODE = os.getenv("DONGARI_DB_MODE", "sync")
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./dongari.db"
+
+# aiosqlite는 기본적으로 연결을 재사용하지 않으므로(NullPool), 매 요청마다 PRAGMA를 다시 적용하지 않도록 풀을 지정합니다.
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=WRITE_POOL_SIZE,
+)
+event.listen(async_engine.sync_engine, "connect", _sqlite_pragma_listener(SQLITE_PRAGMAS))
+instrument_engine(async_engine.sync_engine)
+
+# 커밋 후에도 응답 직렬화 시 속성을 다시 조회하지 않도록 expire_on_commit=False로 설정합니다.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# 8. [추가] 스키마 버전 확인
+# 워커가 시작될 때마다 모든 테이블을 조회(introspection)하지 않도록, 마지막으로 적용한 스키마 정의의
+# 지문(DDL의 SHA-1)을 schema_versions 테이블에 저장해 두고 지문이 같으면 스키마 확인을 건너뜁니다.
+# 모델이나 인덱스 정의가 바뀌면 지문이 달라지므로 다음 시작 시 한 번만 전체 확인을 수행합니다.
+SCHEMA_VERSION_TABLE = "schema_versions"
+
+def schema_fingerprint(statements: Iterable[str]) -> str:
+    """DDL 문장 목록의 지문을 계산합니다. (공백 차이는 무시합니다)"""
+    digest = hashlib.sha1()
+    for statement in statements:
+        digest.update(" ".join(statement.split()).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def schema_is_current(bind, component: str, fingerprint: str) -> bool:
+    """component(예: 'models', 'search')에 마지막으로 적용한 지문이 fingerprint와 같은지 확인합니다."""
+    with bind.connect() as connection:
+        if connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SCHEMA_VERSION_TABLE},
+        ).first() is None:
+            return False
+        stored = connection.execute(
+            text(f"SELECT fingerprint FROM {SCHEMA_VERSION_TABLE} WHERE component = :component"),
+            {"component": component},
+        ).scalar()
+    return stored == fingerprint
+
+def record_schema_version(bind, component: str, fingerprint: str):
+    """스키마 적용을 마친 뒤 component의 지문을 기록합니다."""
+    with bind.begin() as connection:
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+            "component VARCHAR PRIMARY KEY, fingerprint VARCHAR NOT NULL, "
+            "applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        connection.execute(
+            text(
+                f"INSERT INTO {SCHEMA_VERSION_TABLE} (component, fingerprint) VALUES (:component, :fingerprint) "
+                "ON CONFLICT(component) DO UPDATE SET fingerprint = excluded.fingerprint, applied_at = CURRENT_TIMESTAMP"
+            ),
+            {"component": component, "fingerprint": fingerprint},
+        )
+
+def _models_fingerprint(bind) -> str:
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=bind.dialect)))
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            statements.append(str(CreateIndex(index).compile(dialect=bind.dialect)))
+    return schema_fingerprint(statements)
+
+# 9. [추가] 스키마 보충 함수
+# create_all은 이미 존재하는 테이블에 새로 정의된 컬럼과 인덱스를 만들어 주지 않으므로,
+# 모델에 선언된 컬럼(NULL 허용 컬럼만)과 인덱스를 하나씩 확인하여 없는 것만 추가합니다.
+def _add_missing_columns(bind):
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+
+# 10. [추가] 가입 정보 테이블 변환
+# user_club_association의 (user_id, club_id) 고유 인덱스와, 고유 인덱스를 도입하기 전의 일반 인덱스 이름입니다.
+MEMBERSHIP_UNIQUE_INDEX = "uq_user_club_association_user_club"
+_LEGACY_MEMBERSHIP_INDEX = "ix_user_club_association_user_club"
+
+def _migrate_memberships(bind):
+    """
+    가입 정보 테이블에 고유 인덱스가 없으면(기존 데이터베이스) 한 번만 변환합니다.
+    - 고유 인덱스가 없던 때 동시 가입으로 생긴 중복 행을 하나만 남기고 지운 뒤 고유 인덱스를 만듭니다.
+    - 가입 API가 가입 정보를 저장하지 않던 때부터 활동 기록을 작성해 온 사용자를 그 동아리의 회원으로 등록합니다.
+      (기록을 남기지 않은 기존 사용자는 동아리 비밀번호로 다시 가입해야 합니다)
+    """
+    with bind.begin() as connection:
+        indexes = set(connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+        if MEMBERSHIP_UNIQUE_INDEX in indexes:
+            return
+        connection.execute(text(
+            "DELETE FROM user_club_association WHERE rowid NOT IN "
+            "(SELECT min(rowid) FROM user_club_association GROUP BY user_id, club_id)"
+        ))
+        if _LEGACY_MEMBERSHIP_INDEX in indexes:
+            connection.execute(text(f"DROP INDEX {_LEGACY_MEMBERSHIP_INDEX}"))
+        unique_index = next(
+            index for index in Base.metadata.tables["user_club_association"].indexes
+            if index.name == MEMBERSHIP_UNIQUE_INDEX
+        )
+        unique_index.create(bind=connection)
+        connection.execute(text(
+            "INSERT INTO user_club_association (user_id, club_id) "
+            "SELECT DISTINCT author_id, club_id FROM operation_logs "
+            "WHERE author_id IS NOT NULL AND club_id IS NOT NULL "
+            "ON CONFLICT (user_id, club_id) DO NOTHING"
+        ))
+
+# 11. [추가] 이미지 리사이즈 버전 중복 정리
+IMAGE_DERIVATIVE_UNIQUE_INDEX = "uq_image_derivatives_source_width_format"
+
+def _dedupe_image_derivatives(bind):
+    """
+    image_derivatives에 고유 인덱스가 없으면(기존 데이터베이스) 겹친 리사이즈 작업이 남긴 중복 행을
+    (원본, 크기, 형식)마다 하나만 남기고 지웁니다. (고유 인덱스는 ensure_schema가 이어서 만듭니다)
+    """
+    with bind.begin() as connection:
+        indexes = set(connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+        if IMAGE_DERIVATIVE_UNIQUE_INDEX in indexes:
+            return
+        connection.execute(text(
+            "DELETE FROM image_derivatives WHERE id NOT IN "
+            "(SELECT min(id) FROM image_derivatives GROUP BY source_url, width, format)"
+        ))
+
+def ensure_schema(bind=engine):
+    """모델에 정의된 테이블, 컬럼, 인덱스를 생성합니다. 마지막으로 적용한 정의와 같으면 바로 반환합니다."""
+    fingerprint = _models_fingerprint(bind)
+    if schema_is_current(bind, "models", fingerprint):
+        return
+    Base.metadata.create_all(bind=bind)
+    _add_missing_columns(bind)
+    _migrate_memberships(bind)
+    _dedupe_image_derivatives(bind)
+    # 식(expression) 인덱스는 리플렉션(checkfirst)으로 확인할 수 없으므로 sqlite_master의 인덱스 이름으로 확인합니다.
+    with bind.connect() as connection:
+        existing = set(connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=bind)
+    record_schema_version(bind, "models", fingerprint)
@@ -0,0 +1,51 @@
+from fastapi import Request
+from starlette.responses import Response
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Optional, Sequence, Type
+import gzip
+import os
+
+import orjson
+from pydantic import BaseModel
+
+# 목록 API의 빠른 응답 경로입니다. (DONGARI_FAST_JSON=1 로 켭니다)
+# 기본 경로는 ORM 객체 전체를 불러온 뒤 response_model(from_attributes)로 다시 검증하고 표준 json으로 직렬화합니다.
+# 빠른 경로는 스키마에 필요한 컬럼만 튜플로 조회해 dict로 바꾸고, orjson으로 바로 직렬화하며,
+# 큰 응답 본문은 gzip으로 압축해 보냅니다. (응답 JSON의 형태는 기본 경로와 같습니다)
+
+FAST_JSON_ENABLED = os.getenv("DONGARI_FAST_JSON", "0") == "1"
+
+JSON_MEDIA_TYPE = "application/json"
+GZIP_MIN_SIZE = 1024  # bytes
+GZIP_LEVEL = 6
+
+
+def schema_columns(schema: Type[BaseModel], model, fields: Optional[Collection[str]] = None) -> List[Any]:
+    """
+    스키마 필드 중 모델의 컬럼에 해당하는 것만 스키마 필드 순서대로 반환합니다.
+    fields가 주어지면 그 안에 있는 필드만 반환합니다. (부분 응답, fieldsets 참고)
+    """
+    table_columns = model.__table__.c
+    return [
+        getattr(model, name) for name in schema.model_fields
+        if name in table_columns and (fields is None or name in fields)
+    ]
+
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], keys: Sequence[str]) -> List[Dict[str, Any]]:
+    """조회 결과 튜플을 ORM 객체나 스키마 검증 없이 dict 목록으로 바꿉니다."""
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def json_response(request: Request, content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    orjson으로 직렬화한 응답을 만듭니다.
+    본문이 GZIP_MIN_SIZE 이상이고 클라이언트가 gzip을 지원하면 압축해서 보냅니다.
+    """
+    body = orjson.dumps(content)
+    response_headers = dict(headers or {})
+    if len(body) >= GZIP_MIN_SIZE:
+        response_headers["vary"] = "Accept-Encoding"
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            response_headers["content-encoding"] = "gzip"
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=response_headers)
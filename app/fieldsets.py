@@ -0,0 +1,121 @@
+from copy import copy
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, TypeAdapter, computed_field, create_model
+from starlette.responses import Response
+
+from .fast_json import JSON_MEDIA_TYPE
+
+# 목록 API의 부분 응답(sparse fieldset)입니다.
+# fields=id,title 처럼 응답에 필요한 필드만 쉼표로 지정하면, 지정하지 않은 컬럼은 조회하지 않고
+# (ORM 경로는 load_only, 컬럼 조회 경로는 SELECT 목록에서 제외) 직렬화하지도 않습니다.
+# 필드 조합별 응답 스키마는 원래 스키마의 필드 정의를 그대로 옮겨 동적으로 만들고 캐시합니다.
+#
+#     selection = fieldsets.parse_fields(fields, schemas.ClubMember)
+#     rows = member_service.get_member_rows(db, club_id, fields=fieldsets.source_fields(selection))
+#     return fieldsets.json_response(rows, schemas.ClubMember, selection)
+
+FIELDS_QUERY_DESCRIPTION = "응답에 포함할 필드 (쉼표로 구분, 생략하면 전체 필드)"
+
+# 지정하지 않아도 항상 포함하는 필드
+ALWAYS_INCLUDED = ("id",)
+
+# 다른 필드의 값으로 만드는 필드(계산 필드, 리사이즈 버전 목록)와 그 원본 필드
+# (원본 필드는 함께 조회하되 응답에는 요청한 경우에만 포함합니다)
+FIELD_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "thumbnail_url": ("image_url", "image_variants"),
+    "photo_thumbnail_url": ("photo_url", "photo_variants"),
+    "image_variants": ("image_url",),
+    "photo_variants": ("photo_url",),
+}
+
+# 캐시할 응답 스키마 수 (스키마 x 필드 조합)
+RESPONSE_MODEL_CACHE_SIZE = 256
+
+Selection = Tuple[str, ...]
+
+
+def available_fields(schema: Type[BaseModel]) -> List[str]:
+    """fields로 지정할 수 있는 필드 이름을 스키마 순서대로 반환합니다. (계산 필드 포함)"""
+    return list(schema.model_fields) + list(schema.model_computed_fields)
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[Selection]:
+    """
+    fields 쿼리 파라미터를 스키마 필드 순서의 튜플로 바꿉니다. (응답 스키마 캐시의 키로 사용합니다)
+    지정하지 않았거나 비어 있으면 None(전체 필드)을 반환하고, 스키마에 없는 필드가 있으면 400 에러를 발생시킵니다.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        return None
+    available = available_fields(schema)
+    unknown = requested.difference(available)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"알 수 없는 필드입니다: {', '.join(sorted(unknown))} (사용할 수 있는 필드: {', '.join(available)})",
+        )
+    requested.update(name for name in ALWAYS_INCLUDED if name in available)
+    return tuple(name for name in available if name in requested)
+
+
+def source_fields(selection: Optional[Selection]) -> Optional[FrozenSet[str]]:
+    """응답을 만들기 위해 조회해야 하는 필드 집합입니다. (선택한 필드와 그 원본 필드)"""
+    if selection is None:
+        return None
+    needed = set(selection)
+    pending = list(selection)
+    while pending:
+        for source in FIELD_SOURCES.get(pending.pop(), ()):
+            if source not in needed:
+                needed.add(source)
+                pending.append(source)
+    return frozenset(needed)
+
+
+@lru_cache(maxsize=RESPONSE_MODEL_CACHE_SIZE)
+def response_model(schema: Type[BaseModel], selection: Selection) -> Type[BaseModel]:
+    """
+    스키마에서 선택한 필드만 가진 응답 스키마를 만듭니다.
+    계산 필드를 선택한 경우 원본 필드도 함께 정의하되 직렬화에서는 제외합니다.
+    """
+    needed = source_fields(selection)
+    definitions: Dict[str, Any] = {}
+    for name, field in schema.model_fields.items():
+        if name in needed:
+            if name not in selection:
+                field = copy(field)
+                field.exclude = True
+            definitions[name] = (field.annotation, field)
+    computed = {
+        name: computed_field(info.info.wrapped_property)
+        for name, info in schema.__pydantic_decorators__.computed_fields.items()
+        if name in selection
+    }
+    return create_model(
+        f"{schema.__name__}[{','.join(selection)}]",
+        __config__=ConfigDict(from_attributes=True),
+        __validators__=computed,
+        **definitions,
+    )
+
+
+@lru_cache(maxsize=RESPONSE_MODEL_CACHE_SIZE)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def json_response(
+    items: Iterable[Any],
+    schema: Type[BaseModel],
+    selection: Selection,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """ORM 객체 또는 dict 목록을 선택한 필드의 응답 스키마로 검증하고 JSON 응답으로 만듭니다."""
+    adapter = _list_adapter(response_model(schema, selection))
+    body = adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=dict(headers or {}))
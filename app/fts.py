@@ -0,0 +1,200 @@
+import re
+from typing import Any, Iterator, List, Optional, Sequence
+
+from sqlalchemy import column, event, inspect, select, table, text
+from sqlalchemy.engine import Connection, Engine
+
+from . import models
+from .database import record_schema_version, schema_fingerprint, schema_is_current
+
+# SQLite FTS5 전문 검색 인덱스 정의입니다.
+# 한국어는 공백 단위 토큰화로는 부분 문자열 검색이 어려우므로 trigram 토크나이저를 사용합니다.
+# (trigram은 3글자 이상의 검색어부터 인덱스를 사용할 수 있습니다)
+
+TRIGRAM_MIN_LENGTH = 3
+
+# --- 동아리 검색 인덱스 ---
+# clubs 테이블을 원본으로 하는 external content 테이블이며, 트리거로 원본과 동기화됩니다.
+CLUB_FTS_TABLE = "clubs_fts"
+clubs_fts = table(CLUB_FTS_TABLE, column("rowid"))
+
+# bm25 가중치 (name, topic, club_type, description 순서)
+CLUB_FTS_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+_CLUB_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {CLUB_FTS_TABLE} USING fts5(
+        name, topic, club_type, description,
+        content='clubs', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS clubs_fts_ai AFTER INSERT ON clubs BEGIN
+        INSERT INTO {CLUB_FTS_TABLE}(rowid, name, topic, club_type, description)
+        VALUES (new.id, new.name, new.topic, new.club_type, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS clubs_fts_ad AFTER DELETE ON clubs BEGIN
+        INSERT INTO {CLUB_FTS_TABLE}({CLUB_FTS_TABLE}, rowid, name, topic, club_type, description)
+        VALUES ('delete', old.id, old.name, old.topic, old.club_type, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS clubs_fts_au AFTER UPDATE ON clubs BEGIN
+        INSERT INTO {CLUB_FTS_TABLE}({CLUB_FTS_TABLE}, rowid, name, topic, club_type, description)
+        VALUES ('delete', old.id, old.name, old.topic, old.club_type, old.description);
+        INSERT INTO {CLUB_FTS_TABLE}(rowid, name, topic, club_type, description)
+        VALUES (new.id, new.name, new.topic, new.club_type, new.description);
+    END
+    """,
+]
+
+
+# --- 활동 기록 검색 인덱스 ---
+# 제목, 팀, 글 종류와 content(JSON)에서 꺼낸 문자열 값들을 색인합니다. rowid는 활동 기록 ID입니다.
+# content는 JSON 컬럼이라 SQL 트리거로는 원하는 형태로 펼칠 수 없으므로, 아래의 ORM 이벤트로
+# 활동 기록이 생성/수정/삭제될 때 같은 트랜잭션에서 인덱스를 갱신합니다.
+OPERATION_LOG_FTS_TABLE = "operation_logs_fts"
+operation_logs_fts = table(
+    OPERATION_LOG_FTS_TABLE, column("rowid"), column("title"), column("team"), column("post_type"), column("body")
+)
+
+# bm25 가중치 (title, team, post_type, body 순서)
+OPERATION_LOG_FTS_WEIGHTS = (10.0, 2.0, 2.0, 1.0)
+
+# 색인 대상 컬럼 (이 컬럼들이 바뀌지 않은 수정은 다시 색인하지 않습니다)
+_OPERATION_LOG_INDEXED_ATTRIBUTES = ("title", "team", "post_type", "content")
+
+# 인덱스를 처음 만들 때 기존 활동 기록을 한 번에 읽어 넣는 행 수
+OPERATION_LOG_REBUILD_BATCH_SIZE = 500
+
+_OPERATION_LOG_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {OPERATION_LOG_FTS_TABLE} USING fts5(
+        title, team, post_type, body, tokenize='trigram'
+    )
+    """,
+]
+
+
+def flatten_text(value: Any) -> str:
+    """JSON 값에 들어 있는 문자열을 순서대로 모아 한 줄에 하나씩 이어 붙입니다. (키, 숫자, 불리언은 제외)"""
+    return "\n".join(_iter_strings(value))
+
+
+def _iter_strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        if value.strip():
+            yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+# LIKE로 검색한 결과에 만드는 발췌문의 길이 (글자 수)
+LIKE_SNIPPET_LENGTH = 32
+
+
+def like_snippet(text: str, terms: Sequence[str], length: int = LIKE_SNIPPET_LENGTH) -> Optional[str]:
+    """
+    인덱스를 사용할 수 없는 짧은 검색어(LIKE)로 찾은 결과에 FTS5 snippet()과 같은 형식의 발췌문을 만듭니다.
+    처음 일치한 위치 주변 length 글자를 잘라 검색어를 <mark>로 감쌉니다.
+    """
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    found = pattern.search(text)
+    if not found:
+        return None
+    start = max(0, min(found.start() - length // 4, len(text) - length))
+    end = min(len(text), start + length)
+    excerpt = pattern.sub(lambda match: f"<mark>{match.group(0)}</mark>", text[start:end].replace("\n", " "))
+    return ("…" if start else "") + excerpt + ("…" if end < len(text) else "")
+
+
+def _operation_log_document(log_id: int, title, team, post_type, content) -> dict:
+    return {
+        "rowid": log_id, "title": title or "", "team": team or "", "post_type": post_type or "",
+        "body": flatten_text(content),
+    }
+
+
+def _index_operation_logs(connection: Connection, documents: List[dict]):
+    if documents:
+        connection.execute(operation_logs_fts.insert(), documents)
+
+
+def _unindex_operation_log(connection: Connection, log_id: int):
+    connection.execute(operation_logs_fts.delete().where(operation_logs_fts.c.rowid == log_id))
+
+
+@event.listens_for(models.OperationLogDB, "after_insert")
+def _index_created_operation_log(mapper, connection, target):
+    _index_operation_logs(connection, [_operation_log_document(
+        target.id, target.title, target.team, target.post_type, target.content
+    )])
+
+
+@event.listens_for(models.OperationLogDB, "after_update")
+def _reindex_updated_operation_log(mapper, connection, target):
+    attributes = inspect(target).attrs
+    if not any(attributes[name].history.has_changes() for name in _OPERATION_LOG_INDEXED_ATTRIBUTES):
+        return
+    _unindex_operation_log(connection, target.id)
+    _index_created_operation_log(mapper, connection, target)
+
+
+@event.listens_for(models.OperationLogDB, "after_delete")
+def _unindex_deleted_operation_log(mapper, connection, target):
+    _unindex_operation_log(connection, target.id)
+
+
+def rebuild_operation_log_index(connection: Connection):
+    """
+    활동 기록 전체를 배치 단위로 읽어 인덱스를 새로 채웁니다.
+    (ORM을 거치지 않고 활동 기록을 대량으로 저장한 뒤에도 호출합니다)
+    """
+    Log = models.OperationLogDB
+    connection.execute(operation_logs_fts.delete())
+    result = connection.execution_options(yield_per=OPERATION_LOG_REBUILD_BATCH_SIZE).execute(
+        select(Log.id, Log.title, Log.team, Log.post_type, Log.content)
+    )
+    for rows in result.partitions():
+        _index_operation_logs(connection, [_operation_log_document(*row) for row in rows])
+
+
+def _table_exists(connection, name: str) -> bool:
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}
+    ).first() is not None
+
+
+def ensure_search_indexes(bind: Engine):
+    """
+    전문 검색 인덱스와 동기화 트리거를 생성합니다.
+    인덱스를 새로 만든 경우에는 기존 데이터로 한 번 채워 넣습니다.
+    (마지막으로 적용한 정의와 같으면 바로 반환합니다)
+    """
+    fingerprint = schema_fingerprint(_CLUB_FTS_DDL + _OPERATION_LOG_FTS_DDL)
+    if schema_is_current(bind, "search", fingerprint):
+        return
+    with bind.begin() as connection:
+        created = not _table_exists(connection, CLUB_FTS_TABLE)
+        for ddl in _CLUB_FTS_DDL:
+            connection.execute(text(ddl))
+        if created:
+            connection.execute(text(f"INSERT INTO {CLUB_FTS_TABLE}({CLUB_FTS_TABLE}) VALUES ('rebuild')"))
+
+        created = not _table_exists(connection, OPERATION_LOG_FTS_TABLE)
+        for ddl in _OPERATION_LOG_FTS_DDL:
+            connection.execute(text(ddl))
+        if created:
+            rebuild_operation_log_index(connection)
+    record_schema_version(bind, "search", fingerprint)
+
+
+def match_phrase(query: str) -> str:
+    """사용자 입력을 FTS5 MATCH 구문으로 해석되지 않도록 하나의 구(phrase)로 감쌉니다."""
+    return '"' + query.replace('"', '""') + '"'
@@ -1,20 +1,45 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import Response
 
 # 우리가 직접 만든 .py 파일들에서 필요한 것들을 가져옵니다.
 from . import models
-from .database import engine, Base
+from . import auth as auth_utils
+from . import metrics
+from . import admission
+from . import membership
+from .database import engine, ensure_schema, DATABASE_MODE
+from .fts import ensure_search_indexes
+from .pagination import NEXT_CURSOR_HEADER
+from .static_files import CachedStaticFiles
 from .routers import clubs, auth, members, accounting, operation_logs
+from .services import member_service
 
 # 1. 데이터베이스 테이블 생성
-# 앱이 시작될 때, models.py에서 정의한 모든 테이블을 데이터베이스에 생성합니다.
-# (이미 존재하면 아무 동작도 하지 않습니다.)
-Base.metadata.create_all(bind=engine)
+# 앱이 시작될 때, models.py에서 정의한 모든 테이블과 인덱스를 데이터베이스에 생성합니다.
+# (마지막으로 적용한 스키마와 같으면 schema_versions 테이블만 확인하고 넘어갑니다.)
+ensure_schema(bind=engine)
+ensure_search_indexes(bind=engine)
+
+# 동아리 회원 색인을 불러옵니다. (동아리 단위 API의 회원 확인에 사용합니다)
+membership.index.load(engine)
 
 # 2. FastAPI 앱 인스턴스 생성
 app = FastAPI()
 
+# 비동기 데이터베이스 모드(DONGARI_DB_MODE=async)에서는 비동기 라우터를 먼저 등록합니다.
+# 같은 경로는 먼저 등록된 라우터가 처리하므로, 비동기 버전이 없는 경로(파일 업로드, 내보내기)만
+# 아래의 동기 라우터가 처리합니다. API 명세는 동일하므로 문서에는 동기 라우터만 표시합니다.
+# (동기 모드에서는 쓰이지 않으므로 비동기 모드일 때만 불러옵니다)
+if DATABASE_MODE == "async":
+    from .routers import async_clubs, async_members, async_accounting, async_operation_logs
+
+    app.include_router(async_clubs.router, include_in_schema=False)
+    app.include_router(async_members.router, include_in_schema=False)
+    app.include_router(async_accounting.router, include_in_schema=False)
+    app.include_router(async_operation_logs.router, include_in_schema=False)
+    app.dependency_overrides[auth_utils.get_current_user] = auth_utils.get_current_user_async
+
 # /routers/ 디렉터리의 각 파일에 정의된 API 엔드포인트들을 앱에 포함시킵니다.
 app.include_router(clubs.router)
 app.include_router(auth.router)
@@ -23,7 +48,13 @@ app.include_router(accounting.router)
 app.include_router(operation_logs.router)
 
 # static 디렉토리를 /static 경로에 마운트
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# (업로드 파일 경로에는 immutable 캐시 헤더, ETag, Range, 사전 압축 파일 서빙이 적용됩니다)
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
+
+# --- 요청 수용 제어 ---
+# 경로 유형(조회, 쓰기, 업로드, 내보내기, 인증)별 동시 처리 한도와 대기열을 적용합니다.
+# CORS 미들웨어 안쪽에 두어 429/503 응답에도 CORS 헤더가 붙게 합니다.
+app.add_middleware(admission.AdmissionMiddleware)
 
 # --- CORS 미들웨어 설정 시작 ---
 # 허용할 출처(프론트엔드 주소) 목록
@@ -38,15 +69,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # 모든 HTTP 메소드 허용
     allow_headers=["*"], # 모든 HTTP 헤더 허용
+    # 프론트엔드에서 다음 페이지 커서와 조건부 요청용 검증 헤더를 읽을 수 있도록 노출
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified", "Server-Timing", "Retry-After"],
 )
 # --- CORS 미들웨어 설정 끝 ---
 
+# --- 계측 미들웨어 ---
+# 가장 바깥에 두어 CORS 처리를 포함한 전체 요청 시간을 측정합니다. 집계 결과는 /metrics에서 확인합니다.
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.registry.register_cache("principal", auth_utils.principal_cache)
+metrics.registry.register_cache("member_stats", member_service.member_stats_cache)
+metrics.registry.register_cache("non_member", membership.index.non_members)
+metrics.registry.register_snapshot(
+    "dongari_password_hash", auth_utils.password_hash_metrics.snapshot,
+    counters=("completed", "rejected", "queue_wait_seconds_total", "hash_seconds_total"),
+)
+metrics.registry.register_collector(admission.collect)
+
 # --- API 엔드포인트 구현 ---
 
 @app.get("/")
 def read_root():
     return {"message": "동아리음 백엔드 서버입니다."}
 
+@app.get(metrics.METRICS_PATH, include_in_schema=False)
+def read_metrics():
+    """요청/데이터베이스/캐시 집계 값을 Prometheus 텍스트 형식으로 반환합니다."""
+    return Response(content=metrics.registry.render(), media_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
 # [삭제] 동아리 생성 API (routers/groups.py로 이동)
 # [삭제] 동아리 검색 API (routers/groups.py로 이동)
 # [삭제] 동아리 참여 API (routers/groups.py로 이동)
\ No newline at end of file
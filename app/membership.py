@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Set
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from . import auth as auth_utils
+from . import models
+from .cache import TTLCache
+from .database import read_engine
+
+# 동아리 회원 여부를 요청마다 데이터베이스에 묻지 않도록, user_club_association을 프로세스 메모리에
+# {사용자 ID: 가입한 동아리 ID 집합} 형태로 올려 두는 색인입니다.
+# - 앱 시작 시 한 번 불러오고, 가입/탈퇴 시 커밋 후에 바로 갱신합니다.
+# - 색인에 없는 경우에는 데이터베이스를 한 번 더 확인합니다. (다른 워커 프로세스에서 가입한 경우)
+#   회원이 아니었던 (사용자, 동아리)는 MEMBERSHIP_NEGATIVE_TTL_SECONDS 동안 기억하여, 반복되는 403 요청이
+#   매번 스레드와 쿼리를 쓰지 않게 합니다. (이 프로세스에서 가입하면 바로 지웁니다)
+# - 다른 워커에서 탈퇴한 경우를 반영하기 위해 MEMBERSHIP_REFRESH_SECONDS마다 전체를 다시 불러옵니다.
+#
+# 동아리 단위 라우터에서는 라우터 의존성으로 사용합니다.
+#
+#     router = APIRouter(..., dependencies=[Depends(membership.require_club_member)])
+
+MEMBERSHIP_REFRESH_SECONDS = float(os.getenv("DONGARI_MEMBERSHIP_REFRESH_SECONDS", "300"))
+MEMBERSHIP_NEGATIVE_TTL_SECONDS = float(os.getenv("DONGARI_MEMBERSHIP_NEGATIVE_TTL_SECONDS", "10"))
+NON_MEMBER_CACHE_MAX_SIZE = 4096
+
+_association = models.user_club_association
+
+
+class MembershipIndex:
+    """사용자별 가입 동아리 ID 집합입니다. 조회는 잠금 없이 O(1)로 처리합니다."""
+
+    def __init__(self):
+        self._clubs: Dict[int, Set[int]] = {}
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+        self._reloading = False
+        # 데이터베이스에서도 회원이 아니었던 (사용자 ID, 동아리 ID)
+        self.non_members = TTLCache(maxsize=NON_MEMBER_CACHE_MAX_SIZE, ttl=MEMBERSHIP_NEGATIVE_TTL_SECONDS)
+
+    def load(self, bind: Engine):
+        """user_club_association 전체를 읽어 색인을 새로 만듭니다."""
+        clubs: Dict[int, Set[int]] = {}
+        with bind.connect() as connection:
+            for user_id, club_id in connection.execute(select(_association.c.user_id, _association.c.club_id)):
+                clubs.setdefault(user_id, set()).add(club_id)
+        with self._lock:
+            self._clubs = clubs
+            self.loaded_at = time.monotonic()
+
+    def needs_reload(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > MEMBERSHIP_REFRESH_SECONDS
+
+    def reload_once(self, bind: Engine):
+        """다른 요청이 이미 다시 불러오는 중이면 기다리지 않고 반환합니다."""
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        try:
+            self.load(bind)
+        finally:
+            self._reloading = False
+
+    def contains(self, user_id: int, club_id: int) -> bool:
+        clubs = self._clubs.get(user_id)
+        return clubs is not None and club_id in clubs
+
+    def clubs_of(self, user_id: int) -> FrozenSet[int]:
+        return frozenset(self._clubs.get(user_id, ()))
+
+    def add(self, user_id: int, club_id: int):
+        with self._lock:
+            self._clubs.setdefault(user_id, set()).add(club_id)
+        self.non_members.invalidate((user_id, club_id))
+
+    def discard(self, user_id: int, club_id: int):
+        with self._lock:
+            clubs = self._clubs.get(user_id)
+            if clubs is not None:
+                clubs.discard(club_id)
+
+
+index = MembershipIndex()
+
+
+def _is_member_in_database(user_id: int, club_id: int) -> bool:
+    with read_engine.connect() as connection:
+        return connection.execute(
+            select(_association.c.club_id)
+            .where(_association.c.user_id == user_id, _association.c.club_id == club_id)
+            .limit(1)
+        ).first() is not None
+
+
+async def is_member(user_id: int, club_id: int) -> bool:
+    """
+    회원 여부를 색인으로 확인하고, 색인에 없으면 데이터베이스를 확인하여 색인에 추가합니다.
+    데이터베이스에도 없으면 잠시 동안 같은 확인을 반복하지 않도록 기억해 둡니다.
+    """
+    if index.needs_reload():
+        await run_in_threadpool(index.reload_once, read_engine)
+    if index.contains(user_id, club_id):
+        return True
+    key = (user_id, club_id)
+    if index.non_members.get(key):
+        return False
+    if await run_in_threadpool(_is_member_in_database, user_id, club_id):
+        index.add(user_id, club_id)
+        return True
+    index.non_members.set(key, True)
+    return False
+
+
+async def require_club_member(
+    club_id: int,
+    current_user: models.UserDB = Depends(auth_utils.get_current_active_user),
+) -> models.UserDB:
+    """경로의 club_id 동아리에 가입한 사용자만 허용하는 의존성 함수입니다. (로그인하지 않았으면 401, 회원이 아니면 403)"""
+    if not await is_member(current_user.id, club_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="동아리 회원만 접근할 수 있습니다.")
+    return current_user
@@ -0,0 +1,301 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 요청/데이터베이스 계측 모듈입니다.
+# - MetricsMiddleware: 경로(라우트 템플릿)별 지연 시간 히스토그램, 상태 코드별 요청 수, 처리 중인 요청 수를 집계하고
+#   응답에 Server-Timing 헤더(db: 데이터베이스 시간, app: 나머지 시간)를 붙입니다.
+# - instrument_engine: 엔진의 커서 이벤트로 요청별 쿼리 수와 데이터베이스 시간을 집계하고,
+#   SLOW_QUERY_SECONDS보다 오래 걸린 쿼리는 요청 경로와 함께 로그로 남깁니다.
+# 집계 결과는 /metrics에서 Prometheus 텍스트 형식으로 제공합니다.
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = "/metrics"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 이 시간보다 오래 걸린 쿼리는 경고 로그로 남깁니다. (DONGARI_SLOW_QUERY_MS, 기본 200ms)
+SLOW_QUERY_SECONDS = float(os.getenv("DONGARI_SLOW_QUERY_MS", "200")) / 1000
+SLOW_QUERY_LOG_LENGTH = 500
+
+# 라우트에 일치하지 않은 요청(404)과 요청 밖에서 실행된 쿼리(백그라운드 작업 등)의 경로 이름
+UNMATCHED_ROUTE = "unmatched"
+BACKGROUND_ROUTE = "background"
+
+
+class RequestStats:
+    """한 요청 동안 실행된 쿼리 수와 데이터베이스 시간입니다."""
+
+    __slots__ = ("scope", "queries", "db_seconds", "slow_queries")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slow_queries = 0
+
+    @property
+    def route(self) -> str:
+        return route_name(self.scope)
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def route_name(scope: dict) -> str:
+    """
+    집계에 사용할 경로 이름을 반환합니다. 경로 파라미터별로 시계열이 늘어나지 않도록
+    실제 경로 대신 라우트 템플릿(예: /clubs/{club_id}/members)을 사용합니다.
+    (라우팅 전에 응답한 미들웨어는 scope["metrics_route"]로 이름을 지정할 수 있습니다)
+    """
+    if "metrics_route" in scope:
+        return scope["metrics_route"]
+    route = scope.get("route")
+    if route is not None:
+        return route.path_format
+    if scope.get("endpoint") is not None:
+        # 마운트된 앱(/static)은 마운트 경로로 묶습니다.
+        return scope.get("root_path", "") or scope.get("path", "")
+    return UNMATCHED_ROUTE
+
+
+_CACHE_METRICS = (
+    ("hits", "dongari_cache_hits_total", "counter", "캐시 적중 수"),
+    ("misses", "dongari_cache_misses_total", "counter", "캐시 실패 수"),
+    ("evictions", "dongari_cache_evictions_total", "counter", "크기 제한으로 제거된 항목 수"),
+    ("size", "dongari_cache_size", "gauge", "캐시 항목 수"),
+)
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "total", "count")
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, upper in enumerate(LATENCY_BUCKETS):
+            if value <= upper:
+                self.bucket_counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """프로세스 내 집계 값입니다. 여러 스레드(요청)에서 동시에 갱신할 수 있습니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.request_latency: Dict[Tuple[str, str], _Histogram] = {}
+        self.request_counts: Dict[Tuple[str, str, str], int] = {}
+        self.db_queries: Dict[str, int] = {}
+        self.db_seconds: Dict[str, float] = {}
+        self.db_slow_queries: Dict[str, int] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+        self._caches: Dict[str, object] = {}
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float):
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self.request_latency.get((method, route))
+            if histogram is None:
+                histogram = self.request_latency[(method, route)] = _Histogram()
+            histogram.observe(seconds)
+            key = (method, route, str(status))
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    def record_query(self, route: str, seconds: float, slow: bool):
+        with self._lock:
+            self.db_queries[route] = self.db_queries.get(route, 0) + 1
+            self.db_seconds[route] = self.db_seconds.get(route, 0.0) + seconds
+            if slow:
+                self.db_slow_queries[route] = self.db_slow_queries.get(route, 0) + 1
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]):
+        """/metrics에 추가로 출력할 줄을 만드는 함수를 등록합니다."""
+        self._collectors.append(collector)
+
+    def register_cache(self, name: str, cache):
+        """TTLCache의 적중/실패/제거 횟수와 항목 수를 cache 레이블로 출력합니다."""
+        self._caches[name] = cache
+
+    def register_snapshot(self, prefix: str, snapshot: Callable[[], Dict[str, float]], counters: Iterable[str] = ()):
+        """
+        snapshot()이 반환하는 {이름: 값}을 prefix_이름으로 출력합니다.
+        counters에 포함된 이름은 counter(_total), 나머지는 gauge로 출력합니다.
+        """
+        counters = frozenset(counters)
+
+        def collect():
+            for name, value in snapshot().items():
+                if name in counters:
+                    metric = f"{prefix}_{name}" if name.endswith("_total") else f"{prefix}_{name}_total"
+                    yield f"# TYPE {metric} counter"
+                else:
+                    metric = f"{prefix}_{name}"
+                    yield f"# TYPE {metric} gauge"
+                yield f"{metric} {value}"
+        self.register_collector(collect)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식으로 출력합니다."""
+        with self._lock:
+            in_flight = self.in_flight
+            latency = {key: (list(h.bucket_counts), h.total, h.count) for key, h in self.request_latency.items()}
+            request_counts = dict(self.request_counts)
+            db_queries = dict(self.db_queries)
+            db_seconds = dict(self.db_seconds)
+            db_slow_queries = dict(self.db_slow_queries)
+
+        lines = [
+            "# HELP dongari_http_requests_in_flight 처리 중인 HTTP 요청 수",
+            "# TYPE dongari_http_requests_in_flight gauge",
+            f"dongari_http_requests_in_flight {in_flight}",
+            "# HELP dongari_http_requests_total 경로와 상태 코드별 HTTP 요청 수",
+            "# TYPE dongari_http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(request_counts.items()):
+            lines.append(f'dongari_http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP dongari_http_request_duration_seconds 경로별 HTTP 요청 처리 시간",
+            "# TYPE dongari_http_request_duration_seconds histogram",
+        ]
+        for (method, route), (bucket_counts, total, count) in sorted(latency.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for upper, bucket_count in zip(LATENCY_BUCKETS, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'dongari_http_request_duration_seconds_bucket{{{labels},le="{upper}"}} {cumulative}')
+            lines.append(f'dongari_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"dongari_http_request_duration_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"dongari_http_request_duration_seconds_count{{{labels}}} {count}")
+
+        lines += [
+            "# HELP dongari_db_queries_total 경로별 실행한 SQL 문 수",
+            "# TYPE dongari_db_queries_total counter",
+        ]
+        lines += [f'dongari_db_queries_total{{route="{_escape(route)}"}} {count}' for route, count in sorted(db_queries.items())]
+        lines += [
+            "# HELP dongari_db_query_seconds_total 경로별 SQL 실행 시간 합계",
+            "# TYPE dongari_db_query_seconds_total counter",
+        ]
+        lines += [f'dongari_db_query_seconds_total{{route="{_escape(route)}"}} {seconds:.6f}' for route, seconds in sorted(db_seconds.items())]
+        lines += [
+            f"# HELP dongari_db_slow_queries_total 경로별 느린 쿼리({SLOW_QUERY_SECONDS * 1000:g}ms 초과) 수",
+            "# TYPE dongari_db_slow_queries_total counter",
+        ]
+        lines += [f'dongari_db_slow_queries_total{{route="{_escape(route)}"}} {count}' for route, count in sorted(db_slow_queries.items())]
+
+        if self._caches:
+            cache_stats = {name: cache.stats() for name, cache in sorted(self._caches.items())}
+            for key, metric, metric_type, description in _CACHE_METRICS:
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} {metric_type}")
+                lines += [f'{metric}{{cache="{name}"}} {stats[key]}' for name, stats in cache_stats.items()]
+
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+# --- 데이터베이스 계측 ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    slow = elapsed >= SLOW_QUERY_SECONDS
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        stats.slow_queries += slow
+        route = stats.route
+    else:
+        route = BACKGROUND_ROUTE
+    registry.record_query(route, elapsed, slow)
+    if slow:
+        logger.warning(
+            "느린 쿼리 %.1fms (%s): %s", elapsed * 1000, route, " ".join(statement.split())[:SLOW_QUERY_LOG_LENGTH]
+        )
+
+
+def instrument_engine(engine: Engine):
+    """엔진에 쿼리 수와 실행 시간을 집계하는 커서 이벤트를 등록합니다."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- 요청 계측 ---
+
+def _server_timing(stats: RequestStats, elapsed: float) -> bytes:
+    db_ms = stats.db_seconds * 1000
+    app_ms = max(elapsed * 1000 - db_ms, 0.0)
+    return f'db;dur={db_ms:.1f};desc="{stats.queries} queries", app;dur={app_ms:.1f}'.encode("latin-1")
+
+
+class MetricsMiddleware:
+    """
+    요청별 지연 시간, 상태 코드, 처리 중인 요청 수, 쿼리 수와 데이터베이스 시간을 집계합니다.
+    (스트리밍 응답도 본문 전송이 끝날 때까지를 측정해야 하므로 순수 ASGI 미들웨어로 구현합니다)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+        registry.request_started()
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - started)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            registry.request_finished(scope["method"], stats.route, status, time.perf_counter() - started)
+            _request_stats.reset(token)
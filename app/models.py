@@ -1,12 +1,16 @@
-from sqlalchemy import Column, Integer, String, Table, ForeignKey, DateTime, JSON, Date, CHAR
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, DateTime, Date, CHAR, Index, func
+from sqlalchemy.orm import deferred, relationship
 from .database import Base # 방금 만든 database.py에서 Base를 가져옵니다.
+from .compression import CompressedJSON
 from datetime import datetime
 
 # User와 Club 간의 다대다 관계를 위한 연결 테이블
 user_club_association = Table('user_club_association', Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id')),
-    Column('club_id', Integer, ForeignKey('clubs.id'))
+    Column('club_id', Integer, ForeignKey('clubs.id')),
+    # 가입 여부 확인(사용자, 동아리)을 인덱스만으로 처리하고, 동시에 가입해도 같은 행이 두 번 저장되지 않게 합니다.
+    # (이전의 일반 인덱스 ix_user_club_association_user_club은 database._migrate_memberships가 바꿉니다)
+    Index('uq_user_club_association_user_club', 'user_id', 'club_id', unique=True),
 )
 
 # 'users' 테이블 모델
@@ -54,6 +58,13 @@ class ClubDB(Base):
     # 이 동아리의 기록 목록
     operation_logs = relationship("OperationLogDB", back_populates="club", cascade="all, delete-orphan")
 
+    # 대표 이미지의 리사이즈 버전 목록
+    # (존재/권한 확인처럼 동아리만 읽는 곳에서는 필요 없으므로, 응답에 포함하는 조회에서만 selectinload로 함께 로드)
+    image_variants = relationship("ImageDerivativeDB",
+                                  primaryjoin="foreign(ImageDerivativeDB.source_url) == ClubDB.image_url",
+                                  viewonly=True, lazy="select",
+                                  order_by="ImageDerivativeDB.width")
+
 # 'club_members' 테이블 모델 (동아리 운영진이 관리하는 명단)
 class ClubMemberDB(Base):
     __tablename__ = "club_members"
@@ -74,6 +85,11 @@ class ClubMemberDB(Base):
     club_id = Column(Integer, ForeignKey("clubs.id"))
     club = relationship("ClubDB", back_populates="club_members")
 
+    # 동아리별 명단 통계(기수별 인원 등 GROUP BY 집계)를 위한 복합 인덱스
+    __table_args__ = (
+        Index("ix_club_members_club_year", "club_id", "member_year"),
+    )
+
 # 'accounting_entries' 테이블 모델
 class AccountingEntryDB(Base):
     __tablename__ = "accounting_entries"
@@ -84,11 +100,26 @@ class AccountingEntryDB(Base):
     description = Column(String, nullable=False) # 내역
     amount = Column(Integer, nullable=False) # 금액 (수입: 양수, 지출: 음수)
     photo_url = Column(String, nullable=True) # 영수증 사진 경로
+    # 중복 확인용 해시 (날짜, 금액, 정규화한 내역으로 계산. accounting_service.entry_dedup_key 참고)
+    dedup_key = Column(String(64), nullable=True)
 
     # 이 회계 내역이 속한 동아리
     club_id = Column(Integer, ForeignKey("clubs.id"))
     club = relationship("ClubDB", back_populates="accounting_entries")
 
+    # 영수증 사진의 리사이즈 버전 목록 (응답에 포함하는 생성/수정에서만 불러옵니다)
+    photo_variants = relationship("ImageDerivativeDB",
+                                  primaryjoin="foreign(ImageDerivativeDB.source_url) == AccountingEntryDB.photo_url",
+                                  viewonly=True, lazy="select",
+                                  order_by="ImageDerivativeDB.width")
+
+    # 동아리별 날짜순 장부 조회(기간 필터, 커서 페이지네이션, 누적 잔액 계산)를 위한 복합 인덱스
+    __table_args__ = (
+        Index("ix_accounting_entries_club_date_id", "club_id", "date", "id"),
+        # 은행 거래내역 가져오기에서 이미 등록된 내역을 찾기 위한 인덱스
+        Index("ix_accounting_entries_club_dedup", "club_id", "dedup_key"),
+    )
+
 # 'posts' 테이블 모델
 class OperationLogDB(Base):
     __tablename__ = "operation_logs"
@@ -103,7 +134,8 @@ class OperationLogDB(Base):
     team = Column(String, nullable=True)
     # -------------------------
 
-    content = Column(JSON, nullable=False)
+    # 큰 값은 압축해서 저장하며(compression.py), 목록/상세처럼 content가 필요한 조회에서만 불러옵니다. (undefer)
+    content = deferred(Column(CompressedJSON, nullable=False))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -114,12 +146,49 @@ class OperationLogDB(Base):
     author = relationship("UserDB", back_populates="operation_logs")
     files = relationship("UploadedFileDB", back_populates="operation_log", cascade="all, delete-orphan")
 
+    # 동아리별 최신순 목록 조회(커서 페이지네이션)를 인덱스 범위 스캔으로 처리하기 위한 복합 인덱스
+    # 기간 조회(달력)는 "끝나는 날짜 >= 조회 시작일"을 범위 스캔하고, "시작 날짜 <= 조회 종료일"은 인덱스 안에서 거릅니다.
+    # (끝나는 날짜가 없는 기록은 시작 날짜 하루짜리로 보며, 쿼리에서도 같은 coalesce 식을 사용해야 인덱스를 탑니다)
+    __table_args__ = (
+        Index("ix_operation_logs_club_created_id", "club_id", created_at.desc(), "id"),
+        Index("ix_operation_logs_club_period", "club_id", func.coalesce(end_date, start_date), "start_date"),
+        Index("ix_operation_logs_club_type_period", "club_id", "post_type", func.coalesce(end_date, start_date), "start_date"),
+        Index("ix_operation_logs_club_team_period", "club_id", "team", func.coalesce(end_date, start_date), "start_date"),
+    )
+
 class UploadedFileDB(Base):
     __tablename__ = "uploaded_files"
 
     id = Column(Integer, primary_key=True, index=True)
     file_name = Column(String)
     file_path = Column(String)
-    operation_log_id = Column(Integer, ForeignKey("operation_logs.id"))
+    operation_log_id = Column(Integer, ForeignKey("operation_logs.id"), index=True)
+
+    operation_log = relationship("OperationLogDB", back_populates="files")
 
-    operation_log = relationship("OperationLogDB", back_populates="files")
\ No newline at end of file
+# 'image_derivatives' 테이블 모델 (업로드된 이미지의 리사이즈 버전)
+# 업로드 파일은 내용 해시로 저장되므로, 같은 이미지를 여러 곳에서 사용해도 리사이즈 버전은 한 벌만 만듭니다.
+class ImageDerivativeDB(Base):
+    __tablename__ = "image_derivatives"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_url = Column(String, index=True, nullable=False) # 원본 이미지 경로
+    width = Column(Integer, nullable=False) # 가로 크기(px)
+    format = Column(String, nullable=False) # 'webp' 또는 'jpeg'
+    url = Column(String, nullable=False) # 리사이즈 이미지 경로
+
+    # 같은 이미지가 동시에 여러 번 업로드되어 리사이즈 작업이 겹쳐도 크기/형식별로 한 행만 기록합니다.
+    # (기존 데이터베이스의 중복 행은 database._dedupe_image_derivatives가 정리합니다)
+    __table_args__ = (
+        Index("uq_image_derivatives_source_width_format", "source_url", "width", "format", unique=True),
+    )
+
+# 'club_versions' 테이블 모델 (동아리별 변경 카운터)
+# 동아리 정보, 부원, 회계 내역, 활동 기록이 바뀔 때마다 version이 1씩 올라가며(club_versions.py),
+# 조회 API는 이 값으로 ETag/Last-Modified를 만들어 변경이 없으면 목록을 읽지 않고 304로 응답합니다.
+class ClubVersionDB(Base):
+    __tablename__ = "club_versions"
+
+    club_id = Column(Integer, ForeignKey("clubs.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,48 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException
+
+# 목록 API의 커서(keyset) 페이지네이션에 사용하는 헬퍼입니다.
+# 커서는 마지막으로 내려준 행의 정렬 키 값들을 JSON으로 묶어 base64로 인코딩한 문자열입니다.
+# 클라이언트는 응답 헤더의 X-Next-Cursor 값을 다음 요청의 cursor 쿼리 파라미터로 그대로 넘기면 됩니다.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """정렬 키 값들을 불투명한 커서 문자열로 인코딩합니다."""
+    raw = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    커서 문자열을 정렬 키 값 목록으로 디코딩합니다.
+    형식이 잘못된 경우 400 에러를 발생시킵니다.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="잘못된 커서 값입니다.")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="잘못된 커서 값입니다.")
+    return values
+
+
+def split_page(
+    items: Sequence[T], limit: Optional[int], cursor_key: Callable[[T], Tuple[Any, ...]]
+) -> Tuple[List[T], Optional[str]]:
+    """
+    limit + 1개까지 조회한 결과를 한 페이지 분량과 다음 커서로 나눕니다.
+    다음 페이지가 없으면 커서는 None입니다.
+    """
+    items = list(items)
+    if limit is None or len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(*cursor_key(items[-1]))
@@ -1,25 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, UploadFile, Form, Query, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
-import shutil
-import uuid
-import pandas as pd
-from fastapi.responses import StreamingResponse
-import io
-from urllib.parse import quote
+from typing import Dict, List, Literal, Optional
+from starlette.concurrency import run_in_threadpool
+import json
 
-from .. import models, schemas
-from ..database import get_db
-from ..services import accounting_service
+from .. import conditional, fieldsets, membership, models, schemas
+from ..database import get_db, get_read_db
+from ..pagination import NEXT_CURSOR_HEADER
+from ..services import accounting_service, export_service, image_service, import_service, upload_service
 
 router = APIRouter(
     prefix="/clubs/{club_id}/accounting",
     tags=["Accounting"],
+    dependencies=[Depends(membership.require_club_member)],
 )
 
 @router.post("", response_model=schemas.AccountingEntry)
-def create_accounting_entry(
+async def create_accounting_entry(
     club_id: int,
+    background_tasks: BackgroundTasks,
     date: str = Form(...),
     description: str = Form(...),
     amount: int = Form(...),
@@ -29,47 +28,110 @@ def create_accounting_entry(
 ):
     """
     새로운 회계 내역을 생성합니다 (사진 업로드 포함).
+    업로드는 이벤트 루프에서 청크 단위로 저장하고, 데이터베이스 작업은 스레드 풀에서 실행합니다.
+    사진의 리사이즈 버전은 응답 후 백그라운드에서 만들어집니다.
     """
-    return accounting_service.create_new_entry(
+    photo_url = await upload_service.save_upload(photo, kind="image")
+    if photo_url:
+        background_tasks.add_task(image_service.generate_derivatives, photo_url)
+    return await run_in_threadpool(
+        accounting_service.create_new_entry,
         db=db,
         club_id=club_id,
         date=date,
         description=description,
         amount=amount,
         manager=manager,
-        photo=photo
+        photo_url=photo_url
     )
 
-@router.get("", response_model=List[schemas.AccountingEntry])
+@router.post("/import", response_model=schemas.AccountingImportResult)
+async def import_bank_statement(
+    club_id: int,
+    file: UploadFile = File(...),
+    mapping: Optional[str] = Form(None),
+    dry_run: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    """
+    은행 거래내역 파일(CSV/xlsx)을 회계 내역으로 가져옵니다.
+    열 제목은 '거래일자', '적요', '입금', '출금' 같은 흔한 이름을 자동으로 찾으며, 다르면 mapping에
+    JSON 문자열로 지정합니다. (예: {"date": "거래일", "description": "메모", "amount": "거래금액"})
+    이미 등록된 내역(날짜, 금액, 내역이 같은 내역)은 건너뛰고 새 내역만 하나의 트랜잭션으로 저장합니다.
+    dry_run=true이면 저장하지 않고 행별 결과만 미리 보여 줍니다.
+    """
+    import_format = import_service.detect_format(file.filename)
+    column_mapping = None
+    if mapping:
+        try:
+            column_mapping = json.loads(mapping)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="mapping은 JSON 문자열이어야 합니다.")
+        if not isinstance(column_mapping, dict) or not all(
+            isinstance(value, str) for value in column_mapping.values()
+        ):
+            raise HTTPException(status_code=400, detail="mapping은 {필드: 열 제목} 형식이어야 합니다.")
+
+    # 업로드 파일은 임시 파일로 받아 두고, 스레드 풀에서 한 행씩 읽어 저장합니다.
+    return await run_in_threadpool(
+        accounting_service.import_statement_file,
+        db=db,
+        club_id=club_id,
+        file=file.file,
+        import_format=import_format,
+        mapping=column_mapping,
+        dry_run=dry_run,
+    )
+
+@router.get("", response_model=List[schemas.AccountingLedgerEntry])
 def get_accounting_entries(
-    club_id: int, 
-    db: Session = Depends(get_db),
-    export: bool = False
+    club_id: int,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    export: bool = False,
+    export_format: Literal["xlsx", "csv"] = Query("xlsx", alias="format"),
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    manager: Optional[str] = None,
+    sign: Optional[Literal["income", "expense"]] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=fieldsets.FIELDS_QUERY_DESCRIPTION),
+    validators: Dict[str, str] = Depends(conditional.club_validators),
 ):
     """
-    특정 동아리의 모든 회계 내역을 조회합니다.
-    export=true 쿼리 파라미터가 있으면 엑셀 파일로 내보냅니다.
+    특정 동아리의 회계 내역을 날짜순으로 조회합니다. 각 내역에는 누적 잔액(balance)이 포함됩니다.
+    date_from/date_to(기간), manager(담당자), sign(income/expense) 쿼리 파라미터로 필터링할 수 있고,
+    limit을 지정하면 다음 페이지 커서를 X-Next-Cursor 응답 헤더로 반환합니다.
+    fields=id,date,amount 처럼 필드를 지정하면 해당 필드만 조회하여 반환합니다. (balance를 빼면 누적 잔액을 계산하지 않습니다)
+    export=true 쿼리 파라미터가 있으면 format(xlsx/csv) 형식의 파일로 내보냅니다.
+    (동아리에 변경이 없으면 If-None-Match / If-Modified-Since 요청에 304로 응답합니다)
     """
     if export:
-        excel_data, club_name = accounting_service.export_to_excel(db, club_id)
-        filename = f"회계내역_{club_name}.xlsx"
-        encoded_filename = quote(filename)
-        
-        headers = {
-            'Content-Disposition': f"attachment; filename*=UTF-8''{encoded_filename}"
-        }
-        
-        return StreamingResponse(
-            excel_data, 
-            media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            headers=headers
-        )
+        file_chunks, club_name = accounting_service.export_ledger(db, club_id, export_format)
+        file_response = export_service.download_response(file_chunks, f"회계내역_{club_name}", export_format)
+        file_response.headers.update(validators)
+        return file_response
     
     # export=false 인 경우
-    db_club = db.query(models.ClubDB).filter(models.ClubDB.id == club_id).first()
-    if not db_club:
-        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
-    return db_club.accounting_entries 
+    selection = fieldsets.parse_fields(fields, schemas.AccountingLedgerEntry)
+    entries, next_cursor = accounting_service.get_ledger(
+        db=db,
+        club_id=club_id,
+        date_from=date_from,
+        date_to=date_to,
+        manager=manager,
+        sign=sign,
+        limit=limit,
+        cursor=cursor,
+        fields=fieldsets.source_fields(selection),
+    )
+    if selection is not None:
+        headers = {**validators, NEXT_CURSOR_HEADER: next_cursor} if next_cursor else validators
+        return fieldsets.json_response(entries, schemas.AccountingLedgerEntry, selection, headers=headers)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return entries
 
 @router.patch("/{entry_id}", response_model=schemas.AccountingEntry)
 def update_accounting_entry(
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Literal, Optional
+
+from .. import conditional, fieldsets, membership, schemas
+from ..database import get_async_db
+from ..pagination import NEXT_CURSOR_HEADER
+from ..services import async_accounting_service, export_service
+
+# routers/accounting.py의 비동기 데이터베이스 모드 버전입니다. (DONGARI_DB_MODE=async)
+# 여기에 없는 경로(사진 업로드가 포함된 내역 생성)는 동기 라우터가 처리합니다.
+
+router = APIRouter(
+    prefix="/clubs/{club_id}/accounting",
+    tags=["Accounting"],
+    dependencies=[Depends(membership.require_club_member)],
+)
+
+@router.get("", response_model=List[schemas.AccountingLedgerEntry])
+async def get_accounting_entries(
+    club_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    export: bool = False,
+    export_format: Literal["xlsx", "csv"] = Query("xlsx", alias="format"),
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    manager: Optional[str] = None,
+    sign: Optional[Literal["income", "expense"]] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=fieldsets.FIELDS_QUERY_DESCRIPTION),
+    validators: Dict[str, str] = Depends(conditional.club_validators_async),
+):
+    """
+    특정 동아리의 회계 내역을 날짜순으로 조회합니다. 각 내역에는 누적 잔액(balance)이 포함됩니다.
+    export=true 쿼리 파라미터가 있으면 format(xlsx/csv) 형식의 파일로 내보냅니다.
+    """
+    if export:
+        file_chunks, club_name = await async_accounting_service.export_ledger(db, club_id, export_format)
+        file_response = export_service.download_response(file_chunks, f"회계내역_{club_name}", export_format)
+        file_response.headers.update(validators)
+        return file_response
+
+    selection = fieldsets.parse_fields(fields, schemas.AccountingLedgerEntry)
+    entries, next_cursor = await async_accounting_service.get_ledger(
+        db=db,
+        club_id=club_id,
+        date_from=date_from,
+        date_to=date_to,
+        manager=manager,
+        sign=sign,
+        limit=limit,
+        cursor=cursor,
+        fields=fieldsets.source_fields(selection),
+    )
+    if selection is not None:
+        headers = {**validators, NEXT_CURSOR_HEADER: next_cursor} if next_cursor else validators
+        return fieldsets.json_response(entries, schemas.AccountingLedgerEntry, selection, headers=headers)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return entries
+
+@router.patch("/{entry_id}", response_model=schemas.AccountingEntry)
+async def update_accounting_entry(
+    club_id: int,
+    entry_id: int,
+    entry_update: schemas.AccountingEntryUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 회계 내역을 수정합니다.
+    """
+    return await async_accounting_service.update_entry(db=db, club_id=club_id, entry_id=entry_id, entry_update=entry_update)
+
+@router.delete("/{entry_id}", status_code=204)
+async def delete_accounting_entry(
+    club_id: int,
+    entry_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 회계 내역을 삭제합니다.
+    """
+    await async_accounting_service.delete_entry(db=db, club_id=club_id, entry_id=entry_id)
+    return None
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+
+from .. import conditional, fast_json, models, schemas, auth as auth_utils
+from ..database import get_async_db
+from ..services import async_club_service
+
+# routers/clubs.py의 비동기 데이터베이스 모드 버전입니다. (DONGARI_DB_MODE=async)
+# 여기에 없는 경로(이미지 업로드가 포함된 동아리 생성)는 동기 라우터가 처리합니다.
+
+router = APIRouter(
+    prefix="/clubs",
+    tags=["Clubs"]
+)
+
+@router.get("", response_model=List[schemas.ClubSearchResult])
+async def get_clubs(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    name: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    highlight: bool = False,
+):
+    """
+    동아리 목록을 조회합니다.
+    'name' 쿼리 파라미터가 제공되면 이름, 주제, 유형, 설명에서 검색하여 관련도 순으로 반환합니다.
+    (limit/offset으로 페이지를 나누고, highlight=true이면 일치한 부분의 발췌문을 함께 반환합니다)
+    """
+    if fast_json.FAST_JSON_ENABLED:
+        if name:
+            rows = await async_club_service.search_club_rows(db=db, name=name, limit=limit, offset=offset, highlight=highlight)
+        else:
+            rows = await async_club_service.get_all_club_rows(db=db)
+        return fast_json.json_response(request, rows)
+    if name:
+        return await async_club_service.search_clubs_by_name(db=db, name=name, limit=limit, offset=offset, highlight=highlight)
+    return await async_club_service.get_all_clubs(db=db)
+
+@router.post("/join", response_model=schemas.JoinClubResponse)
+async def join_club(
+    join_request: schemas.ClubJoin,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.UserDB = Depends(auth_utils.get_current_active_user),
+):
+    """
+    이름과 비밀번호로 특정 동아리에 참여합니다.
+    """
+    db_club = await async_club_service.join_club(db=db, join_request=join_request, user=current_user)
+    return {"message": "가입에 성공했습니다.", "club_id": db_club.id}
+
+@router.post("/{club_id}/leave", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_club(
+    club_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.UserDB = Depends(auth_utils.get_current_active_user),
+):
+    """
+    동아리에서 탈퇴합니다.
+    """
+    await async_club_service.leave_club(db=db, club_id=club_id, user=current_user)
+
+@router.get("/{club_id}", response_model=schemas.Club)
+async def get_club_by_id(
+    club_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    validators: Dict[str, str] = Depends(conditional.club_validators_async),
+):
+    """
+    ID로 특정 동아리의 id, name, image_url, description, club_type, topic을 반환합니다.
+    """
+    return await async_club_service.get_club_by_id(db=db, club_id=club_id)
@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Literal, Optional
+
+from .. import conditional, fast_json, fieldsets, membership, schemas
+from ..database import get_async_db
+from ..services import async_member_service, export_service
+
+# routers/members.py의 비동기 데이터베이스 모드 버전입니다. (DONGARI_DB_MODE=async)
+# 여기에 없는 경로(명단 일괄 추가)는 동기 라우터가 처리합니다.
+
+router = APIRouter(
+    prefix="/clubs/{club_id}/members",
+    tags=["Club Members"],
+    dependencies=[Depends(membership.require_club_member)],
+)
+
+@router.post("", response_model=schemas.ClubMember)
+async def create_member_for_club(
+    club_id: int,
+    member: schemas.ClubMemberCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 동아리에 새로운 부원을 추가합니다.
+    """
+    return await async_member_service.create_member(db=db, club_id=club_id, member_data=member)
+
+@router.get("", response_model=List[schemas.ClubMember])
+async def get_members_for_club(
+    club_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    export: bool = False,
+    export_format: Literal["xlsx", "csv"] = Query("xlsx", alias="format"),
+    fields: Optional[str] = Query(None, description=fieldsets.FIELDS_QUERY_DESCRIPTION),
+    validators: Dict[str, str] = Depends(conditional.club_validators_async),
+):
+    """
+    특정 동아리의 모든 부원 목록을 조회합니다.
+    export=true 쿼리 파라미터가 있으면 format(xlsx/csv) 형식의 명단 파일로 내보냅니다.
+    """
+    if export:
+        file_chunks, club_name = await async_member_service.export_members(db, club_id, export_format)
+        file_response = export_service.download_response(file_chunks, f"부원명단_{club_name}", export_format)
+        file_response.headers.update(validators)
+        return file_response
+    selection = fieldsets.parse_fields(fields, schemas.ClubMember)
+    if fast_json.FAST_JSON_ENABLED:
+        rows = await async_member_service.get_member_rows(db=db, club_id=club_id, fields=fieldsets.source_fields(selection))
+        return fast_json.json_response(request, rows, headers=validators)
+    if selection is not None:
+        members = await async_member_service.get_members_by_club(db=db, club_id=club_id, fields=fieldsets.source_fields(selection))
+        return fieldsets.json_response(members, schemas.ClubMember, selection, headers=validators)
+    return await async_member_service.get_members_by_club(db=db, club_id=club_id)
+
+@router.patch("/{member_id}", response_model=schemas.ClubMember)
+async def update_member(
+    club_id: int,
+    member_id: int,
+    member_update: schemas.ClubMemberUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 부원의 정보를 수정합니다.
+    """
+    return await async_member_service.update_member_info(db=db, club_id=club_id, member_id=member_id, member_update=member_update)
+
+@router.delete("/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_member(
+    club_id: int,
+    member_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 부원을 삭제합니다.
+    """
+    await async_member_service.delete_member(db=db, club_id=club_id, member_id=member_id)
+    return
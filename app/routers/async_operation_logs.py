@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from datetime import date
+
+from .. import conditional, fast_json, fieldsets, membership, schemas
+from ..database import get_async_db
+from ..pagination import NEXT_CURSOR_HEADER
+from ..services import async_operation_log_service
+
+# routers/operation_logs.py의 비동기 데이터베이스 모드 버전입니다. (DONGARI_DB_MODE=async)
+# 여기에 없는 경로(파일 업로드가 포함된 활동 기록 생성)는 동기 라우터가 처리합니다.
+
+router = APIRouter(
+    prefix="/clubs/{club_id}/operation-logs",
+    tags=["Operation Logs"],
+    dependencies=[Depends(membership.require_club_member)],
+)
+
+@router.get("", response_model=List[schemas.OperationLog])
+async def get_operation_logs_for_club(
+    club_id: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=fieldsets.FIELDS_QUERY_DESCRIPTION),
+    validators: Dict[str, str] = Depends(conditional.club_validators_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 동아리의 활동 기록 목록을 최신순으로 조회합니다.
+    """
+    selection = fieldsets.parse_fields(fields, schemas.OperationLog)
+    if fast_json.FAST_JSON_ENABLED:
+        rows, next_cursor = await async_operation_log_service.get_operation_log_rows(
+            db=db, club_id=club_id, limit=limit, cursor=cursor,
+            date_from=date_from, date_to=date_to, post_type=post_type, team=team,
+            fields=fieldsets.source_fields(selection),
+        )
+        headers = {**validators, NEXT_CURSOR_HEADER: next_cursor} if next_cursor else validators
+        return fast_json.json_response(request, rows, headers=headers)
+    logs, next_cursor = await async_operation_log_service.get_operation_logs_by_club(
+        db=db, club_id=club_id, limit=limit, cursor=cursor,
+        date_from=date_from, date_to=date_to, post_type=post_type, team=team,
+        fields=fieldsets.source_fields(selection),
+    )
+    if selection is not None:
+        headers = {**validators, NEXT_CURSOR_HEADER: next_cursor} if next_cursor else validators
+        return fieldsets.json_response(logs, schemas.OperationLog, selection, headers=headers)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return logs
+
+@router.get("/calendar", response_model=List[schemas.OperationLogCalendarItem])
+async def get_operation_log_calendar_for_club(
+    club_id: int,
+    request: Request,
+    date_from: date,
+    date_to: date,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    validators: Dict[str, str] = Depends(conditional.club_validators_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 동아리의 활동 기록 중 기간이 조회 기간과 겹치는 기록을 달력 표시용으로 조회합니다.
+    """
+    rows = await async_operation_log_service.get_operation_log_calendar(
+        db=db, club_id=club_id, date_from=date_from, date_to=date_to, post_type=post_type, team=team
+    )
+    if fast_json.FAST_JSON_ENABLED:
+        return fast_json.json_response(request, rows, headers=validators)
+    return rows
+
+@router.get("/search", response_model=List[schemas.OperationLogSearchResult])
+async def search_operation_logs_for_club(
+    club_id: int,
+    request: Request,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    validators: Dict[str, str] = Depends(conditional.club_validators_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 동아리의 활동 기록을 제목, 팀, 글 종류, 내용으로 검색합니다. (관련도 순)
+    """
+    rows = await async_operation_log_service.search_operation_logs(db=db, club_id=club_id, q=q, limit=limit, offset=offset)
+    if fast_json.FAST_JSON_ENABLED:
+        return fast_json.json_response(request, rows, headers=validators)
+    return rows
+
+@router.get("/{log_id}", response_model=schemas.OperationLog)
+async def get_operation_log(
+    club_id: int,
+    log_id: int,
+    validators: Dict[str, str] = Depends(conditional.club_validators_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    특정 ID를 가진 활동 기록의 상세 정보를 조회합니다.
+    """
+    log = await async_operation_log_service.get_operation_log_by_id(db=db, log_id=log_id)
+    if not log or log.club_id != club_id:
+        raise HTTPException(status_code=404, detail="활동 기록을 찾을 수 없습니다.")
+    return log
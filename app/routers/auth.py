@@ -24,7 +24,7 @@ async def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth
     """
     사용자 로그인 후 액세스 토큰을 발급합니다.
     """
-    user = auth_service.authenticate_user(db, email=form_data.username, password=form_data.password)
+    user = await auth_service.authenticate_user(db, email=form_data.username, password=form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, Form, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, File, UploadFile, Query, Request, status
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from .. import models, schemas
-from ..database import get_db
-from ..services import club_service
+from .. import conditional, fast_json, models, schemas, auth as auth_utils
+from ..database import get_db, get_read_db
+from ..services import club_service, image_service, upload_service
 
 router = APIRouter(
     prefix="/clubs",
@@ -13,7 +14,8 @@ router = APIRouter(
 )
 
 @router.post("", response_model=schemas.Club)
-def create_club(
+async def create_club(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     club_type: str = Form(...),
     topic: str = Form(...),
@@ -24,42 +26,82 @@ def create_club(
 ):
     """
     새로운 동아리를 생성합니다 (이미지 업로드 포함).
+    이름과 비밀번호를 먼저 확인한 뒤, 업로드는 이벤트 루프에서 청크 단위로 저장하고
+    데이터베이스 작업은 스레드 풀에서 실행합니다.
+    이미지의 리사이즈 버전은 응답 후 백그라운드에서 만들어집니다.
     """
-    return club_service.create_club(
+    await run_in_threadpool(club_service.validate_new_club, db, name, password)
+    image_url = await upload_service.save_upload(file, kind="image")
+    if image_url:
+        background_tasks.add_task(image_service.generate_derivatives, image_url)
+    return await run_in_threadpool(
+        club_service.create_club,
         db=db, 
         name=name, 
         club_type=club_type, 
         topic=topic, 
         password=password, 
         description=description, 
-        file=file
+        image_url=image_url
     )
 
-@router.get("", response_model=List[schemas.Club])
+@router.get("", response_model=List[schemas.ClubSearchResult])
 def get_clubs(
-    db: Session = Depends(get_db),
-    name: Optional[str] = None
+    request: Request,
+    db: Session = Depends(get_read_db),
+    name: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    highlight: bool = False,
 ):
     """
     동아리 목록을 조회합니다.
-    'name' 쿼리 파라미터가 제공되면, 해당 이름으로 동아리를 검색합니다.
+    'name' 쿼리 파라미터가 제공되면 이름, 주제, 유형, 설명에서 검색하여 관련도 순으로 반환합니다.
+    (limit/offset으로 페이지를 나누고, highlight=true이면 일치한 부분의 발췌문을 함께 반환합니다)
     """
+    if fast_json.FAST_JSON_ENABLED:
+        if name:
+            rows = club_service.search_club_rows(db=db, name=name, limit=limit, offset=offset, highlight=highlight)
+        else:
+            rows = club_service.get_all_club_rows(db=db)
+        return fast_json.json_response(request, rows)
     if name:
-        return club_service.search_clubs_by_name(db=db, name=name)
+        return club_service.search_clubs_by_name(db=db, name=name, limit=limit, offset=offset, highlight=highlight)
     return club_service.get_all_clubs(db=db)
 
 @router.post("/join", response_model=schemas.JoinClubResponse)
-def join_club(join_request: schemas.ClubJoin, db: Session = Depends(get_db)):
+def join_club(
+    join_request: schemas.ClubJoin,
+    db: Session = Depends(get_db),
+    current_user: models.UserDB = Depends(auth_utils.get_current_active_user),
+):
     """
     이름과 비밀번호로 특정 동아리에 참여합니다.
+    가입한 동아리의 부원, 회계, 활동 기록 API를 사용할 수 있게 됩니다.
     """
-    db_club = club_service.join_club(db=db, join_request=join_request)
+    db_club = club_service.join_club(db=db, join_request=join_request, user=current_user)
     return {"message": "가입에 성공했습니다.", "club_id": db_club.id}
 
+@router.post("/{club_id}/leave", status_code=status.HTTP_204_NO_CONTENT)
+def leave_club(
+    club_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.UserDB = Depends(auth_utils.get_current_active_user),
+):
+    """
+    동아리에서 탈퇴합니다.
+    """
+    club_service.leave_club(db=db, club_id=club_id, user=current_user)
+
 @router.get("/{club_id}", response_model=schemas.Club)
-def get_club_by_id(club_id: int, db: Session = Depends(get_db)):
+def get_club_by_id(
+    club_id: int,
+    db: Session = Depends(get_read_db),
+    validators: Dict[str, str] = Depends(conditional.club_validators),
+):
     """
     ID로 특정 동아리의 id, name, image_url, description, club_type, topic을 반환합니다.
+    (동아리에 변경이 없으면 If-None-Match / If-Modified-Since 요청에 304로 응답합니다)
     """
     club = club_service.get_club_by_id(db=db, club_id=club_id)
     # 필요한 필드만 추출해서 반환
@@ -69,5 +111,6 @@ def get_club_by_id(club_id: int, db: Session = Depends(get_db)):
         "image_url": club.image_url,
         "description": club.description,
         "club_type": club.club_type,
-        "topic": club.topic
+        "topic": club.topic,
+        "image_variants": club.image_variants
     } 
\ No newline at end of file
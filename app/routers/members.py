@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.datastructures import UploadFile
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Literal, Optional
 
-from .. import models, schemas
-from ..database import get_db
-from ..services import member_service
+from .. import conditional, fast_json, fieldsets, membership, models, schemas
+from ..database import get_db, get_read_db
+from ..services import export_service, import_service, member_service
 
 router = APIRouter(
     prefix="/clubs/{club_id}/members",
     tags=["Club Members"],
+    dependencies=[Depends(membership.require_club_member)],
 )
 
 @router.post("", response_model=schemas.ClubMember)
@@ -22,16 +25,114 @@ def create_member_for_club(
     """
     return member_service.create_member(db=db, club_id=club_id, member_data=member)
 
+# 명단 일괄 추가 API의 요청 본문 문서 (JSON 배열 또는 파일 업로드를 모두 받으므로 직접 기술합니다)
+_BULK_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/ClubMemberCreate"}},
+            },
+            "application/x-ndjson": {
+                "schema": {"$ref": "#/components/schemas/ClubMemberCreate"},
+            },
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                },
+            },
+        },
+    },
+}
+
+@router.post("/bulk", response_model=schemas.BulkImportResult, openapi_extra=_BULK_REQUEST_BODY)
+async def bulk_create_members_for_club(club_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    특정 동아리에 부원 명단을 한 번에 추가합니다.
+    ClubMemberCreate 객체의 JSON 배열(최대 DONGARI_BULK_JSON_MAX_BYTES), 한 줄에 객체 하나인 NDJSON,
+    또는 CSV/xlsx 명단 파일(file 필드)을 받습니다. NDJSON과 파일은 크기 제한 없이 한 행씩 읽어 저장합니다.
+    파일의 열 제목은 명단 내보내기 파일과 같으며(이름, 학번, 전공 …), 필드 이름을 그대로 써도 됩니다.
+    모든 행은 하나의 트랜잭션으로 저장되고, 검증에 실패한 행은 건너뛰어 행별 결과로 알려 줍니다.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip() in import_service.NDJSON_MEDIA_TYPES:
+        # 본문을 임시 파일로 받아 두고, 스레드 풀에서 한 줄씩 읽어 저장합니다.
+        body = await import_service.spool_request_body(request)
+        try:
+            return await run_in_threadpool(
+                member_service.bulk_create_members, db, club_id, import_service.iter_ndjson_rows(body)
+            )
+        finally:
+            body.close()
+
+    if content_type.startswith("application/json"):
+        rows = await import_service.read_json_body(request)
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="부원 목록은 JSON 배열이어야 합니다.")
+        return await run_in_threadpool(member_service.bulk_create_members, db, club_id, rows)
+
+    if content_type.startswith("multipart/form-data"):
+        # 업로드 파일은 임시 파일로 받아 두고, 스레드 풀에서 한 행씩 읽어 저장합니다.
+        form = await request.form()
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(status_code=400, detail="명단 파일(file)을 첨부해주세요.")
+        import_format = import_service.detect_format(file.filename)
+        return await run_in_threadpool(member_service.import_members_file, db, club_id, file.file, import_format)
+
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="JSON 배열, NDJSON 또는 CSV/xlsx 파일로 요청해주세요.",
+    )
+
+@router.get("/stats", response_model=schemas.ClubMemberStats)
+def get_member_stats_for_club(
+    club_id: int,
+    db: Session = Depends(get_read_db),
+    validators: Dict[str, str] = Depends(conditional.club_validators),
+):
+    """
+    특정 동아리의 명단 통계(전체 인원, 기수/성별/전공/직책별 인원)를 조회합니다.
+    대시보드에서 전체 명단을 내려받아 직접 세지 않아도 되도록 서버에서 집계하여 반환합니다.
+    (동아리에 변경이 없으면 If-None-Match / If-Modified-Since 요청에 304로 응답합니다)
+    """
+    return member_service.get_member_stats(db=db, club_id=club_id)
+
 @router.get("", response_model=List[schemas.ClubMember])
-def get_members_for_club(club_id: int, db: Session = Depends(get_db)):
+def get_members_for_club(
+    club_id: int,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    export: bool = False,
+    export_format: Literal["xlsx", "csv"] = Query("xlsx", alias="format"),
+    fields: Optional[str] = Query(None, description=fieldsets.FIELDS_QUERY_DESCRIPTION),
+    validators: Dict[str, str] = Depends(conditional.club_validators),
+):
     """
     특정 동아리의 모든 부원 목록을 조회합니다.
+    export=true 쿼리 파라미터가 있으면 format(xlsx/csv) 형식의 명단 파일로 내보냅니다.
+    fields=id,name,role 처럼 필드를 지정하면 해당 필드만 조회하여 반환합니다.
+    (동아리에 변경이 없으면 If-None-Match / If-Modified-Since 요청에 304로 응답합니다)
     """
+    if export:
+        file_chunks, club_name = member_service.export_members(db, club_id, export_format)
+        file_response = export_service.download_response(file_chunks, f"부원명단_{club_name}", export_format)
+        file_response.headers.update(validators)
+        return file_response
+    selection = fieldsets.parse_fields(fields, schemas.ClubMember)
+    if fast_json.FAST_JSON_ENABLED:
+        rows = member_service.get_member_rows(db=db, club_id=club_id, fields=fieldsets.source_fields(selection))
+        return fast_json.json_response(request, rows, headers=validators)
+    if selection is not None:
+        members = member_service.get_members_by_club(db=db, club_id=club_id, fields=fieldsets.source_fields(selection))
+        return fieldsets.json_response(members, schemas.ClubMember, selection, headers=validators)
     return member_service.get_members_by_club(db=db, club_id=club_id)
 
 @router.patch("/{member_id}", response_model=schemas.ClubMember)
 def update_member(
-    club_id: int, # 경로 일관성을 위해 추가되었지만, 서비스 로직에서는 사용되지 않을 수 있습니다.
+    club_id: int,
     member_id: int,
     member_update: schemas.ClubMemberUpdate,
     db: Session = Depends(get_db)
@@ -39,16 +140,16 @@ def update_member(
     """
     특정 부원의 정보를 수정합니다.
     """
-    return member_service.update_member_info(db=db, member_id=member_id, member_update=member_update)
+    return member_service.update_member_info(db=db, club_id=club_id, member_id=member_id, member_update=member_update)
 
 @router.delete("/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_member(
-    club_id: int, # 경로 일관성을 위해 추가되었지만, 서비스 로직에서는 사용되지 않을 수 있습니다.
+    club_id: int,
     member_id: int, 
     db: Session = Depends(get_db)
 ):
     """
     특정 부원을 삭제합니다.
     """
-    member_service.delete_member(db=db, member_id=member_id)
+    member_service.delete_member(db=db, club_id=club_id, member_id=member_id)
     return 
\ No newline at end of file
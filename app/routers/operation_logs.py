@@ -1,20 +1,24 @@
-from fastapi import APIRouter, Depends, Form, File, UploadFile
+from fastapi import APIRouter, Depends, Form, File, UploadFile, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
+from datetime import date
 from fastapi import HTTPException
 from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from .. import models, schemas, auth as auth_utils
-from ..database import get_db
-from ..services import operation_log_service
+from .. import conditional, fast_json, fieldsets, membership, models, schemas, auth as auth_utils
+from ..database import get_db, get_read_db
+from ..pagination import NEXT_CURSOR_HEADER
+from ..services import operation_log_service, upload_service
 
 router = APIRouter(
     prefix="/clubs/{club_id}/operation-logs",
     tags=["Operation Logs"],
+    dependencies=[Depends(membership.require_club_member)],
 )
 
 @router.post("", response_model=schemas.OperationLog)
-def create_operation_log_for_club(
+async def create_operation_log_for_club(
     club_id: int,
     log_data: str = Form(...),
     files: List[UploadFile] = File(None),
@@ -23,32 +27,121 @@ def create_operation_log_for_club(
 ):
     """
     특정 동아리에 새로운 활동 기록을 생성합니다.
+    첨부파일은 이벤트 루프에서 청크 단위로 저장하고, 데이터베이스 작업은 스레드 풀에서 실행합니다.
     """
     try:
         log_create = schemas.OperationLogCreate.model_validate_json(log_data)
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.errors())
 
-    return operation_log_service.create_operation_log(
+    saved_files = []
+    for file in files or []:
+        file_path = await upload_service.save_upload(file, kind="file")
+        if file_path:
+            saved_files.append((file.filename, file_path))
+
+    return await run_in_threadpool(
+        operation_log_service.create_operation_log,
         db=db,
         club_id=club_id,
         log_create=log_create,
         current_user=current_user,
-        files=files,
+        files=saved_files,
     )
 
 @router.get("", response_model=List[schemas.OperationLog])
-def get_operation_logs_for_club(club_id: int, db: Session = Depends(get_db)):
+def get_operation_logs_for_club(
+    club_id: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=fieldsets.FIELDS_QUERY_DESCRIPTION),
+    validators: Dict[str, str] = Depends(conditional.club_validators),
+    db: Session = Depends(get_read_db)
+):
+    """
+    특정 동아리의 활동 기록 목록을 최신순으로 조회합니다.
+    limit을 지정하면 해당 개수만큼만 반환하며, 다음 페이지가 있으면
+    X-Next-Cursor 응답 헤더의 값을 cursor 쿼리 파라미터로 넘겨 이어서 조회할 수 있습니다.
+    date_from/date_to(기간이 겹치는 기록), post_type(글 종류), team(팀) 쿼리 파라미터로 필터링할 수 있습니다.
+    fields=id,title,start_date 처럼 필드를 지정하면 해당 필드만 조회하여 반환합니다. (content, files를 빼면 읽지 않습니다)
+    (동아리에 변경이 없으면 If-None-Match / If-Modified-Since 요청에 304로 응답합니다)
+    """
+    selection = fieldsets.parse_fields(fields, schemas.OperationLog)
+    if fast_json.FAST_JSON_ENABLED:
+        rows, next_cursor = operation_log_service.get_operation_log_rows(
+            db=db, club_id=club_id, limit=limit, cursor=cursor,
+            date_from=date_from, date_to=date_to, post_type=post_type, team=team,
+            fields=fieldsets.source_fields(selection),
+        )
+        headers = {**validators, NEXT_CURSOR_HEADER: next_cursor} if next_cursor else validators
+        return fast_json.json_response(request, rows, headers=headers)
+    logs, next_cursor = operation_log_service.get_operation_logs_by_club(
+        db=db, club_id=club_id, limit=limit, cursor=cursor,
+        date_from=date_from, date_to=date_to, post_type=post_type, team=team,
+        fields=fieldsets.source_fields(selection),
+    )
+    if selection is not None:
+        headers = {**validators, NEXT_CURSOR_HEADER: next_cursor} if next_cursor else validators
+        return fieldsets.json_response(logs, schemas.OperationLog, selection, headers=headers)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return logs
+
+@router.get("/calendar", response_model=List[schemas.OperationLogCalendarItem])
+def get_operation_log_calendar_for_club(
+    club_id: int,
+    request: Request,
+    date_from: date,
+    date_to: date,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    validators: Dict[str, str] = Depends(conditional.club_validators),
+    db: Session = Depends(get_read_db)
+):
+    """
+    특정 동아리의 활동 기록 중 [start_date, end_date] 기간이 조회 기간과 겹치는 기록을 달력 표시용으로 조회합니다.
+    ID, 제목, 글 종류, 기간만 시작 날짜순으로 반환하며, 조회 기간은 최대 366일입니다.
+    (끝나는 날짜가 없는 기록은 시작 날짜 하루짜리로 보고, 시작 날짜가 없는 기록은 제외합니다)
+    """
+    rows = operation_log_service.get_operation_log_calendar(
+        db=db, club_id=club_id, date_from=date_from, date_to=date_to, post_type=post_type, team=team
+    )
+    if fast_json.FAST_JSON_ENABLED:
+        return fast_json.json_response(request, rows, headers=validators)
+    return rows
+
+@router.get("/search", response_model=List[schemas.OperationLogSearchResult])
+def search_operation_logs_for_club(
+    club_id: int,
+    request: Request,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    validators: Dict[str, str] = Depends(conditional.club_validators),
+    db: Session = Depends(get_read_db)
+):
     """
-    특정 동아리의 모든 활동 기록 목록을 조회합니다.
+    특정 동아리의 활동 기록을 제목, 팀, 글 종류, 내용으로 검색합니다. (관련도 순)
+    공백으로 구분한 검색어를 모두 포함하는 활동 기록을 반환하며, snippet에는 일치한 부분을 <mark>로 감싼 발췌문이 담깁니다.
+    limit과 offset으로 페이지를 나누어 조회할 수 있습니다.
     """
-    return operation_log_service.get_operation_logs_by_club(db=db, club_id=club_id)
+    rows = operation_log_service.search_operation_logs(db=db, club_id=club_id, q=q, limit=limit, offset=offset)
+    if fast_json.FAST_JSON_ENABLED:
+        return fast_json.json_response(request, rows, headers=validators)
+    return rows
 
 @router.get("/{log_id}", response_model=schemas.OperationLog)
 def get_operation_log(
     club_id: int, 
     log_id: int, 
-    db: Session = Depends(get_db)
+    validators: Dict[str, str] = Depends(conditional.club_validators),
+    db: Session = Depends(get_read_db)
 ):
     """
     특정 ID를 가진 활동 기록의 상세 정보를 조회합니다.
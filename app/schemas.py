@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, date
 
@@ -25,6 +25,23 @@ class User(UserBase):
         from_attributes = True
 
 
+# --- Image Schemas ---
+
+class ImageVariant(BaseModel):
+    width: int
+    format: str
+    url: str
+
+    class Config:
+        from_attributes = True
+
+def _thumbnail_url(variants: List[ImageVariant], original: Optional[str]) -> Optional[str]:
+    """가장 작은 WebP 리사이즈 이미지를 반환하고, 아직 만들어지지 않았다면 원본을 반환합니다."""
+    for variant in variants:
+        if variant.format == "webp":
+            return variant.url
+    return original
+
 # --- Club Schemas (기존 Group 스키마 수정) ---
 
 class ClubBase(BaseModel):
@@ -49,10 +66,19 @@ class Club(BaseModel):
     description: Optional[str] = None
     club_type: str
     topic: str
+    image_variants: List[ImageVariant] = [] # 대표 이미지의 리사이즈 버전 (가로 크기 오름차순)
+
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        return _thumbnail_url(self.image_variants, self.image_url)
 
     class Config:
         from_attributes = True
 
+class ClubSearchResult(Club):
+    highlight: Optional[str] = None # 검색어와 일치한 부분을 <mark>로 감싼 발췌문
+
 # --- ClubMember Schemas ---
 
 class ClubMemberBase(BaseModel):
@@ -89,6 +115,30 @@ class ClubMemberUpdate(BaseModel):
     role: Optional[str] = None
     memo: Optional[str] = None
 
+class MemberStatBucket(BaseModel):
+    value: Optional[Union[int, str]] = None # 집계 기준 값 (입력되지 않은 부원은 null)
+    count: int
+
+class ClubMemberStats(BaseModel):
+    total: int
+    member_year: List[MemberStatBucket] # 기수 오름차순
+    gender: List[MemberStatBucket] # 이하 인원 많은 순
+    major: List[MemberStatBucket]
+    role: List[MemberStatBucket]
+
+# --- Bulk Import Schemas ---
+
+class BulkImportRowResult(BaseModel):
+    row: int # 데이터 행 번호 (1부터 시작, 파일의 경우 제목 행 제외)
+    status: str # 'created' 또는 'error'
+    id: Optional[int] = None # 생성된 항목의 ID
+    errors: List[str] = []
+
+class BulkImportResult(BaseModel):
+    created: int
+    failed: int
+    rows: List[BulkImportRowResult]
+
 # --- Token Schemas ---
 
 class Token(BaseModel):
@@ -113,10 +163,19 @@ class AccountingEntryCreate(AccountingEntryBase):
 class AccountingEntry(AccountingEntryBase):
     id: int
     club_id: int
+    photo_variants: List[ImageVariant] = [] # 영수증 사진의 리사이즈 버전 (가로 크기 오름차순)
+
+    @computed_field
+    @property
+    def photo_thumbnail_url(self) -> Optional[str]:
+        return _thumbnail_url(self.photo_variants, self.photo_url)
 
     class Config:
         from_attributes = True
 
+class AccountingLedgerEntry(AccountingEntry):
+    balance: int # 해당 내역까지의 누적 잔액
+
 class AccountingEntryUpdate(BaseModel):
     date: Optional[str] = None
     manager: Optional[str] = None
@@ -124,6 +183,15 @@ class AccountingEntryUpdate(BaseModel):
     amount: Optional[int] = None
     # 사진 수정은 별도 처리(프론트에서 파일 업로드로)
 
+class AccountingImportRowResult(BulkImportRowResult):
+    # status: 'created', 'new'(미리보기에서 추가될 행), 'duplicate'(이미 등록된 내역), 'error'
+    entry: Optional[AccountingEntryCreate] = None # 행을 해석한 결과
+
+class AccountingImportResult(BulkImportResult):
+    duplicates: int
+    dry_run: bool
+    rows: List[AccountingImportRowResult]
+
 # --- UploadedFile ---
 class UploadedFile(BaseModel):
     id: int
@@ -153,6 +221,23 @@ class OperationLog(OperationLogBase):
 class OperationLogCreate(OperationLogBase):
     pass
 
+class OperationLogCalendarItem(BaseModel):
+    id: int
+    title: str
+    post_type: str
+    start_date: date
+    end_date: Optional[date] = None
+
+class OperationLogSearchResult(BaseModel):
+    id: int
+    title: str
+    post_type: str
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    team: Optional[str] = None
+    author_id: Optional[int] = None
+    snippet: Optional[str] = None # 검색어와 일치한 부분을 <mark>로 감싼 발췌문
+
 # User와 Club 스키마가 서로 참조할 수 있도록 업데이트
 User.model_rebuild()
 Club.model_rebuild()
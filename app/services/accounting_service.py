@@ -1,12 +1,16 @@
+from sqlalchemy import Select, event, insert, select, func, and_, or_, tuple_, update
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, UploadFile
-from typing import Optional
-import shutil
-import uuid
-import io
-import pandas as pd
+from fastapi import HTTPException
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+import hashlib
+import re
+import unicodedata
 
 from .. import models, schemas
+from ..club_versions import bump_club_versions
+from ..database import ReadSessionLocal
+from ..pagination import decode_cursor, split_page
+from . import export_service, image_service, import_service
 
 def create_new_entry(
     db: Session, 
@@ -15,77 +19,222 @@ def create_new_entry(
     description: str, 
     amount: int, 
     manager: Optional[str], 
-    photo: Optional[UploadFile]
+    photo_url: Optional[str]
 ) -> models.AccountingEntryDB:
     """
-    새로운 회계 내역을 데이터베이스에 생성하고, 첨부된 사진을 저장합니다.
+    새로운 회계 내역을 데이터베이스에 생성합니다.
+    (영수증 사진은 라우터에서 upload_service로 저장한 뒤 경로만 전달받습니다)
     """
     # 1. 동아리 존재 여부 확인
     db_club = db.query(models.ClubDB).filter(models.ClubDB.id == club_id).first()
     if not db_club:
         raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
 
-    # 2. 사진 파일 처리
-    photo_url_path = None
-    if photo and photo.filename:
-        file_extension = photo.filename.split(".")[-1]
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = f"static/images/{unique_filename}"
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(photo.file, buffer)
-        photo_url_path = file_path # URL 경로로 저장
-
-    # 3. 데이터베이스에 내역 저장
+    # 2. 데이터베이스에 내역 저장
     entry_data = schemas.AccountingEntryCreate(
         date=date,
         description=description,
         amount=amount,
         manager=manager,
-        photo_url=photo_url_path
+        photo_url=photo_url
     )
     
     db_entry = models.AccountingEntryDB(**entry_data.dict(), club_id=club_id)
     db.add(db_entry)
     db.commit()
-    db.refresh(db_entry)
+    _refresh_entry(db, db_entry)
     
     return db_entry
 
+def _refresh_entry(db: Session, db_entry: models.AccountingEntryDB):
+    """커밋한 내역을 응답용으로 다시 읽습니다. (영수증 사진의 리사이즈 버전 포함)"""
+    db.refresh(db_entry)
+    db.refresh(db_entry, ["photo_variants"])
+
+
+# 회계 장부 조회에서 읽는 컬럼 (응답 스키마 순서와 별개로 SELECT 순서입니다)
+LEDGER_COLUMNS = ("id", "date", "manager", "description", "amount", "photo_url", "club_id")
+
 
-def export_to_excel(db: Session, club_id: int):
+def build_ledger_query(
+    club_id: int,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    manager: Optional[str] = None,
+    sign: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Select:
     """
-    특정 동아리의 회계 내역을 조회하고 엑셀 파일 데이터로 변환합니다.
+    회계 장부 조회 쿼리를 만듭니다. (동기/비동기 서비스 공용)
+    limit이 주어지면 다음 페이지 존재 여부를 알 수 있도록 한 건을 더 조회합니다.
+    fields가 주어지면 해당 컬럼과 정렬, 필터에 필요한 컬럼만 조회하고,
+    balance가 없으면 누적 잔액도 계산하지 않습니다. (부분 응답, fieldsets 참고)
+
+    누적 잔액은 필터와 관계없이 장부 전체를 기준으로 한 값입니다. (담당자/수입·지출 필터로 빠진 내역도 포함)
+    장부 전체에 윈도 함수를 적용하지 않도록, 먼저 필터와 커서를 적용한 한 페이지를 (club_id, date, id)
+    인덱스 범위로 조회한 뒤, 그 첫 내역 이전의 합계(이월 잔액)를 한 번 구하고 페이지의 첫 내역부터
+    마지막 내역까지의 구간에만 윈도 함수를 적용해 더합니다.
+    """
+    # 1. 필터 및 커서 조건을 적용한 한 페이지
+    Entry = models.AccountingEntryDB
+    if fields is None:
+        names, with_balance = LEDGER_COLUMNS, True
+    else:
+        required = {"id", "date"} | ({"manager"} if manager else set()) | ({"amount"} if sign else set())
+        names = [name for name in LEDGER_COLUMNS if name in fields or name in required]
+        with_balance = "balance" in fields
+    conditions = [Entry.club_id == club_id]
+    if date_from:
+        conditions.append(Entry.date >= date_from)
+    if date_to:
+        conditions.append(Entry.date <= date_to)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor, 2)
+        try:
+            last_date, last_id = str(last_date), int(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="잘못된 커서 값입니다.")
+        conditions.append(or_(
+            Entry.date > last_date,
+            and_(Entry.date == last_date, Entry.id > last_id),
+        ))
+    conditions.extend(_ledger_value_filters(Entry, manager, sign))
+
+    def page_query(*columns) -> Select:
+        query = select(*columns).where(*conditions).order_by(Entry.date, Entry.id)
+        return query if limit is None else query.limit(limit + 1)
+
+    if not with_balance:
+        return page_query(*(getattr(Entry, name) for name in names))
+
+    # 2. 누적 잔액 = 이월 잔액 + 페이지 구간(첫 내역 ~ 마지막 내역)의 누적 합계
+    # 구간의 내역 중 담당자/수입·지출 필터를 만족하는 내역이 곧 페이지입니다.
+    # (필터가 없으면 구간이 페이지와 같고, 있으면 그 사이에 빠진 내역까지 잔액에 더해집니다)
+    page = page_query(Entry.date, Entry.id).cte("ledger_page")
+    first_key = select(page.c.date, page.c.id).order_by(page.c.date, page.c.id).limit(1).scalar_subquery()
+    last_key = select(page.c.date, page.c.id).order_by(page.c.date.desc(), page.c.id.desc()).limit(1).scalar_subquery()
+    entry_key = tuple_(Entry.date, Entry.id)
+    opening = select(func.coalesce(func.sum(Entry.amount), 0)).where(
+        Entry.club_id == club_id, entry_key < first_key
+    ).scalar_subquery()
+    span = select(
+        *(getattr(Entry, name) for name in names),
+        func.sum(Entry.amount).over(order_by=(Entry.date, Entry.id)).label("running"),
+    ).where(Entry.club_id == club_id, entry_key >= first_key, entry_key <= last_key).subquery()
+    return (
+        select(*(span.c[name] for name in names), (opening + span.c.running).label("balance"))
+        .where(*_ledger_value_filters(span.c, manager, sign))
+        .order_by(span.c.date, span.c.id)
+    )
+
+
+def _ledger_value_filters(columns: Any, manager: Optional[str], sign: Optional[str]) -> List[Any]:
+    """담당자, 수입/지출 필터 조건입니다. (columns는 모델 또는 서브쿼리의 컬럼 모음)"""
+    conditions = []
+    if manager:
+        conditions.append(columns.manager == manager)
+    if sign == "income":
+        conditions.append(columns.amount > 0)
+    elif sign == "expense":
+        conditions.append(columns.amount < 0)
+    return conditions
+
+
+def ledger_cursor_key(row: Dict[str, Any]) -> Tuple[str, int]:
+    """회계 장부의 커서에 담을 정렬 키를 반환합니다."""
+    return row["date"], row["id"]
+
+
+def get_ledger(
+    db: Session,
+    club_id: int,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    manager: Optional[str] = None,
+    sign: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    특정 동아리의 회계 장부를 날짜순으로 조회합니다.
+    각 내역에는 장부 전체 기준의 누적 잔액(balance)이 SQL 윈도 함수로 계산되어 포함됩니다.
+    (필터는 조회할 내역만 고르며, 필터로 빠진 내역도 잔액에는 반영됩니다)
+
+    :param date_from: 조회 시작 날짜 (포함)
+    :param date_to: 조회 종료 날짜 (포함)
+    :param manager: 담당자
+    :param sign: 'income'이면 수입(양수), 'expense'이면 지출(음수)만 조회
+    :param limit: 한 페이지에 반환할 최대 개수
+    :param cursor: 이전 페이지에서 받은 다음 커서
+    :param fields: 조회할 필드 (생략하면 전체, 영수증 사진의 리사이즈 버전은 photo_variants가 있을 때만 조회)
+    :return: 장부 행 목록과 다음 커서를 튜플로 반환
+    """
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    query = build_ledger_query(club_id, date_from, date_to, manager, sign, limit, cursor, fields)
+    rows = [dict(row) for row in db.execute(query).mappings()]
+    rows, next_cursor = split_page(rows, limit, ledger_cursor_key)
+    if fields is not None and "photo_variants" not in fields:
+        return rows, next_cursor
+    return image_service.attach_variants(db, rows, "photo_url", "photo_variants"), next_cursor
+
+
+# 내보내기 파일의 열 제목
+EXPORT_HEADER = ["날짜", "담당자", "내역", "금액", "잔액"]
+
+
+def _iter_ledger_rows(club_id: int) -> Iterator[Tuple[Any, ...]]:
+    """
+    회계 내역을 날짜순으로 한 행씩 읽어 옵니다.
+    응답 스트리밍이 끝날 때까지 사용되므로 요청 세션과 별도의 세션을 열고,
+    ORM 객체 대신 필요한 컬럼만 튜플로 가져옵니다.
+    """
+    Entry = models.AccountingEntryDB
+    query = select(
+        Entry.date, Entry.manager, Entry.description, Entry.amount,
+        func.sum(Entry.amount).over(order_by=(Entry.date, Entry.id)),
+    ).where(Entry.club_id == club_id).order_by(Entry.date, Entry.id)
+
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(query.execution_options(yield_per=export_service.FETCH_SIZE))
+        for row in result:
+            yield tuple(row)
+    finally:
+        db.close()
+
+
+def export_ledger(db: Session, club_id: int, export_format: str = "xlsx") -> Tuple[Iterator[bytes], str]:
+    """
+    특정 동아리의 회계 내역을 파일로 내보냅니다.
+    내역 전체를 메모리에 올리지 않고, 날짜순으로 읽어 오는 대로 파일 청크를 생성합니다.
 
     :param db: 데이터베이스 세션
     :param club_id: 동아리 ID
-    :return: 엑셀 파일 데이터(BytesIO)와 동아리 이름을 튜플로 반환
+    :param export_format: 'xlsx' 또는 'csv'
+    :return: 파일 청크 이터레이터와 동아리 이름을 튜플로 반환
     """
-    # 1. 데이터베이스에서 회계 내역 조회
+    # 1. 동아리 및 내보낼 내역 존재 여부 확인
     db_club = db.query(models.ClubDB).filter(models.ClubDB.id == club_id).first()
     if not db_club:
         raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
-    
-    entries = db_club.accounting_entries
-    if not entries:
+
+    has_entries = db.query(models.AccountingEntryDB.id).filter(
+        models.AccountingEntryDB.club_id == club_id
+    ).first()
+    if not has_entries:
         raise HTTPException(status_code=404, detail="내보낼 회계 내역이 없습니다.")
 
-    # 2. Pandas 데이터프레임으로 변환
-    data = [{
-        "날짜": entry.date,
-        "담당자": entry.manager,
-        "내역": entry.description,
-        "금액": entry.amount
-    } for entry in sorted(entries, key=lambda x: x.date)]
-    df = pd.DataFrame(data)
-
-    # 3. 데이터프레임을 엑셀 파일로 메모리에 저장
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='회계 내역')
-    
-    output.seek(0)
-    
-    return output, db_club.name
+    # 2. 요청한 형식의 스트리밍 writer에 행 이터레이터 연결
+    return stream_ledger_file(club_id, export_format), db_club.name
+
+def stream_ledger_file(club_id: int, export_format: str) -> Iterator[bytes]:
+    """회계 내역 행 이터레이터를 요청한 형식의 스트리밍 writer에 연결합니다."""
+    return export_service.stream_rows(export_format, "회계 내역", EXPORT_HEADER, _iter_ledger_rows(club_id))
 
 def update_entry(db: Session, club_id: int, entry_id: int, entry_update: 'schemas.AccountingEntryUpdate'):
     db_entry = db.query(models.AccountingEntryDB).filter(
@@ -97,7 +246,7 @@ def update_entry(db: Session, club_id: int, entry_id: int, entry_update: 'schema
     for field, value in entry_update.dict(exclude_unset=True).items():
         setattr(db_entry, field, value)
     db.commit()
-    db.refresh(db_entry)
+    _refresh_entry(db, db_entry)
     return db_entry
 
 def delete_entry(db: Session, club_id: int, entry_id: int):
@@ -109,4 +258,200 @@ def delete_entry(db: Session, club_id: int, entry_id: int):
         raise HTTPException(status_code=404, detail="해당 회계 내역을 찾을 수 없습니다.")
     db.delete(db_entry)
     db.commit()
-    return None
\ No newline at end of file
+    return None
+
+
+# --- 은행 거래내역 가져오기 ---
+
+# 거래내역 파일에서 찾을 열 제목 후보 (필드 -> 열 제목 목록, 앞에 있는 것을 우선합니다)
+# 금액은 '금액' 한 열(수입 양수, 지출 음수)이나 '입금'/'출금' 두 열 중 하나로 읽습니다.
+# 회계 내역 내보내기 파일의 열 제목도 포함되어 있어 내보낸 파일을 그대로 가져올 수 있습니다.
+STATEMENT_COLUMNS = {
+    "date": ["날짜", "거래일자", "거래일", "거래일시"],
+    "description": ["내역", "적요", "거래내용", "내용", "기재내용"],
+    "amount": ["금액", "거래금액"],
+    "deposit": ["입금", "입금액", "맡기신금액"],
+    "withdrawal": ["출금", "출금액", "찾으신금액"],
+    "manager": ["담당자"],
+}
+
+
+def normalize_description(description: Optional[str]) -> str:
+    """중복 확인을 위해 내역을 정규화합니다. (전각/반각 통일, 대소문자 무시, 공백 정리)"""
+    text = unicodedata.normalize("NFKC", description or "").casefold()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def entry_dedup_key(date: str, amount: int, description: Optional[str]) -> str:
+    """(날짜, 금액, 정규화한 내역)으로 회계 내역의 중복 확인용 해시를 만듭니다."""
+    try:
+        date = import_service.parse_date(date)
+    except ValueError:
+        date = (date or "").strip()
+    raw = f"{date}|{amount}|{normalize_description(description)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@event.listens_for(models.AccountingEntryDB, "before_insert")
+@event.listens_for(models.AccountingEntryDB, "before_update")
+def _set_dedup_key(mapper, connection, target: models.AccountingEntryDB):
+    # 직접 입력하거나 수정한 내역도 가져오기의 중복 확인 대상이 되도록 해시를 함께 저장합니다.
+    target.dedup_key = entry_dedup_key(target.date, target.amount, target.description)
+
+
+def _backfill_dedup_keys(db: Session, club_id: int):
+    """중복 확인용 해시가 없는(이 기능 이전에 등록된) 내역의 해시를 채웁니다."""
+    Entry = models.AccountingEntryDB
+    missing = db.execute(
+        select(Entry.id, Entry.date, Entry.amount, Entry.description)
+        .where(Entry.club_id == club_id, Entry.dedup_key.is_(None))
+    ).all()
+    if missing:
+        db.execute(update(Entry), [
+            {"id": row.id, "dedup_key": entry_dedup_key(row.date, row.amount, row.description)}
+            for row in missing
+        ])
+
+
+def _resolve_statement_columns(header: Iterable[str], mapping: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """필드별로 사용할 열 제목을 정합니다. mapping으로 지정한 열 제목이 후보보다 우선합니다."""
+    header = set(header)
+    mapping = mapping or {}
+    unknown = set(mapping) - set(STATEMENT_COLUMNS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 필드입니다: {', '.join(sorted(unknown))}")
+
+    columns = {}
+    for field, candidates in STATEMENT_COLUMNS.items():
+        if field in mapping:
+            if mapping[field] not in header:
+                raise HTTPException(status_code=400, detail=f"'{mapping[field]}' 열을 찾을 수 없습니다.")
+            columns[field] = mapping[field]
+            continue
+        found = next((candidate for candidate in candidates if candidate in header), None)
+        if found:
+            columns[field] = found
+
+    if "date" not in columns or "description" not in columns or not (
+        "amount" in columns or "deposit" in columns or "withdrawal" in columns
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="날짜, 내역, 금액(또는 입금/출금) 열을 찾을 수 없습니다. 열 매핑(mapping)을 지정해주세요.",
+        )
+    return columns
+
+
+def _parse_statement_row(row: Mapping[str, Optional[str]], columns: Dict[str, str]) -> schemas.AccountingEntryCreate:
+    """거래내역 한 행을 회계 내역으로 해석합니다. 해석할 수 없으면 ValueError를 발생시킵니다."""
+    date = import_service.parse_date(row.get(columns["date"]))
+    if "amount" in columns:
+        amount = import_service.parse_amount(row.get(columns["amount"]))
+    else:
+        amount = (
+            import_service.parse_amount(row.get(columns.get("deposit")))
+            - import_service.parse_amount(row.get(columns.get("withdrawal")))
+        )
+    if amount == 0:
+        raise ValueError("금액이 없습니다.")
+    description = row.get(columns["description"])
+    if not description:
+        raise ValueError("내역이 비어 있습니다.")
+    manager = row.get(columns["manager"]) if "manager" in columns else None
+    return schemas.AccountingEntryCreate(date=date, description=description, amount=amount, manager=manager)
+
+
+def import_statement(
+    db: Session,
+    club_id: int,
+    rows: Iterable[Mapping[str, Optional[str]]],
+    mapping: Optional[Mapping[str, str]] = None,
+    dry_run: bool = False,
+) -> schemas.AccountingImportResult:
+    """
+    은행 거래내역 행들을 회계 내역으로 가져옵니다.
+    행을 IMPORT_BATCH_SIZE개씩 해석하고, (날짜, 금액, 정규화한 내역) 해시 인덱스로 이미 등록된 내역을 찾아
+    건너뛴 뒤, 새 내역만 배치마다 하나의 INSERT(executemany)로 저장하여 전체를 한 번에 커밋합니다.
+    같은 날 같은 금액·내역의 거래가 여러 건이면 이미 등록된 건수만큼만 중복으로 봅니다.
+
+    :param mapping: 필드 이름 -> 열 제목 (지정하지 않은 필드는 STATEMENT_COLUMNS의 후보에서 찾습니다)
+    :param dry_run: True이면 저장하지 않고 결과만 미리 보여 줍니다.
+    """
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+    _backfill_dedup_keys(db, club_id)
+
+    Entry = models.AccountingEntryDB
+    statement = insert(Entry).returning(Entry.id, sort_by_parameter_order=True)
+    columns: Optional[Dict[str, str]] = None
+    # 해시별로 아직 짝을 찾지 못한 기존 내역 수
+    existing_counts: Dict[str, int] = {}
+    results: List[schemas.AccountingImportRowResult] = []
+
+    for batch in import_service.batched(rows):
+        if columns is None:
+            columns = _resolve_statement_columns(batch[0].keys(), mapping)
+
+        parsed = []
+        for raw in batch:
+            result = schemas.AccountingImportRowResult(row=len(results) + 1, status="error")
+            results.append(result)
+            try:
+                entry = _parse_statement_row(raw, columns)
+            except ValueError as e:
+                result.errors = [str(e)]
+                continue
+            result.entry = entry
+            parsed.append((result, entry, entry_dedup_key(entry.date, entry.amount, entry.description)))
+
+        # 이번 가져오기에서 처음 보는 해시만 조회합니다. (앞 배치에서 저장한 내역이 중복으로 잡히지 않도록)
+        unseen = {key for _, _, key in parsed if key not in existing_counts}
+        if unseen:
+            existing_counts.update(dict.fromkeys(unseen, 0))
+            existing_counts.update(db.execute(
+                select(Entry.dedup_key, func.count())
+                .where(Entry.club_id == club_id, Entry.dedup_key.in_(unseen))
+                .group_by(Entry.dedup_key)
+            ).all())
+
+        values, new_results = [], []
+        for result, entry, key in parsed:
+            if existing_counts[key] > 0:
+                existing_counts[key] -= 1
+                result.status = "duplicate"
+                continue
+            result.status = "new"
+            values.append({**entry.model_dump(), "club_id": club_id, "dedup_key": key})
+            new_results.append(result)
+
+        if values and not dry_run:
+            for result, entry_id in zip(new_results, db.execute(statement, values).scalars()):
+                result.status, result.id = "created", entry_id
+
+    created = sum(result.status == "created" for result in results)
+    if dry_run:
+        db.rollback()
+    else:
+        if created:
+            # ORM을 거치지 않은 INSERT이므로 동아리 버전을 직접 올립니다.
+            bump_club_versions(db.connection(), [club_id])
+        db.commit()
+
+    duplicates = sum(result.status == "duplicate" for result in results)
+    failed = sum(result.status == "error" for result in results)
+    return schemas.AccountingImportResult(
+        created=created, duplicates=duplicates, failed=failed, dry_run=dry_run, rows=results
+    )
+
+
+def import_statement_file(
+    db: Session,
+    club_id: int,
+    file,
+    import_format: str,
+    mapping: Optional[Mapping[str, str]] = None,
+    dry_run: bool = False,
+) -> schemas.AccountingImportResult:
+    """업로드된 CSV/xlsx 거래내역 파일을 한 행씩 읽어 import_statement로 가져옵니다."""
+    rows = import_service.iter_file_rows(file, import_format)
+    return import_statement(db, club_id, rows, mapping=mapping, dry_run=dry_run)
@@ -0,0 +1,78 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
+
+from .. import models, schemas
+from ..pagination import split_page
+from . import image_service
+from .accounting_service import build_ledger_query, ledger_cursor_key, stream_ledger_file
+
+# accounting_service의 비동기(AsyncSession) 버전입니다.
+# 사진 업로드가 포함된 내역 생성은 동기 서비스가 처리합니다.
+
+async def get_ledger(
+    db: AsyncSession,
+    club_id: int,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    manager: Optional[str] = None,
+    sign: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    특정 동아리의 회계 장부를 날짜순으로 조회합니다. (누적 잔액 포함)
+    """
+    if not await db.get(models.ClubDB, club_id):
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    query = build_ledger_query(club_id, date_from, date_to, manager, sign, limit, cursor, fields)
+    rows = [dict(row) for row in (await db.execute(query)).mappings()]
+    rows, next_cursor = split_page(rows, limit, ledger_cursor_key)
+    if fields is not None and "photo_variants" not in fields:
+        return rows, next_cursor
+    return await db.run_sync(image_service.attach_variants, rows, "photo_url", "photo_variants"), next_cursor
+
+async def export_ledger(db: AsyncSession, club_id: int, export_format: str = "xlsx") -> Tuple[Iterator[bytes], str]:
+    """
+    특정 동아리의 회계 내역을 파일로 내보냅니다.
+    파일 청크는 동기 서비스의 스트리밍 writer가 생성합니다. (StreamingResponse가 스레드 풀에서 순회합니다)
+    """
+    db_club = await db.get(models.ClubDB, club_id)
+    if not db_club:
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    result = await db.execute(select(models.AccountingEntryDB.id).where(
+        models.AccountingEntryDB.club_id == club_id
+    ).limit(1))
+    if not result.first():
+        raise HTTPException(status_code=404, detail="내보낼 회계 내역이 없습니다.")
+
+    return stream_ledger_file(club_id, export_format), db_club.name
+
+async def _get_entry(db: AsyncSession, club_id: int, entry_id: int) -> models.AccountingEntryDB:
+    result = await db.execute(select(models.AccountingEntryDB).where(
+        models.AccountingEntryDB.id == entry_id,
+        models.AccountingEntryDB.club_id == club_id
+    ))
+    db_entry = result.scalars().first()
+    if not db_entry:
+        raise HTTPException(status_code=404, detail="해당 회계 내역을 찾을 수 없습니다.")
+    return db_entry
+
+async def update_entry(db: AsyncSession, club_id: int, entry_id: int, entry_update: schemas.AccountingEntryUpdate):
+    db_entry = await _get_entry(db, club_id, entry_id)
+    for field, value in entry_update.model_dump(exclude_unset=True).items():
+        setattr(db_entry, field, value)
+    await db.commit()
+    await db.refresh(db_entry)
+    await db.refresh(db_entry, ["photo_variants"])
+    return db_entry
+
+async def delete_entry(db: AsyncSession, club_id: int, entry_id: int):
+    db_entry = await _get_entry(db, club_id, entry_id)
+    await db.delete(db_entry)
+    await db.commit()
+    return None
@@ -0,0 +1,90 @@
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from fastapi import HTTPException
+from typing import Any, Dict, List, Optional
+
+from .. import membership, models, schemas
+from . import club_service, image_service
+from .club_service import build_club_search_query
+
+# club_service의 비동기(AsyncSession) 버전입니다.
+# 이미지 업로드가 포함된 동아리 생성은 동기 서비스가 처리합니다.
+
+async def get_all_clubs(db: AsyncSession) -> List[models.ClubDB]:
+    """모든 동아리 목록을 반환합니다."""
+    result = await db.execute(select(models.ClubDB).options(selectinload(models.ClubDB.image_variants)))
+    return result.scalars().all()
+
+async def search_clubs_by_name(
+    db: AsyncSession,
+    name: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    highlight: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    이름, 주제, 유형, 설명으로 동아리를 검색합니다. (관련도 순)
+    """
+    if not name.strip():
+        raise HTTPException(status_code=400, detail="검색할 동아리 이름을 입력해주세요.")
+    query = build_club_search_query(name, limit=limit, offset=offset, highlight=highlight)
+    rows = [dict(row) for row in (await db.execute(query)).mappings()]
+    return await db.run_sync(image_service.attach_variants, rows, "image_url", "image_variants")
+
+async def get_all_club_rows(db: AsyncSession) -> List[Dict[str, Any]]:
+    """모든 동아리 목록을 반환합니다. (빠른 응답 경로)"""
+    return await db.run_sync(club_service.get_all_club_rows)
+
+async def search_club_rows(
+    db: AsyncSession,
+    name: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    highlight: bool = False,
+) -> List[Dict[str, Any]]:
+    """이름, 주제, 유형, 설명으로 동아리를 검색합니다. (빠른 응답 경로)"""
+    return await db.run_sync(club_service.search_club_rows, name, limit, offset, highlight)
+
+async def join_club(db: AsyncSession, join_request: schemas.ClubJoin, user: models.UserDB) -> models.ClubDB:
+    """
+    동아리에 참여(가입)합니다.
+    비밀번호가 맞으면 가입 정보를 저장하고 회원 색인에 반영합니다. (이미 가입했으면 그대로 둡니다)
+    """
+    result = await db.execute(select(models.ClubDB).where(models.ClubDB.name == join_request.name))
+    db_club = result.scalars().first()
+    if not db_club:
+        raise HTTPException(status_code=404, detail="존재하지 않는 동아리입니다.")
+
+    if db_club.password != join_request.password:
+        raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
+
+    await db.execute(
+        insert(models.user_club_association)
+        .values(user_id=user.id, club_id=db_club.id)
+        .on_conflict_do_nothing()
+    )
+    await db.commit()
+    membership.index.add(user.id, db_club.id)
+    return db_club
+
+async def leave_club(db: AsyncSession, club_id: int, user: models.UserDB):
+    """동아리에서 탈퇴합니다. 가입 정보를 삭제하고 회원 색인에서 제거합니다."""
+    association = models.user_club_association
+    result = await db.execute(delete(association).where(
+        association.c.user_id == user.id, association.c.club_id == club_id
+    ))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="가입한 동아리가 아닙니다.")
+    await db.commit()
+    membership.index.discard(user.id, club_id)
+
+async def get_club_by_id(db: AsyncSession, club_id: int) -> models.ClubDB:
+    """
+    ID로 동아리 정보를 조회합니다. (대표 이미지의 리사이즈 버전 포함)
+    """
+    db_club = await db.get(models.ClubDB, club_id, options=[selectinload(models.ClubDB.image_variants)])
+    if not db_club:
+        raise HTTPException(status_code=404, detail="해당 ID의 동아리를 찾을 수 없습니다.")
+    return db_club
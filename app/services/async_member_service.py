@@ -0,0 +1,88 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from fastapi import HTTPException
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
+
+from .. import fast_json, models, schemas
+from . import member_service
+
+# member_service의 비동기(AsyncSession) 버전입니다.
+
+async def create_member(db: AsyncSession, club_id: int, member_data: schemas.ClubMemberCreate) -> models.ClubMemberDB:
+    """
+    특정 동아리에 새로운 부원을 추가합니다.
+    """
+    if not await db.get(models.ClubDB, club_id):
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    db_member = models.ClubMemberDB(**member_data.model_dump(), club_id=club_id)
+    db.add(db_member)
+    await db.commit()
+    member_service.invalidate_member_stats(club_id)
+    await db.refresh(db_member)
+    return db_member
+
+async def get_members_by_club(
+    db: AsyncSession, club_id: int, fields: Optional[Collection[str]] = None
+) -> List[models.ClubMemberDB]:
+    """
+    특정 동아리의 모든 부원 목록을 조회합니다.
+    fields가 주어지면 해당 컬럼만 불러옵니다. (load_only)
+    """
+    if not await db.get(models.ClubDB, club_id):
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    query = select(models.ClubMemberDB).where(models.ClubMemberDB.club_id == club_id).order_by(models.ClubMemberDB.id)
+    if fields is not None:
+        query = query.options(load_only(*fast_json.schema_columns(schemas.ClubMember, models.ClubMemberDB, fields)))
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def get_member_rows(
+    db: AsyncSession, club_id: int, fields: Optional[Collection[str]] = None
+) -> List[Dict[str, Any]]:
+    """특정 동아리의 모든 부원 목록을 조회합니다. (빠른 응답 경로)"""
+    return await db.run_sync(member_service.get_member_rows, club_id, fields)
+
+async def export_members(db: AsyncSession, club_id: int, export_format: str = "xlsx") -> Tuple[Iterator[bytes], str]:
+    """
+    특정 동아리의 부원 명단을 파일로 내보냅니다.
+    (동아리 확인만 비동기 세션으로 하고, 명단 행은 스트리밍 중에 별도의 동기 세션으로 읽습니다)
+    """
+    return await db.run_sync(member_service.export_members, club_id, export_format)
+
+async def _get_member(db: AsyncSession, club_id: int, member_id: int) -> models.ClubMemberDB:
+    result = await db.execute(select(models.ClubMemberDB).where(
+        models.ClubMemberDB.id == member_id,
+        models.ClubMemberDB.club_id == club_id,
+    ))
+    db_member = result.scalars().first()
+    if not db_member:
+        raise HTTPException(status_code=404, detail="해당 부원을 찾을 수 없습니다.")
+    return db_member
+
+async def update_member_info(db: AsyncSession, club_id: int, member_id: int, member_update: schemas.ClubMemberUpdate) -> models.ClubMemberDB:
+    """
+    특정 부원의 정보를 수정합니다. (예: 역할 변경)
+    """
+    db_member = await _get_member(db, club_id, member_id)
+
+    for key, value in member_update.model_dump(exclude_unset=True).items():
+        setattr(db_member, key, value)
+
+    await db.commit()
+    member_service.invalidate_member_stats(db_member.club_id)
+    await db.refresh(db_member)
+    return db_member
+
+async def delete_member(db: AsyncSession, club_id: int, member_id: int):
+    """
+    특정 부원을 삭제(추방)합니다.
+    """
+    db_member = await _get_member(db, club_id, member_id)
+
+    await db.delete(db_member)
+    await db.commit()
+    member_service.invalidate_member_stats(db_member.club_id)
+    return {"detail": "부원이 삭제되었습니다."}
@@ -0,0 +1,102 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer
+from fastapi import HTTPException
+from typing import Any, Collection, Dict, List, Optional, Tuple
+from datetime import date
+
+from .. import models
+from ..pagination import split_page
+from . import operation_log_service
+from .operation_log_service import (
+    build_operation_log_calendar_query, build_operation_log_search_query, build_operation_logs_query,
+    operation_log_cursor_key, search_result_rows,
+)
+
+# operation_log_service의 비동기(AsyncSession) 버전입니다.
+# 파일 업로드가 포함된 활동 기록 생성은 동기 서비스가 처리합니다.
+
+async def get_operation_logs_by_club(
+    db: AsyncSession,
+    club_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Tuple[List[models.OperationLogDB], Optional[str]]:
+    """
+    특정 동아리의 활동 기록 목록을 최신순으로 조회합니다.
+    """
+    if not await db.get(models.ClubDB, club_id):
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    result = await db.execute(build_operation_logs_query(
+        club_id, limit, cursor, date_from=date_from, date_to=date_to, post_type=post_type, team=team, fields=fields
+    ))
+    return split_page(result.scalars().all(), limit, operation_log_cursor_key)
+
+async def get_operation_log_rows(
+    db: AsyncSession,
+    club_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """특정 동아리의 활동 기록 목록을 최신순으로 조회합니다. (빠른 응답 경로)"""
+    return await db.run_sync(
+        operation_log_service.get_operation_log_rows, club_id, limit, cursor, date_from, date_to, post_type, team, fields
+    )
+
+async def get_operation_log_calendar(
+    db: AsyncSession,
+    club_id: int,
+    date_from: date,
+    date_to: date,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    기간이 겹치는 활동 기록을 달력 항목(dict) 목록으로 반환합니다.
+    """
+    if not await db.get(models.ClubDB, club_id):
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    query = build_operation_log_calendar_query(club_id, date_from, date_to, post_type, team)
+    return [dict(row) for row in (await db.execute(query)).mappings()]
+
+async def search_operation_logs(
+    db: AsyncSession,
+    club_id: int,
+    q: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    동아리의 활동 기록을 검색합니다. (관련도 순)
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
+    if not await db.get(models.ClubDB, club_id):
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    query = build_operation_log_search_query(club_id, q, limit=limit, offset=offset)
+    return search_result_rows((await db.execute(query)).mappings(), q)
+
+async def get_operation_log_by_id(db: AsyncSession, log_id: int) -> Optional[models.OperationLogDB]:
+    """
+    ID로 특정 활동 기록을 조회합니다.
+    (연결된 파일 목록을 함께 로드합니다)
+    """
+    result = await db.execute(
+        select(models.OperationLogDB)
+        .options(undefer(models.OperationLogDB.content), selectinload(models.OperationLogDB.files))
+        .where(models.OperationLogDB.id == log_id)
+    )
+    return result.scalars().first()
@@ -5,12 +5,13 @@ from datetime import timedelta
 
 from .. import models, schemas, auth, database
 
-def authenticate_user(db: Session, email: str, password: str) -> models.UserDB:
+async def authenticate_user(db: Session, email: str, password: str) -> models.UserDB:
     """
     사용자를 인증합니다. 실패 시 None을 반환합니다.
+    (비밀번호 검증은 전용 스레드 풀에서 실행되므로 이벤트 루프를 막지 않습니다)
     """
     user = db.query(models.UserDB).filter(models.UserDB.email == email).first()
-    if not user or not auth.verify_password(password, user.hashed_password):
+    if not user or not await auth.verify_password_async(password, user.hashed_password):
         return None
     return user
 
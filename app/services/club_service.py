@@ -1,34 +1,24 @@
-from sqlalchemy.orm import Session
-from fastapi import HTTPException, UploadFile
-from typing import List, Optional
-import shutil
-import uuid
-import os
-
-from .. import models, schemas
+from sqlalchemy import Select, case, delete, func, literal_column, null, or_, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from fastapi import HTTPException
+from typing import Any, Dict, List, Optional
+
+from .. import fast_json, fts, membership, models, schemas
 from ..auth import get_password_hash
+from . import image_service
 
-def _save_club_image(file: UploadFile) -> Optional[str]:
+def validate_new_club(db: Session, name: str, password: str):
     """
-    동아리 이미지를 저장하고 경로를 반환합니다.
+    동아리 생성 요청의 이름 중복과 비밀번호 형식을 확인합니다.
+    이미지를 저장하기 전에 호출하여, 생성할 수 없는 요청이 업로드 파일을 남기지 않게 합니다.
     """
-    if not file:
-        return None
-        
-    UPLOAD_DIR = "static/images"
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
-
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
+    if db.query(models.ClubDB.id).filter(models.ClubDB.name == name).first():
+        raise HTTPException(status_code=400, detail="이미 존재하는 동아리 이름입니다.")
 
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        return file_path.replace(os.path.sep, '/')
-    finally:
-        file.file.close()
+    if not (password.isdigit() and len(password) == 6):
+        raise HTTPException(status_code=400, detail="비밀번호는 6자리 숫자여야 합니다.")
 
 def create_club(
     db: Session, 
@@ -37,18 +27,13 @@ def create_club(
     topic: str, 
     password: str, 
     description: Optional[str], 
-    file: Optional[UploadFile]
+    image_url: Optional[str]
 ) -> models.ClubDB:
     """
     새로운 동아리를 생성합니다.
+    (이미지는 라우터에서 validate_new_club으로 검증한 뒤 upload_service로 저장하고 경로만 전달받습니다)
     """
-    if db.query(models.ClubDB).filter(models.ClubDB.name == name).first():
-        raise HTTPException(status_code=400, detail="이미 존재하는 동아리 이름입니다.")
-    
-    if not (password.isdigit() and len(password) == 6):
-        raise HTTPException(status_code=400, detail="비밀번호는 6자리 숫자여야 합니다.")
-
-    image_url_path = _save_club_image(file)
+    validate_new_club(db, name, password)
 
     club_data = schemas.ClubCreate(
         name=name,
@@ -59,29 +44,119 @@ def create_club(
     )
     
     new_club = models.ClubDB(**club_data.model_dump())
-    if image_url_path:
-        new_club.image_url = image_url_path
+    if image_url:
+        new_club.image_url = image_url
         
     db.add(new_club)
-    db.commit()
-    db.refresh(new_club)
-    return new_club
+    try:
+        db.commit()
+    except IntegrityError:
+        # 검증 후 같은 이름의 동아리가 먼저 만들어진 경우
+        db.rollback()
+        raise HTTPException(status_code=400, detail="이미 존재하는 동아리 이름입니다.")
+    # 같은 이미지가 이미 업로드된 적이 있으면 리사이즈 버전이 있으므로 응답용으로 함께 다시 읽습니다.
+    return get_club_by_id(db, new_club.id)
 
 def get_all_clubs(db: Session):
     """모든 동아리 목록을 반환합니다."""
-    return db.query(models.ClubDB).all()
+    return db.query(models.ClubDB).options(selectinload(models.ClubDB.image_variants)).all()
+
+def get_all_club_rows(db: Session) -> List[Dict[str, Any]]:
+    """
+    get_all_clubs의 빠른 응답 경로(fast_json) 버전입니다.
+    응답 스키마에 필요한 컬럼만 조회하여 그대로 직렬화할 수 있는 dict 목록으로 반환합니다.
+    """
+    columns = fast_json.schema_columns(schemas.ClubSearchResult, models.ClubDB)
+    result = db.execute(select(*columns, null().label("highlight")).order_by(models.ClubDB.id))
+    rows = fast_json.rows_to_dicts(result, result.keys())
+    return image_service.attach_variant_rows(db, rows, "image_url", "image_variants", "thumbnail_url")
+
+def build_club_search_query(
+    name: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    highlight: bool = False,
+) -> Select:
+    """
+    동아리 검색 쿼리를 만듭니다. (동기/비동기 서비스 공용)
+    이름, 주제, 유형, 설명을 전문 검색 인덱스(FTS5)로 검색하고 BM25 점수 순으로 정렬합니다.
+    """
+    Club = models.ClubDB
+    columns = [Club.id, Club.name, Club.image_url, Club.description, Club.club_type, Club.topic]
+    keyword = name.strip()
+
+    if len(keyword) >= fts.TRIGRAM_MIN_LENGTH:
+        fts_table = literal_column(fts.CLUB_FTS_TABLE)
+        highlight_column = (
+            func.snippet(fts_table, -1, "<mark>", "</mark>", "…", 16) if highlight else null()
+        )
+        query = (
+            select(*columns, highlight_column.label("highlight"))
+            .join(fts.clubs_fts, fts.clubs_fts.c.rowid == Club.id)
+            .where(fts_table.op("MATCH")(fts.match_phrase(keyword)))
+            .order_by(func.bm25(fts_table, *fts.CLUB_FTS_WEIGHTS))
+        )
+    else:
+        # 3글자 미만의 검색어는 trigram 인덱스를 사용할 수 없으므로 LIKE로 검색하고,
+        # 이름이 일치하는 동아리를 먼저 보여줍니다.
+        name_matches = Club.name.contains(keyword, autoescape=True)
+        query = (
+            select(*columns, null().label("highlight"))
+            .where(or_(
+                name_matches,
+                Club.topic.contains(keyword, autoescape=True),
+                Club.club_type.contains(keyword, autoescape=True),
+                Club.description.contains(keyword, autoescape=True),
+            ))
+            .order_by(case((name_matches, 0), else_=1), Club.name)
+        )
+
+    if limit is not None:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+    return query
+
+def search_clubs_by_name(
+    db: Session,
+    name: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    highlight: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    이름, 주제, 유형, 설명으로 동아리를 검색합니다. (관련도 순)
+    highlight가 True이면 일치한 부분을 <mark>로 감싼 발췌문을 함께 반환합니다.
+    """
+    rows = _search_club_rows(db, name, limit, offset, highlight)
+    return image_service.attach_variants(db, rows, "image_url", "image_variants")
 
-def search_clubs_by_name(db: Session, name: str) -> List[models.ClubDB]:
+def search_club_rows(
+    db: Session,
+    name: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    highlight: bool = False,
+) -> List[Dict[str, Any]]:
     """
-    이름으로 동아리를 검색합니다.
+    search_clubs_by_name의 빠른 응답 경로(fast_json) 버전입니다.
+    리사이즈 버전과 썸네일 경로까지 dict로 채워 그대로 직렬화할 수 있게 반환합니다.
     """
+    rows = _search_club_rows(db, name, limit, offset, highlight)
+    return image_service.attach_variant_rows(db, rows, "image_url", "image_variants", "thumbnail_url")
+
+def _search_club_rows(
+    db: Session, name: str, limit: Optional[int], offset: int, highlight: bool
+) -> List[Dict[str, Any]]:
     if not name.strip():
         raise HTTPException(status_code=400, detail="검색할 동아리 이름을 입력해주세요.")
-    return db.query(models.ClubDB).filter(models.ClubDB.name.contains(name)).all()
+    query = build_club_search_query(name, limit=limit, offset=offset, highlight=highlight)
+    return [dict(row) for row in db.execute(query).mappings()]
 
-def join_club(db: Session, join_request: schemas.ClubJoin):
+def join_club(db: Session, join_request: schemas.ClubJoin, user: models.UserDB) -> models.ClubDB:
     """
     동아리에 참여(가입)합니다.
+    비밀번호가 맞으면 user_club_association에 가입 정보를 저장하고 회원 색인에 반영합니다. (이미 가입했으면 그대로 둡니다)
     """
     db_club = db.query(models.ClubDB).filter(models.ClubDB.name == join_request.name).first()
     if not db_club:
@@ -90,13 +165,37 @@ def join_club(db: Session, join_request: schemas.ClubJoin):
     if db_club.password != join_request.password:
         raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
 
+    # 동시에 가입해도 (user_id, club_id) 고유 인덱스로 한 행만 남습니다.
+    db.execute(
+        insert(models.user_club_association)
+        .values(user_id=user.id, club_id=db_club.id)
+        .on_conflict_do_nothing()
+    )
+    db.commit()
+    membership.index.add(user.id, db_club.id)
     return db_club
 
+def leave_club(db: Session, club_id: int, user: models.UserDB):
+    """동아리에서 탈퇴합니다. 가입 정보를 삭제하고 회원 색인에서 제거합니다."""
+    result = db.execute(delete(models.user_club_association).where(
+        models.user_club_association.c.user_id == user.id,
+        models.user_club_association.c.club_id == club_id,
+    ))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="가입한 동아리가 아닙니다.")
+    db.commit()
+    membership.index.discard(user.id, club_id)
+
 def get_club_by_id(db: Session, club_id: int) -> models.ClubDB:
     """
-    ID로 동아리 정보를 조회합니다.
+    ID로 동아리 정보를 조회합니다. (대표 이미지의 리사이즈 버전 포함)
     """
-    db_club = db.query(models.ClubDB).filter(models.ClubDB.id == club_id).first()
+    db_club = (
+        db.query(models.ClubDB)
+        .options(selectinload(models.ClubDB.image_variants))
+        .filter(models.ClubDB.id == club_id)
+        .first()
+    )
     if not db_club:
         raise HTTPException(status_code=404, detail="해당 ID의 동아리를 찾을 수 없습니다.")
     return db_club 
\ No newline at end of file
@@ -0,0 +1,137 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING, Any, Dict, List
+import logging
+import os
+import tempfile
+
+from .. import models, schemas
+from ..database import SessionLocal
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# 업로드된 이미지(동아리 대표 이미지, 영수증 사진)의 리사이즈 버전을 만드는 모듈입니다.
+# 업로드 응답이 나간 뒤 백그라운드 작업으로 실행되며, 생성이 끝나기 전까지 API는 원본 이미지를 대신 안내합니다.
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIR = "static/images/derived"
+DERIVATIVE_WIDTHS = (320, 640, 1280)
+# (형식, 확장자, 저장 옵션) - WebP를 우선 사용하고, WebP를 지원하지 않는 환경을 위해 JPEG도 만듭니다.
+DERIVATIVE_FORMATS = (
+    ("webp", "webp", {"quality": 80, "method": 4}),
+    ("jpeg", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+
+def _save_atomically(image: "Image.Image", path: str, image_format: str, options: dict):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            image.save(buffer, format=image_format.upper(), **options)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def generate_derivatives(source_url: str):
+    """
+    원본 이미지의 리사이즈 버전(WebP/JPEG)을 만들고 image_derivatives 테이블에 기록합니다.
+    원본보다 큰 크기는 만들지 않으며, 이미 기록된 원본이면 아무 것도 하지 않습니다.
+    (같은 이미지의 작업이 동시에 실행되어도 (원본, 크기, 형식) 고유 인덱스로 한 번씩만 기록됩니다)
+    (BackgroundTasks에서 실행되므로 요청과 별도의 세션을 사용합니다)
+    """
+    # Pillow는 리사이즈 작업에서만 쓰이므로 앱 시작 시간을 줄이기 위해 처음 사용할 때 불러옵니다.
+    from PIL import Image, ImageOps
+
+    db = SessionLocal()
+    try:
+        exists = db.execute(select(models.ImageDerivativeDB.id).where(
+            models.ImageDerivativeDB.source_url == source_url
+        ).limit(1)).first()
+        if exists:
+            return
+
+        os.makedirs(DERIVED_DIR, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(source_url))[0]
+        derivatives = []
+        try:
+            with Image.open(source_url) as original:
+                original = ImageOps.exif_transpose(original).convert("RGB")
+                for width in DERIVATIVE_WIDTHS:
+                    if width >= original.width:
+                        break
+                    height = round(original.height * width / original.width)
+                    resized = original.resize((width, height), Image.LANCZOS)
+                    for image_format, extension, options in DERIVATIVE_FORMATS:
+                        url = f"{DERIVED_DIR}/{stem}_w{width}.{extension}"
+                        _save_atomically(resized, url, image_format, options)
+                        derivatives.append({
+                            "source_url": source_url, "width": width, "format": image_format, "url": url,
+                        })
+        except (OSError, Image.DecompressionBombError):
+            # 이미지가 아니거나 손상된 파일이면 원본만 사용합니다.
+            logger.warning("이미지 리사이즈 버전을 만들 수 없습니다: %s", source_url, exc_info=True)
+            return
+        if derivatives:
+            db.execute(insert(models.ImageDerivativeDB).on_conflict_do_nothing(), derivatives)
+            db.commit()
+    finally:
+        db.close()
+
+
+def attach_variants(db: Session, rows: List[Dict[str, Any]], source_key: str, target_key: str) -> List[Dict[str, Any]]:
+    """
+    ORM 객체가 아닌 행(dict) 목록에 리사이즈 버전 목록을 한 번의 쿼리로 채워 넣습니다.
+
+    :param source_key: 원본 이미지 경로가 들어 있는 키 (예: 'photo_url')
+    :param target_key: 리사이즈 버전 목록을 넣을 키 (예: 'photo_variants')
+    """
+    sources = {row[source_key] for row in rows if row.get(source_key)}
+    variants: Dict[str, List[schemas.ImageVariant]] = {}
+    if sources:
+        result = db.execute(
+            select(models.ImageDerivativeDB)
+            .where(models.ImageDerivativeDB.source_url.in_(sources))
+            .order_by(models.ImageDerivativeDB.width)
+        ).scalars()
+        for derivative in result:
+            variants.setdefault(derivative.source_url, []).append(
+                schemas.ImageVariant.model_validate(derivative)
+            )
+    for row in rows:
+        row[target_key] = variants.get(row.get(source_key), [])
+    return rows
+
+
+def attach_variant_rows(
+    db: Session, rows: List[Dict[str, Any]], source_key: str, target_key: str, thumbnail_key: str
+) -> List[Dict[str, Any]]:
+    """
+    attach_variants의 빠른 응답 경로(fast_json) 버전입니다.
+    리사이즈 버전을 스키마 객체가 아닌 dict로 채우고, 스키마의 계산 필드인 썸네일 경로도 함께 채웁니다.
+
+    :param thumbnail_key: 썸네일 경로를 넣을 키 (예: 'thumbnail_url')
+    """
+    Derivative = models.ImageDerivativeDB
+    sources = {row[source_key] for row in rows if row.get(source_key)}
+    variants: Dict[str, List[Dict[str, Any]]] = {}
+    if sources:
+        result = db.execute(
+            select(Derivative.source_url, Derivative.width, Derivative.format, Derivative.url)
+            .where(Derivative.source_url.in_(sources))
+            .order_by(Derivative.width)
+        )
+        for source_url, width, image_format, url in result:
+            variants.setdefault(source_url, []).append({"width": width, "format": image_format, "url": url})
+    for row in rows:
+        row[target_key] = row_variants = variants.get(row.get(source_key), [])
+        # schemas._thumbnail_url과 같은 규칙: 가장 작은 WebP, 없으면 원본
+        row[thumbnail_key] = next(
+            (variant["url"] for variant in row_variants if variant["format"] == "webp"), row.get(source_key)
+        )
+    return rows
@@ -0,0 +1,198 @@
+import codecs
+import csv
+import json
+import os
+import re
+import tempfile
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+# CSV/xlsx 업로드 파일을 한 행씩 읽어 오는 파서 모음입니다. (export_service의 반대 방향)
+# 파일 전체를 메모리에 올리지 않고 행 단위로 읽으며, 각 행은 {열 제목: 셀 문자열} dict로 반환합니다.
+# 빈 셀은 None이 되고, 숫자/날짜 셀은 CSV와 같은 문자열로 바꾸어 스키마 검증을 같은 방식으로 할 수 있게 합니다.
+# JSON 요청 본문은 NDJSON(한 줄에 객체 하나)이면 같은 방식으로 한 줄씩 읽고,
+# JSON 배열이면 전체를 한 번에 파싱해야 하므로 JSON_BODY_MAX_BYTES까지만 받습니다.
+
+IMPORT_FORMATS = ("csv", "xlsx")
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+# JSON 배열 본문의 최대 크기 (더 큰 명단은 NDJSON이나 CSV/xlsx 파일로 보냅니다)
+JSON_BODY_MAX_BYTES = int(os.getenv("DONGARI_BULK_JSON_MAX_BYTES", str(1024 * 1024)))
+
+# NDJSON 본문을 메모리에 담아 두는 최대 크기 (넘으면 임시 파일로 옮깁니다)
+SPOOL_MAX_BYTES = 1024 * 1024
+
+# 한 번에 검증하고 저장할 행 수
+IMPORT_BATCH_SIZE = 500
+
+T = TypeVar("T")
+
+_DATE_PATTERN = re.compile(r"^(\d{4})[-./년\s]*(\d{1,2})[-./월\s]*(\d{1,2})")
+
+
+def detect_format(filename: Optional[str]) -> str:
+    """파일 확장자로 가져오기 형식을 판별합니다. 지원하지 않는 형식이면 400 에러를 발생시킵니다."""
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if extension not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="CSV 또는 xlsx 파일만 가져올 수 있습니다.")
+    return extension
+
+
+def _cell_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, datetime):
+        value = value.date() if value.time() == datetime.min.time() else value
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    text = str(value).strip()
+    return text or None
+
+
+def _rows_to_dicts(header: List[Any], rows: Iterable[Iterable[Any]]) -> Iterator[Dict[str, Optional[str]]]:
+    keys = [_cell_text(name) or "" for name in header]
+    for row in rows:
+        values = [_cell_text(value) for value in row]
+        if not any(values):
+            continue  # 빈 행은 건너뜁니다.
+        yield dict(zip(keys, values))
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[Dict[str, Optional[str]]]:
+    """CSV 파일을 한 행씩 읽습니다. (UTF-8, BOM이 있어도 됩니다)"""
+    reader = csv.reader(codecs.iterdecode(file, "utf-8-sig"))
+    try:
+        header = next(reader, None)
+        if header is None:
+            return
+        yield from _rows_to_dicts(header, reader)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV 파일은 UTF-8 인코딩이어야 합니다.")
+
+
+def iter_xlsx_rows(file: BinaryIO) -> Iterator[Dict[str, Optional[str]]]:
+    """xlsx 파일의 첫 번째 시트를 한 행씩 읽습니다. (read-only 모드로 시트를 스트리밍합니다)"""
+    from openpyxl import load_workbook  # 가져오기에서만 쓰이므로 처음 사용할 때 불러옵니다.
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception:
+        raise HTTPException(status_code=400, detail="xlsx 파일을 읽을 수 없습니다.")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        yield from _rows_to_dicts(list(header), rows)
+    finally:
+        workbook.close()
+
+
+def iter_file_rows(file: BinaryIO, import_format: str) -> Iterator[Dict[str, Optional[str]]]:
+    """형식에 맞는 파서로 업로드 파일을 한 행씩 읽습니다."""
+    if import_format == "csv":
+        return iter_csv_rows(file)
+    return iter_xlsx_rows(file)
+
+
+async def read_json_body(request: Request, max_bytes: int = JSON_BODY_MAX_BYTES) -> Any:
+    """JSON 요청 본문을 max_bytes까지만 받아 파싱합니다. (넘으면 413, 형식이 잘못되면 400 에러)"""
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"JSON 본문은 {max_bytes // 1024}KB를 넘을 수 없습니다. 큰 명단은 NDJSON이나 CSV/xlsx 파일로 보내주세요.",
+    )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="JSON 형식이 올바르지 않습니다.")
+
+
+async def spool_request_body(request: Request) -> BinaryIO:
+    """
+    요청 본문을 청크 단위로 받아 임시 파일(SPOOL_MAX_BYTES까지는 메모리)에 담아 둡니다.
+    스레드 풀에서 한 줄씩 읽을 수 있도록 처음 위치로 되돌려 반환하며, 다 쓴 뒤에는 닫아야 합니다.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(spooled.write, chunk)
+        spooled.seek(0)
+    except BaseException:
+        spooled.close()
+        raise
+    return spooled
+
+
+def iter_ndjson_rows(file: BinaryIO) -> Iterator[Any]:
+    """NDJSON 본문을 한 줄씩 읽습니다. (빈 줄은 건너뛰고, JSON이 아닌 줄이 있으면 400 에러)"""
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"{line_number}번째 줄의 JSON 형식이 올바르지 않습니다.")
+
+
+def parse_date(text: Optional[str]) -> str:
+    """
+    '2024-03-05', '2024.3.5', '2024/03/05', '20240305', '2024-03-05 13:20:00' 같은 날짜를
+    'YYYY-MM-DD' 형식으로 바꿉니다. 해석할 수 없으면 ValueError를 발생시킵니다.
+    """
+    match = _DATE_PATTERN.match((text or "").strip())
+    try:
+        if not match:
+            raise ValueError(text)
+        return date(*(int(part) for part in match.groups())).isoformat()
+    except ValueError:
+        raise ValueError(f"날짜 형식이 올바르지 않습니다: {text}") from None
+
+
+def parse_amount(text: Optional[str]) -> int:
+    """
+    '1,000', '-5,000원', '(5,000)', '₩12,000' 같은 금액을 정수로 바꿉니다.
+    빈 값은 0으로 보고, 해석할 수 없으면 ValueError를 발생시킵니다.
+    """
+    value = re.sub(r"[,\s원₩]", "", text or "")
+    if not value:
+        return 0
+    negative = value.startswith("(") and value.endswith(")")
+    try:
+        amount = float(value.strip("()"))
+    except ValueError:
+        raise ValueError(f"금액 형식이 올바르지 않습니다: {text}") from None
+    if not amount.is_integer():
+        raise ValueError(f"금액은 정수여야 합니다: {text}")
+    return -int(amount) if negative else int(amount)
+
+
+def validation_messages(error: ValidationError) -> List[str]:
+    """스키마 검증 오류를 행별 결과에 담을 '필드: 메시지' 문자열 목록으로 바꿉니다."""
+    messages = []
+    for detail in error.errors():
+        location = ".".join(str(part) for part in detail["loc"])
+        messages.append(f"{location}: {detail['msg']}" if location else detail["msg"])
+    return messages
+
+
+def batched(items: Iterable[T], size: int = IMPORT_BATCH_SIZE) -> Iterator[List[T]]:
+    """이터레이터를 size개씩 묶어 반환합니다."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
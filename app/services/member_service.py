@@ -1,8 +1,41 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, load_only
 from fastapi import HTTPException, status
-from typing import List
+from pydantic import ValidationError
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from .. import models, schemas
+from .. import fast_json, models, schemas
+from ..cache import TTLCache
+from ..club_versions import bump_club_versions
+from ..database import ReadSessionLocal
+from . import export_service, import_service
+
+# 부원 명단 파일(가져오기/내보내기)의 열 제목 (필드 이름 -> 열 제목)
+# 내보낸 파일을 그대로 다시 가져올 수 있도록 같은 열 제목을 사용합니다.
+ROSTER_COLUMNS = {
+    "name": "이름",
+    "birth_date": "생년월일",
+    "student_id": "학번",
+    "major": "전공",
+    "phone_number": "전화번호",
+    "email": "이메일",
+    "gender": "성별",
+    "member_year": "기수",
+    "role": "직책",
+    "memo": "메모",
+}
+
+# --- 명단 통계 캐시 설정 ---
+# 대시보드가 자주 조회하는 명단 통계를 동아리별로 캐시합니다.
+# 이 모듈(과 async_member_service)의 부원 추가/수정/삭제 시 해당 동아리의 항목을 바로 지우고,
+# 다른 프로세스에서 변경된 경우에 대비해 유효 시간을 짧게 둡니다.
+MEMBER_STATS_CACHE_TTL_SECONDS = 60
+MEMBER_STATS_CACHE_MAX_SIZE = 512
+
+member_stats_cache = TTLCache(maxsize=MEMBER_STATS_CACHE_MAX_SIZE, ttl=MEMBER_STATS_CACHE_TTL_SECONDS)
+
+# 통계를 낼 컬럼 (부원이 직접 입력하는 값 중 분포를 볼 만한 것들)
+MEMBER_STATS_COLUMNS = ("member_year", "gender", "major", "role")
 
 def create_member(db: Session, club_id: int, member_data: schemas.ClubMemberCreate) -> models.ClubMemberDB:
     """
@@ -14,44 +47,202 @@ def create_member(db: Session, club_id: int, member_data: schemas.ClubMemberCrea
     db_member = models.ClubMemberDB(**member_data.dict(), club_id=club_id)
     db.add(db_member)
     db.commit()
+    invalidate_member_stats(club_id)
     db.refresh(db_member)
     return db_member
 
-def get_members_by_club(db: Session, club_id: int) -> List[models.ClubMemberDB]:
+def get_members_by_club(
+    db: Session, club_id: int, fields: Optional[Collection[str]] = None
+) -> List[models.ClubMemberDB]:
     """
     특정 동아리의 모든 부원 목록을 조회합니다.
+    fields가 주어지면 해당 컬럼만 불러옵니다. (load_only, 나머지 속성에 접근하면 추가 쿼리가 발생합니다)
     """
-    db_club = db.query(models.ClubDB).filter(models.ClubDB.id == club_id).first()
-    if not db_club:
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
         raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
-    
-    return db_club.club_members
 
-def update_member_info(db: Session, member_id: int, member_update: schemas.ClubMemberUpdate) -> models.ClubMemberDB:
+    # (club_id, member_year) 인덱스가 선택되면 행 순서가 바뀌므로 등록 순서(id)를 명시합니다.
+    query = db.query(models.ClubMemberDB).filter(
+        models.ClubMemberDB.club_id == club_id
+    ).order_by(models.ClubMemberDB.id)
+    if fields is not None:
+        query = query.options(load_only(*fast_json.schema_columns(schemas.ClubMember, models.ClubMemberDB, fields)))
+    return query.all()
+
+def get_member_rows(
+    db: Session, club_id: int, fields: Optional[Collection[str]] = None
+) -> List[Dict[str, Any]]:
     """
-    특정 부원의 정보를 수정합니다. (예: 역할 변경)
+    get_members_by_club의 빠른 응답 경로(fast_json) 버전입니다.
+    ORM 객체를 만들지 않고 응답 스키마의 컬럼(fields가 주어지면 그중 해당 컬럼)만 조회하여 dict 목록으로 반환합니다.
+    """
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    columns = fast_json.schema_columns(schemas.ClubMember, models.ClubMemberDB, fields)
+    result = db.execute(
+        select(*columns).where(models.ClubMemberDB.club_id == club_id).order_by(models.ClubMemberDB.id)
+    )
+    return fast_json.rows_to_dicts(result, result.keys())
+
+def get_member_stats(db: Session, club_id: int) -> schemas.ClubMemberStats:
     """
-    db_member = db.query(models.ClubMemberDB).filter(models.ClubMemberDB.id == member_id).first()
+    특정 동아리의 명단 통계(전체 인원, 기수/성별/전공/직책별 인원)를 반환합니다.
+    컬럼별 GROUP BY 쿼리로 집계하며(ix_club_members_club_year 인덱스로 동아리 범위만 읽습니다),
+    결과는 동아리별로 캐시됩니다.
+    """
+    cached = member_stats_cache.get(club_id)
+    if cached is not None:
+        return cached
+
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    Member = models.ClubMemberDB
+    buckets = {}
+    for name in MEMBER_STATS_COLUMNS:
+        column = getattr(Member, name)
+        count = func.count().label("count")
+        query = select(column.label("value"), count).where(Member.club_id == club_id).group_by(column)
+        if name == "member_year":
+            query = query.order_by(column.is_(None), column)
+        else:
+            query = query.order_by(count.desc(), column.is_(None), column)
+        buckets[name] = [schemas.MemberStatBucket(value=value, count=n) for value, n in db.execute(query)]
+
+    stats = schemas.ClubMemberStats(
+        total=sum(bucket.count for bucket in buckets["member_year"]), **buckets
+    )
+    member_stats_cache.set(club_id, stats)
+    return stats
+
+def invalidate_member_stats(club_id: int):
+    """부원이 추가/수정/삭제된 동아리의 명단 통계 캐시를 지웁니다."""
+    member_stats_cache.invalidate(club_id)
+
+def _get_member(db: Session, club_id: int, member_id: int) -> models.ClubMemberDB:
+    """동아리에 속한 부원을 찾습니다. 없거나 다른 동아리의 부원이면 404 에러를 발생시킵니다."""
+    db_member = db.query(models.ClubMemberDB).filter(
+        models.ClubMemberDB.id == member_id,
+        models.ClubMemberDB.club_id == club_id,
+    ).first()
     if not db_member:
         raise HTTPException(status_code=404, detail="해당 부원을 찾을 수 없습니다.")
-    
+    return db_member
+
+def update_member_info(db: Session, club_id: int, member_id: int, member_update: schemas.ClubMemberUpdate) -> models.ClubMemberDB:
+    """
+    특정 부원의 정보를 수정합니다. (예: 역할 변경)
+    """
+    db_member = _get_member(db, club_id, member_id)
     update_data = member_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_member, key, value)
         
     db.add(db_member)
     db.commit()
+    invalidate_member_stats(db_member.club_id)
     db.refresh(db_member)
     return db_member
 
-def delete_member(db: Session, member_id: int):
+def delete_member(db: Session, club_id: int, member_id: int):
     """
     특정 부원을 삭제(추방)합니다.
     """
-    db_member = db.query(models.ClubMemberDB).filter(models.ClubMemberDB.id == member_id).first()
-    if not db_member:
-        raise HTTPException(status_code=404, detail="해당 부원을 찾을 수 없습니다.")
-
+    db_member = _get_member(db, club_id, member_id)
     db.delete(db_member)
     db.commit()
-    return {"detail": "부원이 삭제되었습니다."} 
\ No newline at end of file
+    invalidate_member_stats(db_member.club_id)
+    return {"detail": "부원이 삭제되었습니다."}
+
+def bulk_create_members(db: Session, club_id: int, rows: Iterable[Mapping[str, Any]]) -> schemas.BulkImportResult:
+    """
+    부원 명단을 한 번에 추가합니다.
+    행을 IMPORT_BATCH_SIZE개씩 검증하고, 통과한 행은 배치마다 하나의 INSERT(executemany)로 저장하며
+    전체를 하나의 트랜잭션으로 커밋합니다. 검증에 실패한 행은 건너뛰고 행별 결과에 오류를 담아 반환합니다.
+
+    :param rows: 필드 이름 또는 ROSTER_COLUMNS의 열 제목을 키로 갖는 행 목록 (JSON 배열이나 파일에서 읽은 행)
+    """
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    # 같은 명단을 두 번 가져와도 부원이 중복되지 않도록 학번으로 확인합니다.
+    known_student_ids = set(db.execute(
+        select(models.ClubMemberDB.student_id).where(
+            models.ClubMemberDB.club_id == club_id,
+            models.ClubMemberDB.student_id.is_not(None),
+        )
+    ).scalars())
+    statement = insert(models.ClubMemberDB).returning(models.ClubMemberDB.id, sort_by_parameter_order=True)
+    field_names = {label: field for field, label in ROSTER_COLUMNS.items()}
+
+    results: List[schemas.BulkImportRowResult] = []
+    for batch in import_service.batched(rows):
+        values, created = [], []
+        for raw in batch:
+            result = schemas.BulkImportRowResult(row=len(results) + 1, status="error")
+            results.append(result)
+            if isinstance(raw, Mapping):
+                # 빈 셀은 값이 없는 것으로 보고 스키마의 기본값(예: 직책 '부원')을 사용합니다.
+                raw = {field_names.get(key, key): value for key, value in raw.items() if value is not None}
+            try:
+                member = schemas.ClubMemberCreate.model_validate(raw)
+            except ValidationError as e:
+                result.errors = import_service.validation_messages(e)
+                continue
+            if member.student_id and member.student_id in known_student_ids:
+                result.errors = ["student_id: 이미 등록된 학번입니다."]
+                continue
+            if member.student_id:
+                known_student_ids.add(member.student_id)
+            values.append({**member.model_dump(), "club_id": club_id})
+            created.append(result)
+
+        if values:
+            for result, member_id in zip(created, db.execute(statement, values).scalars()):
+                result.status, result.id = "created", member_id
+
+    created_count = sum(result.status == "created" for result in results)
+    if created_count:
+        # ORM을 거치지 않은 INSERT이므로 동아리 버전을 직접 올립니다.
+        bump_club_versions(db.connection(), [club_id])
+    db.commit()
+    invalidate_member_stats(club_id)
+    return schemas.BulkImportResult(
+        created=created_count, failed=len(results) - created_count, rows=results
+    )
+
+def import_members_file(db: Session, club_id: int, file, import_format: str) -> schemas.BulkImportResult:
+    """업로드된 CSV/xlsx 명단 파일을 한 행씩 읽어 bulk_create_members로 추가합니다."""
+    return bulk_create_members(db, club_id, import_service.iter_file_rows(file, import_format))
+
+def _iter_member_rows(club_id: int) -> Iterator[Tuple[Any, ...]]:
+    """
+    부원 명단을 한 행씩 읽어 옵니다.
+    응답 스트리밍이 끝날 때까지 사용되므로 요청 세션과 별도의 세션을 열고, 필요한 컬럼만 튜플로 가져옵니다.
+    """
+    Member = models.ClubMemberDB
+    query = select(*(getattr(Member, field) for field in ROSTER_COLUMNS)).where(
+        Member.club_id == club_id
+    ).order_by(Member.id)
+
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(query.execution_options(yield_per=export_service.FETCH_SIZE))
+        for row in result:
+            yield tuple(row)
+    finally:
+        db.close()
+
+def export_members(db: Session, club_id: int, export_format: str = "xlsx") -> Tuple[Iterator[bytes], str]:
+    """
+    특정 동아리의 부원 명단을 파일로 내보냅니다. (부원이 없으면 열 제목만 있는 가져오기용 양식이 됩니다)
+
+    :return: 파일 청크 이터레이터와 동아리 이름을 튜플로 반환
+    """
+    db_club = db.query(models.ClubDB).filter(models.ClubDB.id == club_id).first()
+    if not db_club:
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    header = list(ROSTER_COLUMNS.values())
+    return export_service.stream_rows(export_format, "부원 명단", header, _iter_member_rows(club_id)), db_club.name
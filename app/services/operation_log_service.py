@@ -1,40 +1,30 @@
-from sqlalchemy.orm import Session, selectinload
-from fastapi import HTTPException, UploadFile
-from typing import List, Optional
-import json
-import os
-import uuid
-import shutil
+from sqlalchemy.orm import Session, load_only, selectinload, undefer
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, func, literal_column, or_, select
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Optional, Tuple
+from datetime import date, datetime
 
-from .. import models, schemas
+from .. import fast_json, fts, models, schemas
+from ..pagination import decode_cursor, split_page
 
-def _save_uploaded_file(file: UploadFile) -> str:
-    """
-    업로드된 파일을 저장하고 URL 경로를 반환합니다.
-    """
-    UPLOAD_DIR = "static/files"
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
-    
-    file_extension = os.path.splitext(file.filename)[1]
-    file_name = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, file_name)
+# 달력 조회에서 한 번에 조회할 수 있는 최대 기간 (일)
+CALENDAR_MAX_DAYS = 366
 
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        return file_path.replace(os.path.sep, '/')
-    finally:
-        file.file.close()
+# 기록이 끝나는 날짜 (끝나는 날짜가 없으면 시작 날짜 하루짜리로 봅니다)
+# 기간 인덱스(ix_operation_logs_club_*period)와 같은 식이어야 인덱스를 사용할 수 있습니다.
+_period_end = func.coalesce(models.OperationLogDB.end_date, models.OperationLogDB.start_date)
 
 def create_operation_log(
     db: Session,
     club_id: int,
     log_create: schemas.OperationLogCreate,
     current_user: models.UserDB,
-    files: List[UploadFile],
+    files: List[Tuple[str, str]],
 ) -> models.OperationLogDB:
-    """새로운 활동 기록을 데이터베이스에 생성합니다."""
+    """
+    새로운 활동 기록을 데이터베이스에 생성합니다.
+    (첨부파일은 라우터에서 upload_service로 저장한 뒤 (원본 파일명, 저장 경로) 목록으로 전달받습니다)
+    """
     club = db.query(models.ClubDB).filter(models.ClubDB.id == club_id).first()
     if not club:
         raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
@@ -50,29 +40,278 @@ def create_operation_log(
         author_id=author.id,
     )
 
-    if files:
-        for file in files:
-            file_path = _save_uploaded_file(file)
-            db_file = models.UploadedFileDB(
-                file_name=file.filename,
-                file_path=file_path.replace(os.path.sep, "/"),
-            )
-            db_log.files.append(db_file)
+    for file_name, file_path in files:
+        db_log.files.append(models.UploadedFileDB(file_name=file_name, file_path=file_path))
     
     db.add(db_log)
     db.commit()
-    db.refresh(db_log)
-    return db_log
+    return get_operation_log_by_id(db, db_log.id)
+
+def operation_log_filters(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+) -> List[Any]:
+    """
+    활동 기록 필터 조건 목록을 만듭니다.
+    date_from/date_to가 주어지면 [start_date, end_date] 기간이 조회 기간과 겹치는 기록만 남깁니다. (시작 날짜가 없는 기록은 제외)
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="조회 시작일이 종료일보다 늦습니다.")
+    Log = models.OperationLogDB
+    conditions = []
+    if date_from:
+        conditions.append(_period_end >= date_from)
+    if date_to:
+        conditions.append(Log.start_date <= date_to)
+    if post_type:
+        conditions.append(Log.post_type == post_type)
+    if team:
+        conditions.append(Log.team == team)
+    return conditions
+
+def build_operation_logs_query(
+    club_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    columns: Optional[List[Any]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Select:
+    """
+    동아리의 활동 기록을 최신순으로 조회하는 쿼리를 만듭니다. (동기/비동기 서비스 공용)
+    limit이 주어지면 다음 페이지 존재 여부를 알 수 있도록 한 건을 더 조회합니다.
+    columns가 주어지면 ORM 객체 대신 해당 컬럼만 조회합니다. (첨부파일은 함께 로드하지 않습니다)
+    ORM 객체에는 deferred 컬럼인 content도 함께 불러옵니다.
+    fields가 주어지면 ORM 객체에 해당 컬럼과 커서용 created_at만 불러오고(load_only),
+    첨부파일은 fields에 files가 있을 때만 함께 로드합니다.
+    date_from, date_to, post_type, team 필터는 operation_log_filters를 참고하세요.
+    """
+    Log = models.OperationLogDB
+    if columns is None:
+        query = select(Log)
+        if fields is None:
+            query = query.options(undefer(Log.content))
+        else:
+            query = query.options(
+                load_only(*fast_json.schema_columns(schemas.OperationLog, Log, fields), Log.created_at)
+            )
+        if fields is None or "files" in fields:
+            query = query.options(selectinload(Log.files))
+    else:
+        query = select(*columns)
+    query = query.where(Log.club_id == club_id, *operation_log_filters(date_from, date_to, post_type, team))
+
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            created_at, last_id = datetime.fromisoformat(created_at), int(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="잘못된 커서 값입니다.")
+        query = query.where(or_(
+            Log.created_at < created_at,
+            and_(Log.created_at == created_at, Log.id > last_id),
+        ))
 
-def get_operation_logs_by_club(db: Session, club_id: int) -> List[models.OperationLogDB]:
+    # ix_operation_logs_club_created_id 인덱스와 같은 순서로 정렬하여 별도 정렬 없이 읽습니다.
+    query = query.order_by(Log.created_at.desc(), Log.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+def operation_log_cursor_key(log: models.OperationLogDB) -> Tuple[str, int]:
+    """활동 기록 목록의 커서에 담을 정렬 키를 반환합니다."""
+    return log.created_at.isoformat(), log.id
+
+def get_operation_logs_by_club(
+    db: Session,
+    club_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Tuple[List[models.OperationLogDB], Optional[str]]:
     """
-    특정 동아리의 모든 활동 기록 목록을 조회합니다.
+    특정 동아리의 활동 기록 목록을 최신순으로 조회합니다.
+    limit이 주어지면 (created_at, id) 기준 커서 페이지네이션을 적용하고,
+    다음 페이지가 있을 경우 다음 커서를 함께 반환합니다.
+    date_from/date_to(기간이 겹치는 기록), post_type, team으로 필터링할 수 있습니다.
+    fields가 주어지면 해당 컬럼만 불러옵니다. (content처럼 큰 컬럼을 읽지 않도록)
+    (연결된 파일 목록은 페이지당 한 번의 추가 쿼리로 함께 로드합니다)
     """
-    db_club = db.query(models.ClubDB).filter(models.ClubDB.id == club_id).first()
-    if not db_club:
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
         raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
-    
-    return sorted(db_club.operation_logs, key=lambda x: x.created_at, reverse=True)
+
+    query = build_operation_logs_query(
+        club_id, limit, cursor, date_from=date_from, date_to=date_to, post_type=post_type, team=team, fields=fields
+    )
+    logs = db.execute(query).scalars().all()
+    return split_page(logs, limit, operation_log_cursor_key)
+
+def get_operation_log_rows(
+    db: Session,
+    club_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    get_operation_logs_by_club의 빠른 응답 경로(fast_json) 버전입니다.
+    응답 스키마의 컬럼(fields가 주어지면 그중 해당 컬럼)만 조회하고,
+    첨부파일 목록은 페이지당 한 번의 쿼리로 dict 목록으로 채웁니다. (fields에 files가 없으면 조회하지 않습니다)
+    """
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    Log, File = models.OperationLogDB, models.UploadedFileDB
+    # created_at은 커서를 만들 때만 사용하고 응답에서는 제외합니다.
+    columns = fast_json.schema_columns(schemas.OperationLog, Log, fields) + [Log.created_at]
+    result = db.execute(build_operation_logs_query(
+        club_id, limit, cursor, columns=columns, date_from=date_from, date_to=date_to, post_type=post_type, team=team
+    ))
+    page, next_cursor = split_page(result.all(), limit, operation_log_cursor_key)
+    keys = [key for key in result.keys() if key != "created_at"]
+    rows = fast_json.rows_to_dicts((row[:-1] for row in page), keys)
+    if fields is not None and "files" not in fields:
+        return rows, next_cursor
+
+    files: Dict[int, List[Dict[str, Any]]] = {}
+    if rows:
+        file_rows = db.execute(
+            select(File.operation_log_id, File.id, File.file_name, File.file_path)
+            .where(File.operation_log_id.in_([row["id"] for row in rows]))
+            .order_by(File.id)
+        )
+        for log_id, file_id, file_name, file_path in file_rows:
+            files.setdefault(log_id, []).append({"id": file_id, "file_name": file_name, "file_path": file_path})
+    for row in rows:
+        row["files"] = files.get(row["id"], [])
+    return rows, next_cursor
+
+def build_operation_log_calendar_query(
+    club_id: int,
+    date_from: date,
+    date_to: date,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+) -> Select:
+    """
+    달력 표시용으로 기간이 겹치는 활동 기록의 ID, 제목, 글 종류, 기간만 시작 날짜순으로 조회하는 쿼리를 만듭니다. (동기/비동기 서비스 공용)
+    """
+    if (date_to - date_from).days >= CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {CALENDAR_MAX_DAYS}일입니다.")
+    Log = models.OperationLogDB
+    return (
+        select(Log.id, Log.title, Log.post_type, Log.start_date, Log.end_date)
+        .where(Log.club_id == club_id, *operation_log_filters(date_from, date_to, post_type, team))
+        .order_by(Log.start_date, Log.id)
+    )
+
+def get_operation_log_calendar(
+    db: Session,
+    club_id: int,
+    date_from: date,
+    date_to: date,
+    post_type: Optional[str] = None,
+    team: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    기간이 겹치는 활동 기록을 달력 항목(dict) 목록으로 반환합니다.
+    """
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    query = build_operation_log_calendar_query(club_id, date_from, date_to, post_type, team)
+    return [dict(row) for row in db.execute(query).mappings()]
+
+def build_operation_log_search_query(
+    club_id: int,
+    q: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Select:
+    """
+    동아리의 활동 기록을 제목, 팀, 글 종류, 내용(content의 문자열 값)으로 검색하는 쿼리를 만듭니다. (동기/비동기 서비스 공용)
+    공백으로 나눈 검색어를 모두 포함하는 활동 기록을 찾습니다.
+    3글자 이상의 검색어는 전문 검색 인덱스(FTS5)로 찾아 BM25 점수 순으로 정렬하고 발췌문을 만듭니다.
+    3글자 미만의 검색어는 인덱스 테이블에 LIKE 조건으로 적용합니다.
+    """
+    Log = models.OperationLogDB
+    fts_table = literal_column(fts.OPERATION_LOG_FTS_TABLE)
+    indexed = fts.operation_logs_fts.c
+    terms = q.split()
+    match_terms = [term for term in terms if len(term) >= fts.TRIGRAM_MIN_LENGTH]
+
+    columns = [Log.id, Log.title, Log.post_type, Log.start_date, Log.end_date, Log.team, Log.author_id]
+    if match_terms:
+        snippet_column = func.snippet(fts_table, -1, "<mark>", "</mark>", "…", 16)
+    else:
+        # snippet()은 MATCH 조건이 있어야 사용할 수 있으므로, 발췌문을 만들 원문을 조회합니다. (search_result_rows 참고)
+        snippet_column = indexed.title.concat("\n").concat(indexed.body)
+    query = (
+        select(*columns, snippet_column.label("snippet"))
+        .join(fts.operation_logs_fts, indexed.rowid == Log.id)
+        .where(Log.club_id == club_id)
+    )
+    if match_terms:
+        query = query.where(fts_table.op("MATCH")(" AND ".join(fts.match_phrase(term) for term in match_terms)))
+    for term in terms:
+        if len(term) < fts.TRIGRAM_MIN_LENGTH:
+            query = query.where(or_(*(
+                indexed[name].contains(term, autoescape=True) for name in ("title", "team", "post_type", "body")
+            )))
+
+    if match_terms:
+        query = query.order_by(func.bm25(fts_table, *fts.OPERATION_LOG_FTS_WEIGHTS), Log.id)
+    else:
+        query = query.order_by(Log.created_at.desc(), Log.id)
+    if limit is not None:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+    return query
+
+def search_operation_logs(
+    db: Session,
+    club_id: int,
+    q: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    동아리의 활동 기록을 검색합니다. (관련도 순)
+    일치한 부분을 <mark>로 감싼 발췌문을 함께 반환합니다.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
+    if not db.query(models.ClubDB.id).filter(models.ClubDB.id == club_id).first():
+        raise HTTPException(status_code=404, detail="해당 동아리를 찾을 수 없습니다.")
+
+    query = build_operation_log_search_query(club_id, q, limit=limit, offset=offset)
+    return search_result_rows(db.execute(query).mappings(), q)
+
+def search_result_rows(rows: Iterable[Mapping[str, Any]], q: str) -> List[Dict[str, Any]]:
+    """
+    검색 결과 행을 dict 목록으로 바꿉니다.
+    검색어가 모두 3글자 미만이라 원문이 조회된 경우에는 원문에서 발췌문을 만듭니다.
+    """
+    terms = q.split()
+    rows = [dict(row) for row in rows]
+    if all(len(term) < fts.TRIGRAM_MIN_LENGTH for term in terms):
+        for row in rows:
+            row["snippet"] = fts.like_snippet(row["snippet"] or "", terms)
+    return rows
 
 def get_operation_log_by_id(db: Session, log_id: int) -> Optional[models.OperationLogDB]:
     """
@@ -80,5 +319,5 @@ def get_operation_log_by_id(db: Session, log_id: int) -> Optional[models.Operati
     (연결된 파일 목록을 함께 로드합니다)
     """
     return db.query(models.OperationLogDB).options(
-        selectinload(models.OperationLogDB.files)
+        undefer(models.OperationLogDB.content), selectinload(models.OperationLogDB.files)
     ).filter(models.OperationLogDB.id == log_id).first() 
\ No newline at end of file
@@ -0,0 +1,108 @@
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from dataclasses import dataclass
+from mimetypes import guess_type
+from typing import Optional
+import gzip
+import hashlib
+import os
+import tempfile
+
+from ..static_files import is_compressible
+
+# 동아리 이미지, 영수증 사진, 활동 기록 첨부파일이 공통으로 사용하는 업로드 처리 모듈입니다.
+# - 업로드를 고정 크기 청크 단위로 읽어 쓰며, 디스크 쓰기는 스레드 풀에서 실행해 이벤트 루프를 막지 않습니다.
+# - 쓰는 동안 SHA-256 해시를 계산하여 '<해시><확장자>' 이름으로 저장합니다.
+#   같은 내용의 파일이 다시 업로드되면 새로 저장하지 않고 기존 파일 경로를 그대로 반환합니다.
+# - 임시 파일에 모두 쓴 뒤 이름을 바꾸는 방식이라, 쓰는 도중의 파일이 노출되지 않습니다.
+# - 텍스트 계열 파일은 .gz 압축본을 함께 만들어 정적 파일 서빙에서 그대로 보낼 수 있게 합니다.
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+@dataclass(frozen=True)
+class UploadPolicy:
+    directory: str
+    max_bytes: int
+
+
+UPLOAD_POLICIES = {
+    "image": UploadPolicy(directory="static/images", max_bytes=10 * 1024 * 1024),
+    "file": UploadPolicy(directory="static/files", max_bytes=50 * 1024 * 1024),
+}
+
+
+def _write_chunk(buffer, digest, chunk: bytes):
+    digest.update(chunk)
+    buffer.write(chunk)
+
+
+def _commit_file(temp_path: str, final_path: str) -> bool:
+    """
+    임시 파일을 최종 경로로 옮깁니다. 같은 내용의 파일이 이미 있으면 임시 파일만 지웁니다.
+    새로 저장한 경우 True를 반환합니다.
+    """
+    if os.path.exists(final_path):
+        os.remove(temp_path)
+        return False
+    os.replace(temp_path, final_path)
+    return True
+
+
+def _write_precompressed(path: str) -> None:
+    """
+    텍스트 계열 파일이면 정적 파일 서빙에서 바로 보낼 수 있도록 .gz 압축본을 함께 만들어 둡니다.
+    (압축 효과가 거의 없으면 만들지 않습니다)
+    """
+    if not is_compressible(guess_type(path)[0]):
+        return
+    with open(path, "rb") as source:
+        compressed = gzip.compress(source.read(), compresslevel=9, mtime=0)
+    if len(compressed) >= os.path.getsize(path) * 0.9:
+        return
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    with os.fdopen(fd, "wb") as buffer:
+        buffer.write(compressed)
+    os.replace(temp_path, f"{path}.gz")
+
+
+async def save_upload(file: Optional[UploadFile], kind: str) -> Optional[str]:
+    """
+    업로드된 파일을 내용 해시 기반 경로에 저장하고 URL 경로를 반환합니다.
+    파일이 없으면 None을 반환하고, 크기 제한을 넘으면 413 에러를 발생시킵니다.
+
+    :param file: 업로드 파일
+    :param kind: 'image' 또는 'file' (저장 위치와 크기 제한이 달라집니다)
+    """
+    if not file or not file.filename:
+        return None
+
+    policy = UPLOAD_POLICIES[kind]
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    await run_in_threadpool(os.makedirs, policy.directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=policy.directory, suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > policy.max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"파일 크기는 {policy.max_bytes // (1024 * 1024)}MB를 넘을 수 없습니다.",
+                    )
+                await run_in_threadpool(_write_chunk, buffer, digest, chunk)
+
+        final_path = os.path.join(policy.directory, f"{digest.hexdigest()}{file_extension}")
+        if await run_in_threadpool(_commit_file, temp_path, final_path):
+            await run_in_threadpool(_write_precompressed, final_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        await file.close()
+
+    return final_path.replace(os.path.sep, "/")
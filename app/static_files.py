@@ -0,0 +1,159 @@
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Receive, Scope, Send
+from mimetypes import guess_type
+from typing import Optional, Tuple
+import anyio
+import os
+import re
+
+# 업로드 파일(/static/images, /static/files)을 캐시 친화적으로 서빙하는 StaticFiles 확장입니다.
+# - 업로드 파일은 내용 해시로 이름이 정해져 바뀌지 않으므로 1년짜리 immutable 캐시 헤더를 붙입니다.
+# - ETag는 파일 이름의 내용 해시(강한 검증자)를 사용합니다. 이름이 해시만으로 이루어지지 않은 파일
+#   (이전 방식으로 업로드된 파일, 리사이즈 버전)은 파일 전체를 읽지 않도록 수정 시각과 크기로 ETag를 만듭니다.
+# - 큰 첨부파일을 이어받을 수 있도록 단일 Range 요청을 지원합니다.
+# - 압축 가능한 형식은 미리 만들어 둔 .br/.gz 파일이 있으면 클라이언트가 지원하는 인코딩으로 보냅니다.
+
+IMMUTABLE_PREFIXES = ("images/", "files/")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# (Content-Encoding, 파일 접미사) - 앞에 있을수록 우선합니다.
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+COMPRESSIBLE_MEDIA_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+# 파일 이름(확장자 제외) 전체가 내용 해시인 원본 업로드 파일
+# (리사이즈 버전 '<해시>_w320.webp' 등은 원본과 내용이 다르므로 해당하지 않습니다)
+_CONTENT_HASH_NAME = re.compile(r"^[0-9a-f]{64}$")
+_RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def is_compressible(media_type: Optional[str]) -> bool:
+    """미리 압축해 둘 가치가 있는(텍스트 계열) 형식인지 확인합니다."""
+    if not media_type:
+        return False
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_MEDIA_TYPES
+
+
+def _file_etag(path: str, stat_result: os.stat_result) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if _CONTENT_HASH_NAME.match(stem):
+        return stem
+    return f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    'bytes=start-end' 형식의 단일 범위를 (start, end)로 해석합니다. (end 포함)
+    여러 범위를 요청한 경우에는 전체 파일을 보내도록 None을 반환하고,
+    만족할 수 없는 범위이면 ValueError를 발생시킵니다.
+    """
+    match = _RANGE_HEADER.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        raise ValueError(header)
+    if not start:
+        # 'bytes=-500' : 마지막 500 bytes
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class RangeFileResponse(FileResponse):
+    """파일의 일부 구간만 보내는 206 Partial Content 응답입니다."""
+
+    def __init__(self, path: str, stat_result: os.stat_result, byte_range: Tuple[int, int], **kwargs):
+        super().__init__(path, status_code=206, stat_result=stat_result, **kwargs)
+        self.start, self.end = byte_range
+        self.headers["content-range"] = f"bytes {self.start}-{self.end}/{stat_result.st_size}"
+        self.headers["content-length"] = str(self.end - self.start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0 and bool(chunk)})
+                if not chunk:
+                    break
+
+
+class CachedStaticFiles(StaticFiles):
+    """업로드 파일 경로에 캐시 헤더, ETag, Range, 사전 압축 파일 서빙을 추가한 StaticFiles입니다."""
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        relative_path = os.path.relpath(full_path, self.directory).replace(os.path.sep, "/")
+        if status_code != 200 or not relative_path.startswith(IMMUTABLE_PREFIXES):
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        media_type = guess_type(str(full_path))[0] or "text/plain"
+        etag = _file_etag(str(full_path), stat_result)
+        headers = {"cache-control": IMMUTABLE_CACHE_CONTROL, "accept-ranges": "bytes"}
+
+        # 1. 사전 압축 파일 선택
+        serve_path, serve_stat = str(full_path), stat_result
+        if is_compressible(media_type):
+            headers["vary"] = "Accept-Encoding"
+            accepted = {
+                token.split(";")[0].strip()
+                for token in request_headers.get("accept-encoding", "").split(",")
+            }
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                try:
+                    serve_stat = os.stat(serve_path + suffix)
+                except FileNotFoundError:
+                    continue
+                serve_path += suffix
+                headers["content-encoding"] = encoding
+                etag = f"{etag}-{encoding}"
+                break
+        headers["etag"] = f'"{etag}"'
+
+        response = FileResponse(serve_path, stat_result=serve_stat, media_type=media_type, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        # 2. Range 요청 처리 (If-Range가 현재 ETag와 다르면 전체 파일을 보냅니다)
+        range_header = request_headers.get("range")
+        if not range_header or "content-encoding" in headers:
+            return response
+        if_range = request_headers.get("if-range")
+        if if_range and if_range != headers["etag"]:
+            return response
+        try:
+            byte_range = _parse_range(range_header, serve_stat.st_size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={"content-range": f"bytes */{serve_stat.st_size}", **headers},
+            )
+        if byte_range is None:
+            return response
+        return RangeFileResponse(serve_path, serve_stat, byte_range, media_type=media_type, headers=headers)
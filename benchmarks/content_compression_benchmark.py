@@ -0,0 +1,190 @@
+"""
+활동 기록 content 압축(app/compression.py) 전후의 데이터베이스 크기와 읽기 시간을 비교하는 벤치마크입니다.
+
+임시 디렉터리에 압축 도입 전 형식(JSON 문자열)으로 에디터 문서 형태의 활동 기록을 만든 뒤 측정하고,
+마이그레이션(compress_existing_content)과 VACUUM을 실행한 다음 같은 항목을 다시 측정합니다.
+- db size / pages: VACUUM 후 파일 크기와 페이지 수
+- list: 동아리 활동 기록 목록 한 페이지 (content 포함 / fields=id,title)
+- detail: 활동 기록 하나
+- scan: 전체 활동 기록의 제목과 동아리 ID만 읽기 (content 뒤에 있는 컬럼을 읽으려면 content를 건너가야 합니다)
+- content: 전체 활동 기록의 content를 읽고 디코딩
+
+    python benchmarks/content_compression_benchmark.py --logs 5000 --repeat 30
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 본문 문장을 만들 단어 (같은 문장이 반복되면 압축률이 실제보다 높게 나오므로 단어를 무작위로 조합합니다)
+_WORDS = (
+    "정기", "회의", "축제", "부스", "운영", "계획", "예산안", "검토", "홍보팀", "포스터", "시안", "투표", "공연",
+    "리허설", "목요일", "오후", "학생회관", "대강당", "신입", "부원", "환영회", "장소", "후보", "식당", "회계",
+    "담당자", "지난달", "지출", "내역", "보고", "장비", "대여", "일정", "캘린더", "등록", "연습", "준비물",
+    "역할", "분담", "마감", "공지", "참석", "인원", "확인", "발표", "자료", "정리", "다음", "주", "진행",
+    "했습니다", "합니다", "예정입니다", "바랍니다", "논의했습니다", "결정했습니다", "공유했습니다",
+)
+
+
+def make_sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(6, 14))]
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), f"{rng.randint(1, 12)}월 {rng.randint(1, 28)}일")
+    return " ".join(words) + "."
+
+
+def make_document(rng: random.Random, paragraphs: int) -> dict:
+    """리치 에디터(ProseMirror 형식) 문서와 비슷한 구조의 content를 만듭니다."""
+    blocks = [{"type": "heading", "attrs": {"level": 2}, "content": [{"type": "text", "text": "회의 내용"}]}]
+    for n in range(paragraphs):
+        if n % 4 == 3:
+            blocks.append({"type": "bulletList", "content": [
+                {"type": "listItem", "content": [{"type": "paragraph", "content": [
+                    {"type": "text", "text": make_sentence(rng)},
+                ]}]}
+                for _ in range(3)
+            ]})
+        else:
+            blocks.append({"type": "paragraph", "content": [
+                {"type": "text", "text": " ".join(make_sentence(rng) for _ in range(rng.randint(1, 4)))},
+                {"type": "text", "marks": [{"type": "bold"}], "text": make_sentence(rng)},
+            ]})
+    return {"type": "doc", "content": blocks}
+
+
+def seed(args) -> int:
+    """압축 도입 전과 같은 형식(json.dumps 문자열)으로 활동 기록을 저장하고 content 총 바이트 수를 반환합니다."""
+    from sqlalchemy import column, table
+    from app import models
+    from app.database import SessionLocal
+
+    rng = random.Random(args.seed)
+    legacy_logs = table(
+        "operation_logs", *(column(name) for name in (
+            "club_id", "author_id", "title", "post_type", "team", "start_date", "end_date", "content",
+            "created_at", "updated_at",
+        ))
+    )
+    db = SessionLocal()
+    total = 0
+    try:
+        db.add(models.UserDB(email="bench@example.com", hashed_password="-", name="벤치마크"))
+        db.add_all([
+            models.ClubDB(name=f"동아리 {i}", club_type="중앙", topic="학술", password="123456")
+            for i in range(args.clubs)
+        ])
+        db.flush()
+        rows = []
+        for i in range(args.logs):
+            content = json.dumps(make_document(rng, rng.randint(args.min_paragraphs, args.max_paragraphs)))
+            total += len(content.encode())
+            created_at = datetime(2024, 1, 1) + timedelta(hours=i)
+            rows.append({
+                "club_id": i % args.clubs + 1, "author_id": 1, "title": f"활동 기록 {i}", "post_type": "회의록",
+                "team": "기획", "start_date": None, "end_date": None, "content": content,
+                "created_at": created_at, "updated_at": created_at,
+            })
+        db.execute(legacy_logs.insert(), rows)
+        db.commit()
+    finally:
+        db.close()
+    return total
+
+
+def _median_ms(run, repeat: int) -> float:
+    timings = []
+    for n in range(repeat):
+        started = time.perf_counter()
+        run(n)
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def measure(args) -> dict:
+    from sqlalchemy import select, text
+    from app import models
+    from app.database import SessionLocal, engine
+    from app.services import operation_log_service
+
+    Log = models.OperationLogDB
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        connection.execute(text("VACUUM"))
+        connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        pages = connection.execute(text("PRAGMA page_count")).scalar()
+
+    def with_session(query):
+        def run(n):
+            db = SessionLocal()
+            try:
+                query(db, n)
+            finally:
+                db.close()
+        return run
+
+    club = lambda n: n % args.clubs + 1
+    return {
+        "db size (KB)": round(os.path.getsize("dongari.db") / 1024),
+        "pages": pages,
+        "list 20 (ms)": _median_ms(with_session(
+            lambda db, n: operation_log_service.get_operation_logs_by_club(db, club(n), limit=20)
+        ), args.repeat),
+        "list 20 fields=id,title (ms)": _median_ms(with_session(
+            lambda db, n: operation_log_service.get_operation_logs_by_club(db, club(n), limit=20, fields={"id", "title"})
+        ), args.repeat),
+        "detail (ms)": _median_ms(with_session(
+            lambda db, n: operation_log_service.get_operation_log_by_id(db, n * 7919 % args.logs + 1).content
+        ), args.repeat),
+        "scan title, club_id (ms)": _median_ms(with_session(
+            lambda db, n: db.execute(select(Log.id, Log.title, Log.club_id)).all()
+        ), max(3, args.repeat // 5)),
+        "content (ms)": _median_ms(with_session(
+            lambda db, n: db.execute(select(Log.content)).all()
+        ), max(3, args.repeat // 5)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logs", type=int, default=5000)
+    parser.add_argument("--clubs", type=int, default=10)
+    parser.add_argument("--min-paragraphs", type=int, default=4)
+    parser.add_argument("--max-paragraphs", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="dongari-compression-")
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+
+    from app import compression, models  # noqa: F401 (테이블 정의를 등록합니다)
+    from app.database import engine, ensure_schema
+
+    ensure_schema(bind=engine)
+    content_bytes = seed(args)
+    print(f"활동 기록 {args.logs}개, content {content_bytes / 1024 / 1024:.1f} MB ({workdir})")
+
+    before = measure(args)
+    started = time.perf_counter()
+    stats = compression.compress_existing_content(engine)
+    migration_seconds = time.perf_counter() - started
+    print(f"마이그레이션: {stats['rewritten']}행 변경, content {stats['bytes_before']:,} → {stats['bytes_after']:,} bytes, "
+          f"{migration_seconds:.2f}초")
+    after = measure(args)
+
+    print(f"{'':32}{'before':>10}{'after':>10}{'ratio':>8}")
+    for key in before:
+        ratio = after[key] / before[key] if before[key] else 0
+        print(f"{key:32}{before[key]:>10}{after[key]:>10}{ratio:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+목록 API의 기본 응답 경로와 빠른 응답 경로(DONGARI_FAST_JSON)를 비교하는 벤치마크입니다.
+
+임시 디렉터리에 합성 데이터(동아리, 부원, 활동 기록)가 들어 있는 데이터베이스를 만든 뒤,
+같은 요청을 두 경로로 보내 응답 본문이 같은지 확인하고 요청당 소요 시간과 응답 크기를 비교합니다.
+
+    python benchmarks/fast_json_benchmark.py --members 5000 --logs 2000 --repeat 30
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _seed(members: int, logs: int, clubs: int):
+    from app import models
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        author = models.UserDB(email="bench@example.com", hashed_password="-", name="벤치마크")
+        db.add(author)
+        db.add_all([
+            models.ClubDB(name=f"동아리 {i}", club_type="중앙", topic="학술", password="123456", description="벤치마크용 동아리")
+            for i in range(clubs)
+        ])
+        db.flush()
+        db.execute(models.user_club_association.insert().values(user_id=author.id, club_id=1))
+        db.execute(models.ClubMemberDB.__table__.insert(), [
+            {
+                "club_id": 1, "name": f"부원 {i}", "student_id": f"2024{i:05d}", "major": "컴퓨터공학과",
+                "phone_number": "010-0000-0000", "email": f"member{i}@example.com", "gender": "기타",
+                "member_year": 2020 + i % 5, "role": "부원", "memo": "메모",
+            }
+            for i in range(members)
+        ])
+        db.execute(models.OperationLogDB.__table__.insert(), [
+            {
+                "club_id": 1, "author_id": author.id, "title": f"활동 {i}", "post_type": "정기모임", "team": "기획",
+                "content": {"summary": "활동 내용 " * 10, "attendees": list(range(10))},
+            }
+            for i in range(logs)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def _measure(client, path: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, headers={"accept-encoding": "gzip"})
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    wire_size = int(response.headers.get("content-length", len(response.content)))
+    return response.json(), statistics.median(timings), wire_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--logs", type=int, default=2000)
+    parser.add_argument("--clubs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # 앱은 현재 디렉터리의 dongari.db와 static/을 사용하므로 임시 디렉터리에서 실행합니다.
+    workdir = tempfile.mkdtemp(prefix="dongari-bench-")
+    os.makedirs(os.path.join(workdir, "static"))
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+
+    from fastapi.testclient import TestClient
+    from app import auth, fast_json
+    from app.main import app
+
+    _seed(args.members, args.logs, args.clubs)
+    # 동아리 단위 API는 회원만 조회할 수 있으므로 동아리 1에 가입한 작성자 계정의 토큰을 사용합니다.
+    client = TestClient(app, headers={"Authorization": f"Bearer {auth.create_access_token({'sub': 'bench@example.com'})}"})
+    paths = ["/clubs", "/clubs/1/members", "/clubs/1/operation-logs", "/clubs/1/operation-logs?limit=100"]
+
+    print(f"{'path':<36}{'default ms':>12}{'fast ms':>10}{'speedup':>9}{'default B':>12}{'fast B':>10}")
+    for path in paths:
+        fast_json.FAST_JSON_ENABLED = False
+        default_body, default_ms, default_size = _measure(client, path, args.repeat)
+        fast_json.FAST_JSON_ENABLED = True
+        fast_body, fast_ms, fast_size = _measure(client, path, args.repeat)
+        if fast_body != default_body:
+            raise SystemExit(f"{path}: 빠른 응답 경로의 본문이 기본 경로와 다릅니다.")
+        print(f"{path:<36}{default_ms:>12.1f}{fast_ms:>10.1f}{default_ms / fast_ms:>8.1f}x{default_size:>12}{fast_size:>10}")
+
+
+if __name__ == "__main__":
+    main()
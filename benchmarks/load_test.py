@@ -0,0 +1,387 @@
+"""
+전체 API를 대상으로 하는 인프로세스 부하 테스트입니다.
+
+임시 디렉터리에 합성 데이터(동아리, 사용자, 부원, 회계 내역, 첨부파일이 있는 활동 기록)를
+원하는 양만큼 만든 뒤, httpx의 ASGI transport로 앱을 직접 호출합니다. (네트워크와 서버 프로세스 없음)
+엔드포인트마다 지정한 동시성으로 요청을 보내 p50/p95/p99 지연 시간, 처리량, 요청당 SQL 쿼리 수를 측정하고
+결과를 JSON 파일로 저장합니다. --compare로 이전 결과 파일을 지정하면 p95 변화를 함께 출력합니다.
+
+    python benchmarks/load_test.py --clubs 200 --members-per-club 300 --concurrency 16 --requests 400
+    python benchmarks/load_test.py --mode async --output async.json --compare sync.json
+"""
+import argparse
+import asyncio
+import contextvars
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_PASSWORD = "benchmark-password"
+
+# 활동 기록 내용에 넣는 주제 (활동 기록 검색 시나리오의 검색어로 사용합니다)
+LOG_TOPICS = ("축제 예산안 검토", "정기공연 연습", "신입부원 모집 홍보")
+
+# 현재 요청이 실행한 SQL 문 수를 세는 카운터입니다. (요청마다 새 리스트를 넣습니다)
+# 동기 라우터는 스레드 풀에서 실행되지만 anyio가 컨텍스트 변수를 복사하므로 같은 카운터를 봅니다.
+_query_counter: contextvars.ContextVar = contextvars.ContextVar("query_counter", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def _install_query_counter():
+    from sqlalchemy import event
+    from app import database
+
+    for engine in (database.engine, database.read_engine, database.async_engine.sync_engine):
+        event.listen(engine, "before_cursor_execute", _count_query)
+
+
+# --- 합성 데이터 ---
+
+def seed(args) -> dict:
+    """
+    core INSERT(executemany)로 합성 데이터를 저장합니다.
+    첨부파일은 static/files에 실제 파일 하나를 만들고 모든 첨부파일 행이 이를 가리키게 합니다.
+    """
+    from app import auth, fts, models
+    from app.database import SessionLocal
+
+    hashed_password = auth.get_password_hash(BENCH_PASSWORD)
+    attachment_path = "static/files/benchmark-attachment.txt"
+    with open(attachment_path, "wb") as attachment:
+        attachment.write(b"benchmark attachment\n" * 512)
+
+    start = date(2023, 1, 1)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        db.execute(models.UserDB.__table__.insert(), [
+            {"email": f"user{i}@bench.example.com", "hashed_password": hashed_password, "name": f"사용자 {i}"}
+            for i in range(args.users)
+        ])
+        db.execute(models.ClubDB.__table__.insert(), [
+            {
+                "name": f"벤치마크 동아리 {i}", "club_type": ("중앙", "학과", "연합")[i % 3],
+                "topic": ("학술", "운동", "음악", "봉사")[i % 4], "password": "123456",
+                "description": f"부하 테스트용 동아리 {i}번입니다.",
+            }
+            for i in range(args.clubs)
+        ])
+        # 요청을 보내는 user0(ID 1)은 모든 동아리에, 나머지 사용자는 동아리 하나에 가입시킵니다.
+        db.execute(models.user_club_association.insert(), [
+            {"user_id": 1, "club_id": club_id} for club_id in range(1, args.clubs + 1)
+        ] + [
+            {"user_id": user_id, "club_id": (user_id - 1) % args.clubs + 1}
+            for user_id in range(2, args.users + 1)
+        ])
+
+        for club_id in range(1, args.clubs + 1):
+            if args.members_per_club:
+                db.execute(models.ClubMemberDB.__table__.insert(), [
+                    {
+                        "club_id": club_id, "name": f"부원 {i}", "student_id": f"{2018 + i % 7}{club_id:04d}{i:04d}",
+                        "major": ("컴퓨터공학과", "경영학과", "물리학과", "국어국문학과")[i % 4],
+                        "phone_number": "010-0000-0000", "email": f"m{club_id}-{i}@bench.example.com",
+                        "gender": ("남", "여")[i % 2], "member_year": 2018 + i % 7,
+                        "role": "회장" if i == 0 else "부원", "memo": None,
+                    }
+                    for i in range(args.members_per_club)
+                ])
+            if args.entries_per_club:
+                db.execute(models.AccountingEntryDB.__table__.insert(), [
+                    {
+                        "club_id": club_id, "date": (start + timedelta(days=i % 730)).isoformat(),
+                        "manager": f"총무 {i % 3}", "description": f"거래 {i}",
+                        "amount": 50000 if i % 5 == 0 else -(1000 + i % 20 * 500),
+                    }
+                    for i in range(args.entries_per_club)
+                ])
+            if args.logs_per_club:
+                log_ids = db.execute(
+                    models.OperationLogDB.__table__.insert().returning(
+                        models.OperationLogDB.id, sort_by_parameter_order=True
+                    ),
+                    [
+                        {
+                            "club_id": club_id, "author_id": (club_id - 1) % args.users + 1,
+                            "title": f"활동 기록 {i}", "post_type": ("회의록", "보고서", "기획서")[i % 3],
+                            "team": ("기획", "홍보", "운영")[i % 3],
+                            "start_date": start + timedelta(days=i), "end_date": start + timedelta(days=i + 1),
+                            "content": {
+                                "summary": LOG_TOPICS[i % len(LOG_TOPICS)] + " 활동 내용" * 20,
+                                "attendees": list(range(12)),
+                            },
+                            "created_at": datetime(2024, 1, 1) + timedelta(hours=i),
+                            "updated_at": datetime(2024, 1, 1) + timedelta(hours=i),
+                        }
+                        for i in range(args.logs_per_club)
+                    ],
+                ).scalars().all()
+                if args.files_per_log:
+                    db.execute(models.UploadedFileDB.__table__.insert(), [
+                        {"operation_log_id": log_id, "file_name": f"첨부 {n}.txt", "file_path": attachment_path}
+                        for log_id in log_ids
+                        for n in range(args.files_per_log)
+                    ])
+        # core INSERT는 ORM 이벤트를 거치지 않으므로 활동 기록 검색 인덱스를 한 번에 채웁니다.
+        fts.rebuild_operation_log_index(db.connection())
+        db.commit()
+    finally:
+        db.close()
+    return {"seconds": round(time.perf_counter() - started, 2)}
+
+
+# --- 시나리오 ---
+
+def build_scenarios(args):
+    """
+    (이름, 요청 생성 함수) 목록을 반환합니다. 요청 생성 함수는 요청 번호를 받아
+    httpx.AsyncClient.request에 넘길 (method, url, kwargs)를 반환합니다.
+    (모든 요청은 모든 동아리에 가입한 user0의 토큰으로 보냅니다)
+    """
+    clubs = args.clubs
+
+    def club(i):
+        return i % clubs + 1
+
+    def members_create(i):
+        body = {"name": f"신입 {i}", "student_id": f"9{i:07d}", "member_year": 2025, "role": "부원"}
+        return "POST", f"/clubs/{club(i)}/members", {"json": body}
+
+    def members_bulk(i):
+        rows = [{"name": f"일괄 {i}-{n}", "student_id": f"8{i:04d}{n:03d}"} for n in range(args.bulk_size)]
+        return "POST", f"/clubs/{club(i)}/members/bulk", {"json": rows}
+
+    def accounting_create(i):
+        data = {"date": "2025-03-01", "description": f"부하 테스트 {i}", "amount": str(-1000 - i), "manager": "총무"}
+        return "POST", f"/clubs/{club(i)}/accounting", {"data": data}
+
+    def operation_log_create(i):
+        log = {"title": f"부하 테스트 기록 {i}", "post_type": "회의록", "team": "기획", "content": {"body": "내용"}}
+        files = [("files", (f"첨부{i}.txt", io.BytesIO(b"x" * 2048), "text/plain"))]
+        return "POST", f"/clubs/{club(i)}/operation-logs", {
+            "data": {"log_data": json.dumps(log, ensure_ascii=False)}, "files": files,
+        }
+
+    scenarios = [
+        ("auth: token", lambda i: ("POST", "/auth/token", {
+            "data": {"username": f"user{i % args.users}@bench.example.com", "password": BENCH_PASSWORD},
+        })),
+        ("clubs: list", lambda i: ("GET", "/clubs", {})),
+        ("clubs: search", lambda i: ("GET", "/clubs", {"params": {"name": f"동아리 {i % clubs}", "limit": 20}})),
+        ("clubs: detail", lambda i: ("GET", f"/clubs/{club(i)}", {})),
+        ("clubs: join", lambda i: ("POST", "/clubs/join", {"json": {"name": f"벤치마크 동아리 {i % clubs}", "password": "123456"}})),
+        ("members: list", lambda i: ("GET", f"/clubs/{club(i)}/members", {})),
+        ("members: list (fields)", lambda i: ("GET", f"/clubs/{club(i)}/members", {"params": {"fields": "name,role"}})),
+        ("members: stats", lambda i: ("GET", f"/clubs/{club(i)}/members/stats", {})),
+        ("members: export csv", lambda i: ("GET", f"/clubs/{club(i)}/members", {"params": {"export": "true", "format": "csv"}})),
+        ("accounting: ledger", lambda i: ("GET", f"/clubs/{club(i)}/accounting", {"params": {"limit": 50}})),
+        ("accounting: filtered", lambda i: ("GET", f"/clubs/{club(i)}/accounting", {
+            "params": {"date_from": "2024-01-01", "date_to": "2024-06-30", "sign": "expense", "limit": 50},
+        })),
+        ("accounting: export csv", lambda i: ("GET", f"/clubs/{club(i)}/accounting", {"params": {"export": "true", "format": "csv"}})),
+        ("operation-logs: list", lambda i: ("GET", f"/clubs/{club(i)}/operation-logs", {"params": {"limit": 20}})),
+        ("operation-logs: list (fields)", lambda i: ("GET", f"/clubs/{club(i)}/operation-logs", {
+            "params": {"limit": 20, "fields": "title,post_type,start_date"},
+        })),
+        ("operation-logs: calendar", lambda i: ("GET", f"/clubs/{club(i)}/operation-logs/calendar", {
+            "params": {"date_from": f"2023-{i % 12 + 1:02d}-01", "date_to": f"2023-{i % 12 + 1:02d}-28"},
+        })),
+        ("operation-logs: search", lambda i: ("GET", f"/clubs/{club(i)}/operation-logs/search", {
+            "params": {"q": LOG_TOPICS[i % len(LOG_TOPICS)].split()[0], "limit": 20},
+        })),
+        ("operation-logs: detail", lambda i: ("GET", f"/clubs/{club(i)}/operation-logs/{(club(i) - 1) * args.logs_per_club + 1}", {})),
+    ]
+    if not args.read_only:
+        scenarios += [
+            ("auth: signup", lambda i: ("POST", "/auth/signup", {
+                "json": {"email": f"signup{i}@bench.example.com", "password": BENCH_PASSWORD, "name": f"가입자 {i}"},
+            })),
+            ("members: create", members_create),
+            ("members: bulk", members_bulk),
+            ("accounting: create", accounting_create),
+            ("operation-logs: create", operation_log_create),
+        ]
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if any(part in scenario[0] for part in args.only)]
+    return scenarios
+
+
+# --- 측정 ---
+
+def percentile(sorted_values, fraction: float) -> float:
+    """nearest-rank 방식의 백분위수입니다."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+async def run_scenario(client, build_request, requests: int, concurrency: int) -> dict:
+    latencies, queries, statuses = [], [], {}
+    next_index = iter(range(requests))
+
+    async def worker():
+        for i in next_index:
+            method, url, kwargs = build_request(i)
+            counter = [0]
+            token = _query_counter.set(counter)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                await response.aread()
+            finally:
+                _query_counter.reset(token)
+            latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(counter[0])
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if status >= 400)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "status_codes": {str(status): count for status, count in sorted(statuses.items())},
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "throughput_rps": round(requests / elapsed, 1),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+    }
+
+
+async def run(args, app) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post("/auth/token", data={"username": "user0@bench.example.com", "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        scenarios = build_scenarios(args)
+
+        results = {}
+        for name, build_request in scenarios:
+            # 연결 풀과 캐시를 데운 뒤 측정합니다.
+            for i in range(args.warmup):
+                method, url, kwargs = build_request(args.requests + i)
+                await client.request(method, url, **kwargs)
+            results[name] = await run_scenario(client, build_request, args.requests, args.concurrency)
+            print(_format_row(name, results[name]), flush=True)
+    return results
+
+
+# --- 출력 ---
+
+_HEADER = f"{'endpoint':<26}{'p50':>8}{'p95':>8}{'p99':>8}{'rps':>9}{'queries':>9}{'errors':>8}"
+
+
+def _format_row(name: str, result: dict) -> str:
+    return (
+        f"{name:<26}{result['p50_ms']:>8.1f}{result['p95_ms']:>8.1f}{result['p99_ms']:>8.1f}"
+        f"{result['throughput_rps']:>9.1f}{result['queries_per_request']:>9.1f}{result['errors']:>8}"
+    )
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_comparison(previous: dict, current: dict):
+    print(f"\n{'endpoint':<26}{'p95 before':>12}{'p95 after':>11}{'change':>9}")
+    for name, result in current["endpoints"].items():
+        before = previous.get("endpoints", {}).get(name)
+        if not before or not before["p95_ms"]:
+            continue
+        change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        print(f"{name:<26}{before['p95_ms']:>12.1f}{result['p95_ms']:>11.1f}{change:>+8.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clubs", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--members-per-club", type=int, default=200)
+    parser.add_argument("--entries-per-club", type=int, default=500)
+    parser.add_argument("--logs-per-club", type=int, default=100)
+    parser.add_argument("--files-per-log", type=int, default=2)
+    parser.add_argument("--bulk-size", type=int, default=50, help="members: bulk 요청 한 번에 보내는 행 수")
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync", help="DONGARI_DB_MODE")
+    parser.add_argument("--fast-json", action="store_true", help="DONGARI_FAST_JSON=1로 실행")
+    parser.add_argument("--read-only", action="store_true", help="쓰기 요청 시나리오를 제외")
+    parser.add_argument("--only", nargs="*", help="이름에 주어진 문자열이 포함된 시나리오만 실행")
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+    if args.clubs < 1 or args.users < 1:
+        parser.error("--clubs와 --users는 1 이상이어야 합니다.")
+
+    output_path = os.path.abspath(args.output)
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    # 앱 모듈을 불러오기 전에 환경변수를 지정하고, 임시 디렉터리의 dongari.db와 static/을 사용하도록 이동합니다.
+    os.environ["DONGARI_DB_MODE"] = args.mode
+    os.environ["DONGARI_FAST_JSON"] = "1" if args.fast_json else "0"
+    workdir = tempfile.mkdtemp(prefix="dongari-load-")
+    for directory in ("static/images", "static/files"):
+        os.makedirs(os.path.join(workdir, directory))
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+
+    from app.main import app
+
+    _install_query_counter()
+    seed_result = seed(args)
+    print(f"합성 데이터 생성: {seed_result['seconds']}초 ({workdir})")
+    print(_HEADER)
+    endpoints = asyncio.run(run(args, app))
+
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {name: value for name, value in vars(args).items() if name not in ("output", "compare")},
+            "seed_seconds": seed_result["seconds"],
+        },
+        "endpoints": endpoints,
+    }
+    with open(output_path, "w", encoding="utf-8") as output:
+        json.dump(result, output, ensure_ascii=False, indent=2)
+        output.write("\n")
+    print(f"\n결과 저장: {output_path}")
+
+    if compare_path:
+        with open(compare_path, encoding="utf-8") as previous_file:
+            _print_comparison(json.load(previous_file), result)
+
+
+if __name__ == "__main__":
+    main()
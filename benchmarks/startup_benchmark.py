@@ -0,0 +1,105 @@
+"""
+앱 시작 시간(import app.main)을 측정하고 회귀를 검사하는 벤치마크입니다.
+
+매 측정마다 새 파이썬 프로세스를 띄워 임시 디렉터리에서 app.main을 불러옵니다.
+- cold: 빈 데이터베이스에서 처음 시작할 때 (테이블과 검색 인덱스를 생성)
+- warm: 스키마가 이미 최신인 데이터베이스로 다시 시작할 때 (워커 재시작, 재배포)
+- schema check: warm 상태에서 ensure_schema/ensure_search_indexes에 걸리는 시간
+
+시작 시 불러오면 안 되는 무거운 모듈(LAZY_MODULES)이 로드되었거나, warm 시작 시간이
+--budget-ms 또는 --baseline에 저장된 값보다 허용 범위 이상 느려지면 종료 코드 1로 끝납니다.
+
+    python benchmarks/startup_benchmark.py --repeat 7
+    python benchmarks/startup_benchmark.py --save benchmarks/startup_baseline.json
+    python benchmarks/startup_benchmark.py --baseline benchmarks/startup_baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 처음 사용할 때 불러오도록 되어 있는 모듈 (내보내기/가져오기, 이미지 리사이즈)
+LAZY_MODULES = ("openpyxl", "PIL", "numpy", "pandas")
+
+_CHILD = """
+import json, sys, time
+sys.path.insert(0, {repo_root!r})
+started = time.perf_counter()
+import app.main
+boot_ms = (time.perf_counter() - started) * 1000
+
+from app.database import engine, ensure_schema
+from app.fts import ensure_search_indexes
+started = time.perf_counter()
+ensure_schema(bind=engine)
+ensure_search_indexes(bind=engine)
+schema_ms = (time.perf_counter() - started) * 1000
+
+lazy = [name for name in {lazy_modules!r} if name in sys.modules]
+print(json.dumps({{"boot_ms": boot_ms, "schema_ms": schema_ms, "loaded": lazy}}))
+"""
+
+
+def _run_child(workdir: str) -> dict:
+    code = _CHILD.format(repo_root=REPO_ROOT, lazy_modules=LAZY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(repeat: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="dongari-startup-")
+    os.makedirs(os.path.join(workdir, "static"))
+    cold = _run_child(workdir)
+    warm = [_run_child(workdir) for _ in range(repeat)]
+    return {
+        "cold_boot_ms": round(cold["boot_ms"], 1),
+        "warm_boot_ms": round(statistics.median(run["boot_ms"] for run in warm), 1),
+        "schema_check_ms": round(statistics.median(run["schema_ms"] for run in warm), 2),
+        "lazy_modules_loaded": sorted(set(cold["loaded"]).union(*(run["loaded"] for run in warm))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None, help="warm 시작 시간 상한 (ms)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="기준 대비 허용 비율 (기본 25%%)")
+    parser.add_argument("--save", help="측정 결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    result = measure(args.repeat)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as output:
+            json.dump(result, output, ensure_ascii=False, indent=2)
+            output.write("\n")
+
+    failures = []
+    if result["lazy_modules_loaded"]:
+        failures.append(f"시작 시 불러오면 안 되는 모듈이 로드되었습니다: {', '.join(result['lazy_modules_loaded'])}")
+    if args.budget_ms is not None and result["warm_boot_ms"] > args.budget_ms:
+        failures.append(f"warm 시작 시간 {result['warm_boot_ms']}ms가 상한 {args.budget_ms}ms를 넘었습니다.")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        for key in ("cold_boot_ms", "warm_boot_ms"):
+            limit = baseline[key] * (1 + args.tolerance)
+            if result[key] > limit:
+                failures.append(f"{key} {result[key]}ms가 기준 {baseline[key]}ms의 허용 범위({limit:.1f}ms)를 넘었습니다.")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+operation_logs.content의 기존 행을 압축 저장 형식(app/compression.py)으로 다시 쓰는 마이그레이션입니다.
+
+압축 형식을 도입하기 전에 저장된 행도 그대로 읽을 수 있으므로 서버를 멈추지 않고 실행할 수 있습니다.
+ID 순서로 --batch-size개씩 읽어 저장된 값이 바뀌는 행만 UPDATE하고 배치마다 커밋합니다.
+(쓰기 잠금을 짧게 유지하며, 중간에 멈춘 뒤 다시 실행해도 이미 옮긴 행은 건너뜁니다)
+압축으로 비게 된 페이지를 파일에서 돌려받으려면 --vacuum을 함께 지정합니다. (VACUUM 중에는 쓰기가 막힙니다)
+
+데이터베이스 파일(dongari.db)이 있는 디렉터리에서 실행합니다.
+
+    python migrations/compress_operation_log_content.py --dry-run
+    python migrations/compress_operation_log_content.py --batch-size 1000 --vacuum
+"""
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+def _print_progress(stats: dict):
+    print(f"  {stats['scanned']}행 확인, {stats['rewritten']}행 변경", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=None, help="한 트랜잭션에서 처리할 행 수")
+    parser.add_argument("--min-bytes", type=int, default=None, help="압축할 최소 크기 (기본: DONGARI_CONTENT_COMPRESSION_MIN_BYTES)")
+    parser.add_argument("--dry-run", action="store_true", help="변경하지 않고 예상 크기만 출력")
+    parser.add_argument("--vacuum", action="store_true", help="끝난 뒤 VACUUM으로 파일 크기를 줄임")
+    args = parser.parse_args()
+
+    from sqlalchemy import text
+    from app import compression
+    from app.database import engine
+
+    stats = compression.compress_existing_content(
+        engine,
+        batch_size=args.batch_size or compression.MIGRATION_BATCH_SIZE,
+        min_bytes=args.min_bytes,
+        dry_run=args.dry_run,
+        progress=_print_progress,
+    )
+    before, after = stats["bytes_before"], stats["bytes_after"]
+    ratio = after / before if before else 1.0
+    print(f"{'(dry run) ' if args.dry_run else ''}{stats['scanned']}행 중 {stats['rewritten']}행 변경, "
+          f"content {before:,} → {after:,} bytes ({ratio:.1%})")
+
+    if args.vacuum and not args.dry_run:
+        with engine.connect() as connection:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            connection.execute(text("VACUUM"))
+            # WAL 모드에서는 체크포인트까지 마쳐야 데이터베이스 파일 크기가 줄어듭니다.
+            connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        print("VACUUM 완료")
+
+
+if __name__ == "__main__":
+    main()